@@ -9,9 +9,6 @@ from alembic import context
 
 # 导入你的模型
 from app.db.base import Base
-from app.modules.system.models.user import User
-from app.modules.system.models.role import Role
-from app.modules.system.models.menu import Menu
 
 config = context.config
 
@@ -60,5 +57,8 @@ async def run_migrations_online() -> None:
 
 if context.is_offline_mode():
     run_migrations_offline()
+elif (connection := config.attributes.get("connection")) is not None:
+    # 由调用方传入连接 (如测试中迁移到独立 schema)
+    do_run_migrations(connection)
 else:
     asyncio.run(run_migrations_online())
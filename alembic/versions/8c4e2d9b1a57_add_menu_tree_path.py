@@ -0,0 +1,81 @@
+"""add materialized tree path to sys_menu
+
+Revision ID: 8c4e2d9b1a57
+Revises: 3f9a1c2b7d10
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4e2d9b1a57"
+down_revision: str | Sequence[str] | None = "3f9a1c2b7d10"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "sys_menu",
+        sa.Column(
+            "tree_path",
+            sa.String(length=1024),
+            nullable=True,
+            comment="层级路径: /根ID/.../自身ID/",
+        ),
+    )
+    op.add_column(
+        "sys_menu",
+        sa.Column(
+            "tree_depth",
+            sa.Integer(),
+            server_default="0",
+            nullable=False,
+            comment="层级深度(根节点为0)",
+        ),
+    )
+
+    # 回填已有数据：父节点不存在(0/NULL/已删除)的菜单视为根节点
+    op.execute(
+        """
+        WITH RECURSIVE tree AS (
+            SELECT m.menu_id, '/' || m.menu_id || '/' AS tree_path, 0 AS tree_depth
+            FROM sys_menu m
+            WHERE NOT EXISTS (
+                SELECT 1 FROM sys_menu p WHERE p.menu_id = m.parent_id
+            )
+            UNION ALL
+            SELECT c.menu_id, t.tree_path || c.menu_id || '/', t.tree_depth + 1
+            FROM sys_menu c
+            JOIN tree t ON c.parent_id = t.menu_id
+        )
+        UPDATE sys_menu
+        SET tree_path = tree.tree_path, tree_depth = tree.tree_depth
+        FROM tree
+        WHERE sys_menu.menu_id = tree.menu_id
+        """
+    )
+    op.alter_column("sys_menu", "tree_path", nullable=False)
+
+    op.create_index("ix_sys_menu_parent_id", "sys_menu", ["parent_id"])
+    # varchar_pattern_ops 使 LIKE '前缀%' 的子树查询可以走索引
+    op.create_index(
+        "ix_sys_menu_tree_path",
+        "sys_menu",
+        ["tree_path"],
+        postgresql_ops={"tree_path": "varchar_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_sys_menu_tree_path", table_name="sys_menu")
+    op.drop_index("ix_sys_menu_parent_id", table_name="sys_menu")
+    op.drop_column("sys_menu", "tree_depth")
+    op.drop_column("sys_menu", "tree_path")
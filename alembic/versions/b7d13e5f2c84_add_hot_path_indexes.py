@@ -0,0 +1,59 @@
+"""add indexes for hot query paths
+
+Revision ID: b7d13e5f2c84
+Revises: 8c4e2d9b1a57
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d13e5f2c84"
+down_revision: str | Sequence[str] | None = "8c4e2d9b1a57"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (索引名, 表名, 列) —— sys_menu.parent_id 已在 8c4e2d9b1a57 中创建
+INDEXES = [
+    # /auth/isRouteExist
+    ("ix_sys_menu_route_name", "sys_menu", ["route_name"]),
+    # /system/menu/all, /system/menu/getAllPages, /system/menu/tree-option
+    ("ix_sys_menu_status_type_order", "sys_menu", ["status", "menu_type", "order"]),
+    # 按菜单反查角色、级联删除菜单时清理关联
+    ("ix_sys_role_menu_menu_id", "sys_role_menu", ["menu_id"]),
+    # 按角色反查用户、删除角色时清理关联
+    ("ix_sys_user_role_role_id", "sys_user_role", ["role_id"]),
+    # /system/user/list ORDER BY create_time DESC
+    ("ix_sys_user_create_time", "sys_user", ["create_time"]),
+    # /system/role/list ORDER BY create_time DESC, /system/role/all
+    ("ix_sys_role_create_time", "sys_role", ["create_time"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY 不能在事务中执行，建索引期间不阻塞线上读写
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _columns in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
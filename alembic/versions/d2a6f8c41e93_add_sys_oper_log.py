@@ -0,0 +1,67 @@
+"""add sys_oper_log
+
+Revision ID: d2a6f8c41e93
+Revises: b7d13e5f2c84
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a6f8c41e93"
+down_revision: str | Sequence[str] | None = "b7d13e5f2c84"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "sys_oper_log",
+        sa.Column("oper_id", sa.BigInteger(), nullable=False, comment="日志ID"),
+        sa.Column("title", sa.String(length=50), nullable=False, comment="模块标题"),
+        sa.Column(
+            "business_type",
+            sa.String(length=20),
+            nullable=False,
+            comment="操作类型: add/update/delete/...",
+        ),
+        sa.Column(
+            "request_method", sa.String(length=10), nullable=True, comment="请求方式"
+        ),
+        sa.Column(
+            "request_url", sa.String(length=255), nullable=True, comment="请求地址"
+        ),
+        sa.Column("oper_user_id", sa.BigInteger(), nullable=True, comment="操作人ID"),
+        sa.Column("oper_name", sa.String(length=50), nullable=True, comment="操作人"),
+        sa.Column("oper_ip", sa.String(length=64), nullable=True, comment="操作IP"),
+        sa.Column(
+            "target_id",
+            sa.String(length=255),
+            nullable=True,
+            comment="操作对象ID(批量时逗号分隔)",
+        ),
+        sa.Column("detail", sa.JSON(), nullable=True, comment="操作详情"),
+        sa.Column(
+            "status", sa.String(length=2), nullable=False, comment="状态：1-成功，2-失败"
+        ),
+        sa.Column("cost_time", sa.Integer(), nullable=True, comment="耗时(毫秒)"),
+        sa.Column("oper_time", sa.DateTime(), nullable=False, comment="操作时间"),
+        sa.PrimaryKeyConstraint("oper_id"),
+    )
+    op.create_index("ix_sys_oper_log_oper_time", "sys_oper_log", ["oper_time"])
+    op.create_index(
+        "ix_sys_oper_log_oper_user_id", "sys_oper_log", ["oper_user_id", "oper_time"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_sys_oper_log_oper_user_id", table_name="sys_oper_log")
+    op.drop_index("ix_sys_oper_log_oper_time", table_name="sys_oper_log")
+    op.drop_table("sys_oper_log")
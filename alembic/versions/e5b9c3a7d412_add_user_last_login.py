@@ -0,0 +1,41 @@
+"""add user last login
+
+Revision ID: e5b9c3a7d412
+Revises: d2a6f8c41e93
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b9c3a7d412"
+down_revision: str | Sequence[str] | None = "d2a6f8c41e93"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "sys_user",
+        sa.Column(
+            "last_login_time", sa.DateTime(), nullable=True, comment="最近登录时间"
+        ),
+    )
+    op.add_column(
+        "sys_user",
+        sa.Column(
+            "last_login_ip", sa.String(length=64), nullable=True, comment="最近登录IP"
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("sys_user", "last_login_ip")
+    op.drop_column("sys_user", "last_login_time")
@@ -0,0 +1,152 @@
+"""add sys_dict
+
+Revision ID: f4c8a2d61b39
+Revises: e5b9c3a7d412
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f4c8a2d61b39"
+down_revision: str | Sequence[str] | None = "e5b9c3a7d412"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# 内置字典：原先在前后端硬编码的状态、性别
+BUILTIN_TYPES = [
+    {"dict_id": 1, "dict_name": "启用状态", "dict_type": "sys_status"},
+    {"dict_id": 2, "dict_name": "用户性别", "dict_type": "sys_user_gender"},
+]
+BUILTIN_DATA = [
+    (1, "sys_status", "启用", "1", 1, "success"),
+    (2, "sys_status", "禁用", "2", 2, "warning"),
+    (3, "sys_user_gender", "未知", "0", 1, "info"),
+    (4, "sys_user_gender", "男", "1", 2, "primary"),
+    (5, "sys_user_gender", "女", "2", 3, "error"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dict_type = op.create_table(
+        "sys_dict_type",
+        sa.Column("dict_id", sa.BigInteger(), nullable=False, comment="字典ID"),
+        sa.Column(
+            "dict_name", sa.String(length=100), nullable=False, comment="字典名称"
+        ),
+        sa.Column(
+            "dict_type", sa.String(length=100), nullable=False, comment="字典类型编码"
+        ),
+        sa.Column(
+            "status",
+            sa.String(length=2),
+            nullable=False,
+            comment="状态：1-启用，2-禁用",
+        ),
+        sa.Column("remark", sa.String(length=255), nullable=True, comment="备注"),
+        sa.Column("create_by", sa.String(length=64), nullable=True, comment="创建人"),
+        sa.Column(
+            "create_time",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+            comment="创建时间",
+        ),
+        sa.Column("update_by", sa.String(length=64), nullable=True, comment="更新人"),
+        sa.Column(
+            "update_time",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+            comment="更新时间",
+        ),
+        sa.PrimaryKeyConstraint("dict_id"),
+        sa.UniqueConstraint("dict_type"),
+    )
+    dict_data = op.create_table(
+        "sys_dict_data",
+        sa.Column("data_id", sa.BigInteger(), nullable=False, comment="字典数据ID"),
+        sa.Column(
+            "dict_type", sa.String(length=100), nullable=False, comment="字典类型编码"
+        ),
+        sa.Column(
+            "dict_label", sa.String(length=100), nullable=False, comment="字典标签"
+        ),
+        sa.Column(
+            "dict_value", sa.String(length=100), nullable=False, comment="字典键值"
+        ),
+        sa.Column("sort", sa.Integer(), nullable=False, comment="排序"),
+        sa.Column(
+            "tag_type",
+            sa.String(length=20),
+            nullable=True,
+            comment="标签样式: primary/success/warning/...",
+        ),
+        sa.Column(
+            "status",
+            sa.String(length=2),
+            nullable=False,
+            comment="状态：1-启用，2-禁用",
+        ),
+        sa.Column("remark", sa.String(length=255), nullable=True, comment="备注"),
+        sa.Column("create_by", sa.String(length=64), nullable=True, comment="创建人"),
+        sa.Column(
+            "create_time",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+            comment="创建时间",
+        ),
+        sa.Column("update_by", sa.String(length=64), nullable=True, comment="更新人"),
+        sa.Column(
+            "update_time",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+            comment="更新时间",
+        ),
+        sa.ForeignKeyConstraint(
+            ["dict_type"],
+            ["sys_dict_type.dict_type"],
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("data_id"),
+        sa.UniqueConstraint("dict_type", "dict_value", name="uq_sys_dict_data_value"),
+    )
+    op.create_index(
+        "ix_sys_dict_data_type_sort",
+        "sys_dict_data",
+        ["dict_type", "sort"],
+        unique=False,
+    )
+
+    op.bulk_insert(dict_type, [{**row, "status": "1"} for row in BUILTIN_TYPES])
+    op.bulk_insert(
+        dict_data,
+        [
+            {
+                "data_id": data_id,
+                "dict_type": type_code,
+                "dict_label": label,
+                "dict_value": value,
+                "sort": sort,
+                "tag_type": tag_type,
+                "status": "1",
+            }
+            for data_id, type_code, label, value, sort, tag_type in BUILTIN_DATA
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_sys_dict_data_type_sort", table_name="sys_dict_data")
+    op.drop_table("sys_dict_data")
+    op.drop_table("sys_dict_type")
@@ -0,0 +1,124 @@
+"""
+异步批量写入
+
+写请求只把记录放入有界队列即返回，后台任务按条数或时间间隔攒批，
+以一条多行 INSERT 写入数据库。队列写满时按 overflow 策略处理：
+- drop: 直接丢弃并计数，不影响请求延迟 (默认，适合审计、统计类日志)
+- block: 等待队列空出最多 block_timeout 秒 (反压)，仍无空间时丢弃
+"""
+
+import asyncio
+import logging
+from typing import Any, Literal
+
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWriter:
+    def __init__(
+        self,
+        table: Table,
+        engine: AsyncEngine,
+        *,
+        maxsize: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        overflow: Literal["drop", "block"] = "drop",
+        block_timeout: float = 0.5,
+    ):
+        self.table = table
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.written = 0
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize)
+        self._task: asyncio.Task | None = None
+        # 正在攒批、尚未写入的记录，以及正在执行的写入，关闭时需要等待/补写
+        self._batch: list[dict[str, Any]] = []
+        self._flushing: asyncio.Future | None = None
+
+    async def submit(self, row: dict[str, Any]) -> bool:
+        """放入队列，返回 False 表示因队列已满被丢弃"""
+        try:
+            if self.overflow == "block":
+                await asyncio.wait_for(self._queue.put(row), self.block_timeout)
+            else:
+                self._queue.put_nowait(row)
+        except (asyncio.QueueFull, TimeoutError):
+            self.dropped += 1
+            # 只在 1、2、4、8... 次时记录，避免持续拥塞时刷屏
+            if self.dropped & (self.dropped - 1) == 0:
+                logger.warning(
+                    "%s queue full, %s rows dropped", self.table.name, self.dropped
+                )
+            return False
+        return True
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台任务并写完队列中剩余的记录"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._flushing is not None:
+            await self._flushing
+        rows, self._batch = self._batch, []
+        rows.extend(self._drain(self._queue.qsize()))
+        for i in range(0, len(rows), self.batch_size):
+            await self._flush(rows[i : i + self.batch_size])
+
+    def _drain(self, limit: int) -> list[dict[str, Any]]:
+        rows = []
+        while len(rows) < limit and not self._queue.empty():
+            rows.append(self._queue.get_nowait())
+        return rows
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # 阻塞等待第一条，之后在 flush_interval 内继续攒批直到 batch_size
+            self._batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout)
+                    )
+                except TimeoutError:
+                    break
+                self._batch.extend(self._drain(self.batch_size - len(self._batch)))
+
+            rows, self._batch = self._batch, []
+            # shield: 应用关闭取消任务时，当前批次仍会写完 (stop 中等待)
+            self._flushing = asyncio.ensure_future(self._flush(rows))
+            await asyncio.shield(self._flushing)
+            self._flushing = None
+
+    async def _flush(self, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        try:
+            async with self.engine.begin() as conn:
+                await conn.execute(insert(self.table), rows)
+        except Exception:
+            logger.exception(
+                "Failed to write %s rows to %s", len(rows), self.table.name
+            )
+            self.dropped += len(rows)
+        else:
+            self.written += len(rows)
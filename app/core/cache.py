@@ -0,0 +1,205 @@
+"""
+版本化响应载荷缓存
+
+对于按命名空间版本号失效的大体积响应(如菜单树、用户路由)，
+每个版本只执行一次 JSON 序列化与 gzip/brotli 压缩，之后的请求直接复用字节；
+版本失效瞬间的并发请求经单飞合并，只有一个请求执行构建。
+"""
+
+import gzip
+import hashlib
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from app.core.config import settings
+from app.core.invalidation import get_version
+from app.core.singleflight import SingleFlight
+
+try:
+    import brotli
+except ImportError:  # brotli 为可选依赖，未安装时仅协商 gzip
+    brotli = None
+
+
+def choose_encoding(accept_encoding: str | None, available: set[str]) -> str | None:
+    """
+    根据 Accept-Encoding 选择内容编码
+    同等权重下优先 br，其次 gzip；q=0 表示客户端明确拒绝该编码
+    """
+    if not accept_encoding or not available:
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    best, best_q = None, 0.0
+    for encoding in ("br", "gzip"):
+        if encoding not in available:
+            continue
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+async def render_route_payload(route: Any, content: Any) -> bytes:
+    """按路由的 response_model 配置序列化响应，与 FastAPI 默认输出保持一致"""
+    data = await serialize_response(
+        field=getattr(route, "response_field", None),
+        response_content=content,
+        by_alias=getattr(route, "response_model_by_alias", True),
+        exclude_none=getattr(route, "response_model_exclude_none", False),
+    )
+    return JSONResponse(data).body
+
+
+def route_for(router: Any, endpoint: Callable) -> Any:
+    """查找 endpoint 对应的路由，用于预热时按该路由的配置序列化"""
+    return next(r for r in router.routes if getattr(r, "endpoint", None) is endpoint)
+
+
+@dataclass(slots=True)
+class CachedPayload:
+    """单个版本的响应体及其预压缩变体"""
+
+    version: tuple[int, ...]
+    body: bytes
+    etag: str
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    def to_response(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Vary": "Accept-Encoding"}
+        if request.headers.get("if-none-match") == self.etag:
+            return Response(status_code=304, headers=headers)
+
+        encoding = choose_encoding(
+            request.headers.get("accept-encoding"), set(self.encoded)
+        )
+        body = self.body
+        if encoding:
+            body = self.encoded[encoding]
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+class PayloadCache:
+    """
+    进程内 LRU 缓存，条目与命名空间版本号绑定
+    版本号变化后旧条目在下次访问时被替换，压缩只在写入新版本时进行一次
+    """
+
+    def __init__(
+        self,
+        maxsize: int = settings.RESPONSE_CACHE_MAXSIZE,
+        min_size: int = settings.RESPONSE_COMPRESS_MIN_SIZE,
+        flight_name: str = "payload-cache",
+    ):
+        self.maxsize = maxsize
+        self.min_size = min_size
+        self._entries: OrderedDict[Hashable, CachedPayload] = OrderedDict()
+        self._flight = SingleFlight(flight_name)
+
+    def get(self, key: Hashable, version: tuple[int, ...]) -> CachedPayload | None:
+        entry = self._entries.get(key)
+        if entry is None or entry.version != version:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(
+        self, key: Hashable, version: tuple[int, ...], body: bytes
+    ) -> CachedPayload:
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        entry = CachedPayload(version=version, body=body, etag=etag)
+        if len(body) >= self.min_size:
+            entry.encoded["gzip"] = gzip.compress(
+                body, compresslevel=settings.RESPONSE_GZIP_LEVEL
+            )
+            if brotli is not None:
+                entry.encoded["br"] = brotli.compress(
+                    body, quality=settings.RESPONSE_BROTLI_QUALITY
+                )
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def respond(
+        self,
+        request: Request,
+        key: Hashable,
+        namespaces: tuple[str, ...],
+        builder: Callable[[], Awaitable[Any]],
+    ) -> Response:
+        """
+        命中当前版本则直接返回缓存字节，否则调用 builder 生成内容并缓存
+        :param key: 缓存键 (需包含区分不同内容的全部因素，如角色集合)
+        :param namespaces: 内容所依赖的命名空间，任一版本变化即失效
+        :param builder: 在多个请求共享的任务中执行，不能使用请求级会话，需自行打开会话
+        """
+        entry = await self._load(request.scope.get("route"), key, namespaces, builder)
+        return entry.to_response(request)
+
+    async def prime(
+        self,
+        route: Any,
+        key: Hashable,
+        namespaces: tuple[str, ...],
+        builder: Callable[[], Awaitable[Any]],
+    ) -> CachedPayload:
+        """预热：不经过请求直接为指定路由生成当前版本的缓存 (启动时使用)"""
+        return await self._load(route, key, namespaces, builder)
+
+    async def _load(
+        self,
+        route: Any,
+        key: Hashable,
+        namespaces: tuple[str, ...],
+        builder: Callable[[], Awaitable[Any]],
+    ) -> CachedPayload:
+        # 先取版本号再构建：构建期间发生的写操作会使本次结果在下次访问时失效
+        version = tuple(get_version(ns) for ns in namespaces)
+        entry = self.get(key, version)
+        if entry is None:
+            # 缓存刚失效时的并发请求合并为一次构建
+            entry = await self._flight.do(
+                (key, version), lambda: self._build(route, key, version, builder)
+            )
+        return entry
+
+    async def _build(
+        self,
+        route: Any,
+        key: Hashable,
+        version: tuple[int, ...],
+        builder: Callable[[], Awaitable[Any]],
+    ) -> CachedPayload:
+        content = await builder()
+        body = await render_route_payload(route, content)
+        return self.put(key, version, body)
+
+
+payload_cache = PayloadCache()
@@ -12,12 +12,88 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 7 * 24 * 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = (
+        100000  # 每个 worker 吊销记录布隆过滤器的容量
+    )
+    USER_NAME_BLOOM_CAPACITY: int = 100000  # 用户名存在性布隆过滤器的最小容量
+    USER_NAME_BLOOM_REBUILD_SECONDS: int = 3600  # 用户名布隆过滤器全量重建的间隔(秒)
+
+    # 数据库日志配置
+    DB_ECHO: bool = False  # 打印全部 SQL 语句，仅用于本地调试
+    DB_SLOW_QUERY_MS: float = 200.0  # 超过该耗时(毫秒)的语句记入慢查询日志，0 表示关闭
+    DB_SLOW_QUERY_EXPLAIN: bool = (
+        True  # 非生产环境下为慢查询抓取 EXPLAIN (ANALYZE, BUFFERS)
+    )
+    DB_SLOW_QUERY_EXPLAIN_INTERVAL: float = (
+        300.0  # 同一语句两次抓取执行计划的最小间隔(秒)
+    )
+
+    # 启动与关闭配置
+    DB_WARMUP_CONNECTIONS: int = 5  # 启动时预先建立的数据库连接数(不超过连接池大小)
+    SHUTDOWN_DRAIN_TIMEOUT: float = 20.0  # 关闭时等待进行中请求完成的最长秒数
 
     # Redis 配置
     REDIS_HOST: str = "127.0.0.1"
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: str | None = None
     REDIS_DB: int = 0
+    REDIS_MAX_CONNECTIONS: int = 50  # 连接池最大连接数
+    REDIS_POOL_TIMEOUT: float = 1.0  # 连接池耗尽时等待空闲连接的秒数
+    REDIS_SOCKET_TIMEOUT: float = 0.5  # 单条命令读写超时(秒)
+    REDIS_CONNECT_TIMEOUT: float = 0.5  # 建立连接超时(秒)
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30  # 空闲连接健康检查间隔(秒)
+    REDIS_BREAKER_THRESHOLD: int = 5  # 连续失败多少次后熔断
+    REDIS_BREAKER_RESET_SECONDS: float = 10.0  # 熔断持续时间，之后放行试探请求
+
+    # 登录限流配置 (滑动窗口，超限后按指数退避锁定)
+    LOGIN_RATE_LIMIT_USER: int = 5  # 单个账号每个窗口允许的登录尝试次数
+    LOGIN_RATE_LIMIT_IP: int = 20  # 单个 IP 每个窗口允许的登录尝试次数
+    LOGIN_RATE_LIMIT_WINDOW: int = 60  # 窗口长度(秒)
+    LOGIN_LOCKOUT_SECONDS: int = 60  # 首次锁定秒数，之后每次翻倍
+    LOGIN_LOCKOUT_MAX_SECONDS: int = 3600  # 锁定时长上限(秒)
+
+    # 操作日志配置 (内存队列 + 后台批量写入)
+    OPER_LOG_QUEUE_SIZE: int = 10000  # 队列容量
+    OPER_LOG_BATCH_SIZE: int = 200  # 单次写入的最大条数
+    OPER_LOG_FLUSH_INTERVAL: float = 1.0  # 攒批最长等待秒数
+    OPER_LOG_OVERFLOW: Literal["drop", "block"] = "drop"  # 队列满时丢弃或短暂等待
+
+    # 在线会话配置
+    ONLINE_SESSION_TIMEOUT: int = 1800  # 超过该秒数没有请求的会话视为离线
+    ONLINE_TOUCH_INTERVAL: int = 60  # 同一会话刷新最近活跃时间的最小间隔(秒)
+    ACTIVE_USER_RETENTION_DAYS: int = 90  # 日活统计保留天数
+    LAST_LOGIN_FLUSH_INTERVAL: float = 10.0  # 最近登录信息批量写回数据库的间隔(秒)
+
+    # 雪花 ID 配置
+    ID_WORKER_ID: int | None = None  # 显式指定实例号(0-1023)，为空时从 Redis 租约获取
+    ID_WORKER_LEASE_TTL: int = 60  # 实例号租约有效期(秒)
+    ID_CLOCK_BACKWARD_TOLERANCE_MS: int = 5000  # 可容忍的时钟回拨毫秒数
+
+    # 后台任务配置
+    JOB_WORKER_CONCURRENCY: int = 4  # 每个 worker 进程同时执行的任务数
+    JOB_MAX_RETRIES: int = 3  # 默认失败重试次数
+    JOB_RETRY_BACKOFF: float = 5.0  # 首次重试等待秒数，之后按指数退避
+    JOB_TIMEOUT: float = 1800.0  # 默认单次执行超时(秒)
+    JOB_LEASE_SECONDS: int = 30  # 执行租约时长，worker 失联超过该时间后任务重新入队
+    JOB_RESULT_TTL: int = 86400  # 结束后任务详情与生成文件的保留秒数
+    JOB_SHUTDOWN_TIMEOUT: float = 30.0  # worker 关闭时等待执行中任务的最长秒数
+
+    # 响应缓存与压缩配置
+    RESPONSE_CACHE_MAXSIZE: int = 256  # 进程内缓存的最大条目数
+    RESPONSE_COMPRESS_MIN_SIZE: int = 1024  # 小于该字节数的响应不压缩
+    RESPONSE_GZIP_LEVEL: int = 6
+    RESPONSE_BROTLI_QUALITY: int = 9  # 每个版本只压缩一次，可使用较高质量
+    CACHE_VERSION_SYNC_INTERVAL: float = 5.0  # 从 Redis 追平缓存版本号的间隔(秒)
+    REDIS_CACHE_LOCK_TIMEOUT: float = 10.0  # Redis 响应缓存重建锁的最长持有时间(秒)
+    REDIS_CACHE_WAIT_TIMEOUT: float = 2.0  # 无旧值时等待其他请求重建的最长秒数
+    REDIS_CACHE_BETA: float = 1.0  # 提前刷新系数，越大越早刷新
+
+    # 请求剖析配置
+    PROFILE_SAMPLE_RATE: float = (
+        0.0  # 随机剖析的请求比例，0 表示只剖析带签名请求头的请求
+    )
+    PROFILE_DIR: str = "profiles"  # 剖析结果目录
+    PROFILE_MAX_FILES: int = 100  # 最多保留的剖析结果数，超出后删除最旧的
 
     @property
     def REDIS_URL(self) -> str:
@@ -1,10 +1,239 @@
-from snowflake import SnowflakeGenerator
+"""
+雪花 ID 生成器
 
-# In actual production, worker_id can be obtained from environment variables or the container's hostname hash.
-# Here, it's set to 1 by default.
-generator = SnowflakeGenerator(instance=1)
+位布局与 snowflake-id 保持一致: 41 位毫秒时间戳 | 10 位实例号 | 12 位序列号。
+实例号(worker id)优先从 Redis 租约获取，保证多进程/多 Pod 部署时不重复；
+Redis 不可用时回退为主机名 + 进程号的哈希值。
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+
+from snowflake import MAX_INSTANCE, MAX_SEQ, MAX_TS
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ClockMovedBackwardsError(RuntimeError):
+    """系统时钟回拨超出容忍范围"""
+
+
+def fallback_instance() -> int:
+    """未获得租约时使用的实例号：显式配置优先，否则取主机名与进程号的哈希"""
+    if settings.ID_WORKER_ID is not None:
+        return settings.ID_WORKER_ID & MAX_INSTANCE
+    seed = f"{socket.gethostname()}:{os.getpid()}".encode()
+    return int.from_bytes(hashlib.blake2b(seed, digest_size=4).digest()) & MAX_INSTANCE
+
+
+class IdGenerator:
+    """
+    线程安全的雪花 ID 生成器
+
+    时钟回拨时沿用上一次的时间戳继续分配序列号(逻辑时钟)，保证 ID 单调递增；
+    回拨超过 ID_CLOCK_BACKWARD_TOLERANCE_MS 时抛出 ClockMovedBackwardsError。
+    """
+
+    def __init__(self, instance: int, *, epoch: int = 0):
+        if not 0 <= instance <= MAX_INSTANCE:
+            raise ValueError(f"instance must be between 0 and {MAX_INSTANCE}")
+        self.instance = instance
+        self.epoch = epoch
+        self._lock = threading.Lock()
+        self._last_ts = -1
+        self._seq = 0
+
+    def set_instance(self, instance: int) -> None:
+        """切换实例号 (租约变更时调用)"""
+        if not 0 <= instance <= MAX_INSTANCE:
+            raise ValueError(f"instance must be between 0 and {MAX_INSTANCE}")
+        with self._lock:
+            self.instance = instance
+
+    def _now(self) -> int:
+        return time.time_ns() // 1_000_000 - self.epoch
+
+    def _advance(self, ts: int) -> int:
+        """当前毫秒序列号耗尽时取下一个可用时间戳"""
+        now = self._now()
+        if now > ts:
+            return now
+        # 时钟未前进(或已回拨)时借用下一毫秒；领先真实时钟超过容忍值则等待追上，
+        # 保证持续高吞吐不会被误判为时钟回拨
+        lead = ts + 1 - now
+        if lead > settings.ID_CLOCK_BACKWARD_TOLERANCE_MS:
+            time.sleep((lead - settings.ID_CLOCK_BACKWARD_TOLERANCE_MS) / 1000)
+        return ts + 1
+
+    def _reserve(self, count: int) -> list[int]:
+        ids: list[int] = []
+        with self._lock:
+            now = self._now()
+            lag = self._last_ts - now
+            if lag > settings.ID_CLOCK_BACKWARD_TOLERANCE_MS:
+                raise ClockMovedBackwardsError(
+                    f"Clock moved backwards by {lag}ms, refusing to generate ids"
+                )
+
+            if now > self._last_ts:
+                ts, seq = now, 0
+            else:
+                ts, seq = self._last_ts, self._seq + 1
+
+            prefix_instance = self.instance << 12
+            while count > 0:
+                if seq > MAX_SEQ:
+                    ts, seq = self._advance(ts), 0
+                if ts > MAX_TS:
+                    raise OverflowError("Snowflake timestamp overflow")
+                take = min(count, MAX_SEQ + 1 - seq)
+                base = ts << 22 | prefix_instance
+                ids.extend(range(base | seq, base | (seq + take)))
+                seq += take
+                count -= take
+
+            self._last_ts, self._seq = ts, seq - 1
+        return ids
+
+    def next_id(self) -> int:
+        return self._reserve(1)[0]
+
+    def next_ids(self, count: int) -> list[int]:
+        """一次性分配 count 个连续递增的 ID，适用于批量插入"""
+        if count <= 0:
+            return []
+        return self._reserve(count)
+
+
+generator = IdGenerator(instance=fallback_instance())
 
 
 def next_id() -> int:
     """Generate the next snowflake ID"""
-    return next(generator)
+    return generator.next_id()
+
+
+def next_ids(count: int) -> list[int]:
+    """Generate a block of snowflake IDs for batch inserts"""
+    return generator.next_ids(count)
+
+
+# KEYS[1..n] 为候选实例号对应的租约键，按顺序尝试占用第一个空闲的
+_ACQUIRE_SCRIPT = """
+for i, key in ipairs(KEYS) do
+    if redis.call('SET', key, ARGV[1], 'NX', 'EX', ARGV[2]) then
+        return i - 1
+    end
+end
+return -1
+"""
+
+# 仅在租约仍归属自己时续期/释放，避免误操作其他进程的租约
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class WorkerIdLease:
+    """
+    基于 Redis 的实例号租约
+
+    启动时从哈希位置开始顺序寻找空闲实例号并以 TTL 占用，后台按 TTL/3 续期；
+    租约丢失(如 Redis 数据被清空后被他人占用)时重新申请并切换实例号。
+    """
+
+    key_prefix = "sys:snowflake:worker:"
+
+    def __init__(self, id_generator: IdGenerator, ttl: int | None = None):
+        self.generator = id_generator
+        self.ttl = ttl or settings.ID_WORKER_LEASE_TTL
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+        self.instance: int | None = None
+        self._redis = None
+        self._task: asyncio.Task | None = None
+
+    def _key(self, instance: int) -> str:
+        return f"{self.key_prefix}{instance}"
+
+    async def _acquire(self) -> int | None:
+        start = fallback_instance()
+        keys = [self._key((start + i) & MAX_INSTANCE) for i in range(MAX_INSTANCE + 1)]
+        index = await self._redis.eval(
+            _ACQUIRE_SCRIPT, len(keys), *keys, self.owner, self.ttl
+        )
+        if int(index) < 0:
+            return None
+        return (start + int(index)) & MAX_INSTANCE
+
+    async def start(self, redis_client) -> None:
+        """申请租约并启动续期任务；Redis 不可用时保留回退实例号"""
+        if settings.ID_WORKER_ID is not None:
+            return
+        self._redis = redis_client
+        try:
+            instance = await self._acquire()
+        except Exception as exc:
+            logger.warning("Worker id lease unavailable, using fallback: %s", exc)
+            return
+        if instance is None:
+            logger.warning("All worker ids are leased, using fallback instance")
+            return
+
+        self.instance = instance
+        self.generator.set_instance(instance)
+        self._task = asyncio.create_task(self._heartbeat())
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            try:
+                renewed = await self._redis.eval(
+                    _RENEW_SCRIPT, 1, self._key(self.instance), self.owner, self.ttl
+                )
+                if not renewed:
+                    logger.warning(
+                        "Worker id %s lease lost, re-acquiring", self.instance
+                    )
+                    instance = await self._acquire()
+                    if instance is not None:
+                        self.instance = instance
+                        self.generator.set_instance(instance)
+            except Exception as exc:
+                # 续期失败时继续使用当前实例号，等待下一次心跳重试
+                logger.warning("Worker id lease renewal failed: %s", exc)
+
+    async def stop(self) -> None:
+        """停止续期并释放租约"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self.instance is None:
+            return
+        try:
+            await self._redis.eval(
+                _RELEASE_SCRIPT, 1, self._key(self.instance), self.owner
+            )
+        except Exception as exc:
+            logger.warning("Worker id lease release failed: %s", exc)
+        self.instance = None
+
+
+worker_lease = WorkerIdLease(generator)
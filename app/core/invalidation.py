@@ -0,0 +1,185 @@
+"""
+跨进程缓存失效总线
+
+每个命名空间 (menu / role / user / dict / token) 在 Redis 哈希中维护一个递增版本号，
+写操作提交后调用 bump_version 递增版本号并通过 pub/sub 广播，
+各 worker 收到消息后更新本地版本号并回调已注册的本地缓存。
+漏收消息 (断线、重启) 的 worker 会定期从版本号哈希追平，因此本地缓存可以设置较长的有效期。
+新增类写操作可以随版本号一并广播新增的成员 (如新用户名)，存在性索引据此原地追加而不必重建。
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+from collections import defaultdict
+from collections.abc import Callable, Sequence
+
+from app.core.config import settings
+from app.core.redis import breaker, redis_client
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_KEY = "cache:versions"
+CHANNEL = "cache:invalidate"
+
+# 本地版本号，读取为纯内存操作
+_versions: dict[str, int] = {}
+# Redis 不可用时使用的本地版本号 (负数)，不会与 Redis 中的计数 (>= 0) 冲突，
+# 恢复连接后追平时必然与远端不同，从而再次失效
+_local_versions = itertools.count(1)
+# 降级期间发生变更、尚未广播的命名空间，恢复连接后补发
+_pending: set[str] = set()
+# (回调, 是否接收新增成员)
+_listeners: dict[str, list[tuple[Callable, bool]]] = defaultdict(list)
+
+# KEYS: [版本号哈希]  ARGV: [频道, 消息附加内容, 命名空间...]
+# 递增与广播在同一脚本内完成，只需一次往返，返回各命名空间的新版本号
+# 消息格式为 "命名空间:版本号"，带新增成员时附加 "\n" 与成员的 JSON 数组
+_BUMP_SCRIPT = """
+local versions = {}
+for i = 3, #ARGV do
+    local version = redis.call('HINCRBY', KEYS[1], ARGV[i], 1)
+    redis.call('PUBLISH', ARGV[1], ARGV[i] .. ':' .. version .. ARGV[2])
+    versions[#versions + 1] = version
+end
+return versions
+"""
+_bump = redis_client.register_script(_BUMP_SCRIPT)
+
+
+def get_version(namespace: str) -> int:
+    """获取命名空间当前版本号"""
+    return _versions.get(namespace, 0)
+
+
+def on_invalidate(
+    namespace: str, callback: Callable[..., None], members: bool = False
+) -> None:
+    """
+    注册本地缓存失效回调，版本号变化时以 (namespace, version) 调用
+    members=True 时追加第三个参数：本次新增的成员元组；
+    版本号来自定期追平时无法得知新增了什么，传入 None
+    """
+    _listeners[namespace].append((callback, members))
+
+
+def _apply(
+    namespace: str, version: int, members: tuple[str, ...] | None = None
+) -> None:
+    if _versions.get(namespace, 0) == version:
+        return
+    _versions[namespace] = version
+    for callback, with_members in _listeners.get(namespace, ()):
+        try:
+            if with_members:
+                callback(namespace, version, members)
+            else:
+                callback(namespace, version)
+        except Exception:
+            logger.exception("Invalidation callback failed for %s", namespace)
+
+
+def parse_message(data: str) -> tuple[str, int, tuple[str, ...]]:
+    """解析广播消息，返回 (命名空间, 版本号, 新增成员)"""
+    header, _, body = data.partition("\n")
+    namespace, _, version = header.rpartition(":")
+    return namespace, int(version), tuple(json.loads(body)) if body else ()
+
+
+async def bump_version(*namespaces: str, members: Sequence[str] = ()) -> None:
+    """
+    递增命名空间版本号并广播，依赖这些命名空间的缓存在各进程中失效
+    必须在事务提交之后调用，否则其他进程可能按旧数据重建缓存
+    :param members: 本次新增的成员 (如新用户名)，随消息一并广播
+    """
+    members = tuple(members)
+    if breaker.available:
+        payload = "\n" + json.dumps(members, ensure_ascii=False) if members else ""
+        try:
+            versions = await _bump(
+                keys=[VERSIONS_KEY], args=[CHANNEL, payload, *namespaces]
+            )
+        except Exception as exc:
+            logger.warning("Failed to publish invalidation, local only: %s", exc)
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            for namespace, version in zip(namespaces, versions, strict=True):
+                _apply(namespace, version, members)
+            return
+
+    _pending.update(namespaces)
+    for namespace in namespaces:
+        _apply(namespace, -next(_local_versions), members)
+
+
+async def sync_versions() -> None:
+    """从 Redis 追平全部命名空间版本号，并补发降级期间的变更"""
+    if _pending:
+        pending = sorted(_pending)
+        await _bump(keys=[VERSIONS_KEY], args=[CHANNEL, "", *pending])
+        _pending.difference_update(pending)
+    remote = await redis_client.hgetall(VERSIONS_KEY)
+    for namespace, version in remote.items():
+        _apply(namespace, int(version))
+    # Redis 中不存在的命名空间视为 0 (如 Redis 被清空)
+    for namespace in set(_versions) - set(remote):
+        _apply(namespace, 0)
+
+
+class InvalidationBus:
+    """订阅失效消息的后台任务，断线后自动重连并追平"""
+
+    def __init__(self, sync_interval: float = settings.CACHE_VERSION_SYNC_INTERVAL):
+        self.sync_interval = sync_interval
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        # 启动时先追平一次，保证随后的缓存预热使用最新版本号
+        try:
+            await sync_versions()
+        except Exception as exc:
+            logger.warning("Cache version sync failed at startup: %s", exc)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Invalidation bus disconnected, retrying: %s", exc)
+                await asyncio.sleep(min(self.sync_interval, 5))
+
+    async def _listen(self) -> None:
+        async with redis_client.pubsub(ignore_subscribe_messages=True) as pubsub:
+            await pubsub.subscribe(CHANNEL)
+            # 先订阅再追平，避免两者之间的消息丢失
+            await sync_versions()
+            loop = asyncio.get_running_loop()
+            next_sync = loop.time() + self.sync_interval
+            while True:
+                message = await pubsub.get_message(timeout=self.sync_interval)
+                if message is not None:
+                    namespace, version, members = parse_message(message["data"])
+                    # 消息可能晚于追平到达，只接受更新的版本号
+                    if version > get_version(namespace):
+                        _apply(namespace, version, members)
+                if loop.time() >= next_sync:
+                    # 定期追平，兜底处理漏收的消息
+                    await sync_versions()
+                    next_sync = loop.time() + self.sync_interval
+
+
+invalidation_bus = InvalidationBus()
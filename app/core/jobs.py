@@ -0,0 +1,387 @@
+"""
+后台任务队列 (Redis)
+
+耗时的管理操作 (导出、批量处理、层级重建等) 由接口入队后立即返回任务 ID，
+在独立的 worker 进程 (python -m app.worker) 中执行：
+
+    @job("user.export", max_retries=1)
+    async def export_users(ctx: JobContext, **params) -> dict: ...
+
+    job_id = await export_users.enqueue(owner=user_id, status="1")
+
+Redis 结构:
+- jobs:queue      待执行任务 ID (list，LPUSH 入队，BLMOVE 原子移入 jobs:running)
+- jobs:running    执行中的任务 ID (list)
+- jobs:delayed    等待重试的任务 ID (zset，score 为可执行时间)
+- jobs:job:{id}   任务详情 (hash)：状态、进度、参数、结果、错误、执行次数、租约
+- jobs:file:{id}  任务生成的文件 (hash)，如导出的 CSV
+
+- 执行中的任务定期续约；worker 崩溃后租约过期，任务由其他 worker 重新入队
+  (至少执行一次，任务需可重复执行)
+- 失败按指数退避重试，超过 max_retries 后标记为 failed
+- 结束后详情与文件保留 JOB_RESULT_TTL 秒
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.redis import pipelined, redis_client
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "jobs:queue"
+RUNNING_KEY = "jobs:running"
+DELAYED_KEY = "jobs:delayed"
+
+QUEUED = "queued"
+RUNNING = "running"
+RETRYING = "retrying"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def job_key(job_id: str) -> str:
+    return f"jobs:job:{job_id}"
+
+
+def file_key(job_id: str) -> str:
+    return f"jobs:file:{job_id}"
+
+
+# KEYS: [delayed, queue]  ARGV: [当前时间, 单次最多处理数]
+# 到期的重试任务移回待执行队列
+_PROMOTE_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, id in ipairs(ids) do
+    redis.call('ZREM', KEYS[1], id)
+    if redis.call('EXISTS', 'jobs:job:' .. id) == 1 then
+        redis.call('HSET', 'jobs:job:' .. id, 'status', 'queued')
+        redis.call('LPUSH', KEYS[2], id)
+    end
+end
+return #ids
+"""
+# KEYS: [running, queue]  ARGV: [当前时间]
+# 租约过期 (worker 已退出) 的任务重新入队；详情已过期的任务直接移除，
+# 刚取出、尚未写入租约的任务跳过
+_REQUEUE_SCRIPT = """
+local count = 0
+for _, id in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+    local key = 'jobs:job:' .. id
+    local lease = redis.call('HGET', key, 'lease')
+    if redis.call('EXISTS', key) == 0 then
+        redis.call('LREM', KEYS[1], 1, id)
+    elseif lease and tonumber(lease) < tonumber(ARGV[1]) then
+        redis.call('LREM', KEYS[1], 1, id)
+        redis.call('HSET', key, 'status', 'queued')
+        redis.call('HDEL', key, 'lease')
+        redis.call('LPUSH', KEYS[2], id)
+        count = count + 1
+    end
+end
+return count
+"""
+_promote = redis_client.register_script(_PROMOTE_SCRIPT)
+_requeue = redis_client.register_script(_REQUEUE_SCRIPT)
+
+
+class JobContext:
+    """传给任务函数的上下文，用于上报进度与保存生成的文件"""
+
+    def __init__(self, job_id: str, attempt: int):
+        self.job_id = job_id
+        self.attempt = attempt
+
+    async def progress(self, percent: float, message: str | None = None) -> None:
+        mapping = {"progress": round(min(max(percent, 0), 100), 1)}
+        if message is not None:
+            mapping["message"] = message
+        await redis_client.hset(job_key(self.job_id), mapping=mapping)
+
+    async def save_file(
+        self, filename: str, content: str, media_type: str = "text/csv"
+    ) -> None:
+        await pipelined(
+            [
+                (
+                    "hset",
+                    file_key(self.job_id),
+                    None,
+                    None,
+                    {
+                        "filename": filename,
+                        "media_type": media_type,
+                        "content": content,
+                    },
+                ),
+                ("expire", file_key(self.job_id), settings.JOB_RESULT_TTL),
+            ],
+            transaction=True,
+        )
+
+
+JobFunc = Callable[..., Awaitable[Any]]
+
+
+class Job:
+    def __init__(self, name: str, fn: JobFunc, max_retries: int, timeout: float):
+        self.name = name
+        self.fn = fn
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+    async def enqueue(self, owner: int | None = None, **params: Any) -> str:
+        """入队并返回任务 ID，参数需可 JSON 序列化"""
+        job_id = uuid.uuid4().hex
+        detail = {
+            "job_id": job_id,
+            "name": self.name,
+            "params": json.dumps(params, ensure_ascii=False, default=str),
+            "owner": "" if owner is None else str(owner),
+            "status": QUEUED,
+            "progress": 0,
+            "attempts": 0,
+            "created_at": time.time(),
+        }
+        await pipelined(
+            [
+                ("hset", job_key(job_id), None, None, detail),
+                ("lpush", QUEUE_KEY, job_id),
+            ],
+            transaction=True,
+        )
+        return job_id
+
+
+_registry: dict[str, Job] = {}
+
+
+def job(
+    name: str,
+    *,
+    max_retries: int = settings.JOB_MAX_RETRIES,
+    timeout: float = settings.JOB_TIMEOUT,
+) -> Callable[[JobFunc], Job]:
+    """注册任务，任务函数签名为 (ctx: JobContext, **params)"""
+
+    def decorator(fn: JobFunc) -> Job:
+        spec = Job(name, fn, max_retries, timeout)
+        _registry[name] = spec
+        return spec
+
+    return decorator
+
+
+async def get_job(job_id: str) -> dict[str, Any] | None:
+    """读取任务详情，不存在或已过期返回 None"""
+    detail = await redis_client.hgetall(job_key(job_id))
+    if not detail:
+        return None
+    for field in ("params", "result"):
+        if detail.get(field):
+            detail[field] = json.loads(detail[field])
+    return detail
+
+
+async def get_job_file(job_id: str) -> dict[str, str] | None:
+    return await redis_client.hgetall(file_key(job_id)) or None
+
+
+def retry_delay(attempt: int) -> float:
+    """第 attempt 次失败后的等待秒数 (指数退避，最多 10 分钟)"""
+    return min(settings.JOB_RETRY_BACKOFF * 2 ** (attempt - 1), 600.0)
+
+
+class Worker:
+    def __init__(self, concurrency: int = settings.JOB_WORKER_CONCURRENCY):
+        self.concurrency = concurrency
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = settings.JOB_LEASE_SECONDS
+        self._running: dict[str, asyncio.Task] = {}
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        """拉取并执行任务，直到 stop() 被调用；退出前等待执行中的任务完成"""
+        logger.info(
+            "Job worker %s started, concurrency %s", self.name, self.concurrency
+        )
+        slots = asyncio.Semaphore(self.concurrency)
+        maintenance = asyncio.create_task(self._maintain())
+        # 阻塞出队使用独立连接，共享连接池的读超时远小于阻塞时长
+        blocking = redis.Redis.from_url(
+            settings.REDIS_URL, decode_responses=True, socket_timeout=10
+        )
+        try:
+            while await self._acquire_slot(slots):
+                try:
+                    job_id = await blocking.blmove(
+                        QUEUE_KEY, RUNNING_KEY, 1, "RIGHT", "LEFT"
+                    )
+                except Exception as exc:
+                    slots.release()
+                    logger.warning("Job queue unavailable: %s", exc)
+                    await asyncio.sleep(1)
+                    continue
+                if job_id is None:
+                    slots.release()
+                    continue
+                task = asyncio.create_task(self._execute(job_id))
+                self._running[job_id] = task
+                task.add_done_callback(lambda _, j=job_id: self._done(j, slots))
+        finally:
+            await self._shutdown()
+            maintenance.cancel()
+            await blocking.aclose()
+
+    async def _acquire_slot(self, slots: asyncio.Semaphore) -> bool:
+        """等待空闲执行槽位，期间收到 stop() 时返回 False"""
+        if self._stopping.is_set():
+            return False
+        acquire = asyncio.ensure_future(slots.acquire())
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        await asyncio.wait({acquire, stopping}, return_when=asyncio.FIRST_COMPLETED)
+        stopping.cancel()
+        if not acquire.done():
+            acquire.cancel()
+            return False
+        if self._stopping.is_set():
+            slots.release()
+            return False
+        return True
+
+    def _done(self, job_id: str, slots: asyncio.Semaphore) -> None:
+        self._running.pop(job_id, None)
+        slots.release()
+
+    async def _shutdown(self) -> None:
+        if not self._running:
+            return
+        _, pending = await asyncio.wait(
+            list(self._running.values()), timeout=settings.JOB_SHUTDOWN_TIMEOUT
+        )
+        # 超时仍未完成的任务取消后放回队列，由其他 worker 接手
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+    async def _maintain(self) -> None:
+        """续约执行中的任务，迁移到期的重试任务，回收已失效 worker 的任务"""
+        while True:
+            try:
+                now = time.time()
+                lease = now + self.lease_seconds
+                await pipelined(
+                    [("hset", job_key(j), "lease", lease) for j in self._running]
+                )
+                await _promote(keys=[DELAYED_KEY, QUEUE_KEY], args=[now, 100])
+                requeued = await _requeue(keys=[RUNNING_KEY, QUEUE_KEY], args=[now])
+                if requeued:
+                    logger.warning("Requeued %s jobs with expired leases", requeued)
+            except Exception as exc:
+                logger.warning("Job maintenance failed: %s", exc)
+            await asyncio.sleep(self.lease_seconds / 3)
+
+    async def _execute(self, job_id: str) -> None:
+        key = job_key(job_id)
+        detail = await redis_client.hgetall(key)
+        if not detail:
+            await redis_client.lrem(RUNNING_KEY, 1, job_id)
+            return
+        attempt = int(detail["attempts"]) + 1
+        spec = _registry.get(detail["name"])
+        if spec is None:
+            await self._finish(job_id, FAILED, error=f"未知任务: {detail['name']}")
+            return
+
+        await redis_client.hset(
+            key,
+            mapping={
+                "status": RUNNING,
+                "attempts": attempt,
+                "worker": self.name,
+                "started_at": time.time(),
+                "lease": time.time() + self.lease_seconds,
+            },
+        )
+        ctx = JobContext(job_id, attempt)
+        try:
+            result = await asyncio.wait_for(
+                spec.fn(ctx, **json.loads(detail["params"])), spec.timeout
+            )
+        except asyncio.CancelledError:
+            # worker 关闭：放回队列头部，本次不计入执行次数
+            await pipelined(
+                [
+                    (
+                        "hset",
+                        key,
+                        None,
+                        None,
+                        {"status": QUEUED, "attempts": attempt - 1},
+                    ),
+                    # 清除租约，避免再次领取后被回收脚本按过期租约重复放回队列
+                    ("hdel", key, "lease"),
+                    ("lrem", RUNNING_KEY, 1, job_id),
+                    ("rpush", QUEUE_KEY, job_id),
+                ],
+                transaction=True,
+            )
+            raise
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            if attempt <= spec.max_retries:
+                logger.warning(
+                    "Job %s (%s) failed, retrying: %s", job_id, spec.name, error
+                )
+                await pipelined(
+                    [
+                        ("hset", key, None, None, {"status": RETRYING, "error": error}),
+                        ("hdel", key, "lease"),
+                        (
+                            "zadd",
+                            DELAYED_KEY,
+                            {job_id: time.time() + retry_delay(attempt)},
+                        ),
+                        ("lrem", RUNNING_KEY, 1, job_id),
+                    ],
+                    transaction=True,
+                )
+            else:
+                logger.exception("Job %s (%s) failed", job_id, spec.name)
+                await self._finish(job_id, FAILED, error=error)
+        else:
+            await self._finish(job_id, SUCCEEDED, result=result)
+
+    async def _finish(
+        self, job_id: str, status: str, result: Any = None, error: str | None = None
+    ) -> None:
+        mapping: dict[str, Any] = {"status": status, "finished_at": time.time()}
+        if status == SUCCEEDED:
+            mapping["progress"] = 100
+            mapping["result"] = json.dumps(result, ensure_ascii=False, default=str)
+        if error is not None:
+            mapping["error"] = error
+        key = job_key(job_id)
+        await pipelined(
+            [
+                ("hset", key, None, None, mapping),
+                ("hdel", key, "lease"),
+                ("expire", key, settings.JOB_RESULT_TTL),
+                ("lrem", RUNNING_KEY, 1, job_id),
+            ],
+            transaction=True,
+        )
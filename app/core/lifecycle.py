@@ -0,0 +1,94 @@
+"""
+应用生命周期辅助
+
+- warm_up_pool: 启动时预先建立数据库连接，顺带检查数据库可用性
+- RequestTracker / InFlightMiddleware: 统计进行中的请求，关闭时等待其完成后再释放连接池
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    """
+    同时打开 connections 个连接并执行 SELECT 1，随后归还连接池
+    数据库不可用时抛出异常，使启动失败而不是带病接收流量
+    """
+    connections = min(connections, engine.pool.size())
+    if connections <= 0:
+        return
+
+    # 先全部打开再统一归还，否则连接会被复用，池中只会留下一个
+    opened = [engine.connect() for _ in range(connections)]
+    try:
+        await asyncio.gather(*(conn.start() for conn in opened))
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in opened))
+    finally:
+        await asyncio.gather(*(conn.close() for conn in opened), return_exceptions=True)
+    logger.info("Database pool warmed up with %s connections", connections)
+
+
+class RequestTracker:
+    """进行中的 HTTP 请求计数；进入排空状态后拒绝新请求"""
+
+    def __init__(self):
+        self.active = 0
+        self.draining = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def enter(self) -> None:
+        self.active += 1
+        self._idle.clear()
+
+    def leave(self) -> None:
+        self.active -= 1
+        if self.active == 0:
+            self._idle.set()
+
+    async def drain(self, timeout: float) -> bool:
+        """停止接收新请求并等待进行中的请求完成，超时返回 False"""
+        self.draining = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except TimeoutError:
+            logger.warning("Shutdown drain timed out with %s requests", self.active)
+            return False
+        return True
+
+
+request_tracker = RequestTracker()
+
+
+class InFlightMiddleware:
+    """纯 ASGI 中间件，避免 BaseHTTPMiddleware 的额外开销"""
+
+    def __init__(self, app, tracker: RequestTracker = request_tracker):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        if self.tracker.draining:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 503,
+                    "headers": [(b"connection", b"close"), (b"retry-after", b"1")],
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        self.tracker.enter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.tracker.leave()
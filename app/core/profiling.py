@@ -0,0 +1,182 @@
+"""
+按请求剖析
+
+- 请求带有效的签名请求头 (X-Profile，由管理接口签发、带过期时间)，或按 PROFILE_SAMPLE_RATE
+  随机命中时，用 cProfile 剖析该请求，响应附带 X-Profile-Id
+- 剖析结果 (.prof 与元数据) 写入 PROFILE_DIR，最多保留 PROFILE_MAX_FILES 份，超出后删除最旧的
+- 未命中的请求只做一次请求头查找，不创建剖析器
+- cProfile 按线程生效，剖析期间事件循环上运行的其他协程也会计入，宜在低并发时复现；
+  同一时刻只剖析一个请求，其余请求照常处理
+"""
+
+import asyncio
+import cProfile
+import hashlib
+import hmac
+import io
+import json
+import logging
+import pstats
+import random
+import re
+import secrets
+import time
+from pathlib import Path
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HEADER = "X-Profile"
+_HEADER_KEY = HEADER.lower().encode("latin-1")
+_ID_PATTERN = re.compile(r"^\d{13}-[0-9a-f]{8}$")
+
+
+def _sign(expires: int) -> str:
+    message = f"profile:{expires}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def create_profile_token(ttl: int) -> str:
+    """签发剖析请求头的值，ttl 秒内有效"""
+    expires = int(time.time()) + ttl
+    return f"{expires}.{_sign(expires)}"
+
+
+def verify_profile_token(token: str) -> bool:
+    expires, _, signature = token.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _sign(int(expires)))
+
+
+class ProfileStore:
+    """磁盘上的环形缓冲区：每份剖析结果为 {id}.prof 与 {id}.json"""
+
+    def __init__(self, directory: str | Path, max_files: int):
+        self.directory = Path(directory)
+        self.max_files = max_files
+
+    @staticmethod
+    def new_id() -> str:
+        # 毫秒时间戳开头，按文件名排序即按时间排序
+        return f"{int(time.time() * 1000)}-{secrets.token_hex(4)}"
+
+    def path(self, profile_id: str, suffix: str = ".prof") -> Path | None:
+        """校验 ID 格式，防止路径穿越"""
+        if not _ID_PATTERN.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}{suffix}"
+        return path if path.exists() else None
+
+    def save(self, profile_id: str, profiler: cProfile.Profile, meta: dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(self.directory / f"{profile_id}.prof")
+        meta_path = self.directory / f"{profile_id}.json"
+        meta_path.write_text(json.dumps({"id": profile_id, **meta}, ensure_ascii=False))
+        self.prune()
+
+    def prune(self) -> None:
+        metas = sorted(self.directory.glob("*.json"))
+        for meta_path in metas[: max(len(metas) - self.max_files, 0)]:
+            meta_path.with_suffix(".prof").unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+
+    def list(self) -> list[dict]:
+        """按时间倒序返回元数据"""
+        if not self.directory.exists():
+            return []
+        items = []
+        for meta_path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                items.append(json.loads(meta_path.read_text()))
+            except (OSError, ValueError):
+                # 并发清理时文件可能已被删除
+                continue
+        return items
+
+    def text(self, profile_id: str, limit: int = 50) -> str | None:
+        """按累计耗时排序的文本报告"""
+        path = self.path(profile_id)
+        if path is None:
+            return None
+        buffer = io.StringIO()
+        stats = pstats.Stats(str(path), stream=buffer)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(limit)
+        return buffer.getvalue()
+
+
+profile_store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_MAX_FILES)
+
+
+class ProfilingMiddleware:
+    """纯 ASGI 中间件，只有命中的请求才创建剖析器"""
+
+    def __init__(
+        self,
+        app,
+        store: ProfileStore = profile_store,
+        sample_rate: float = settings.PROFILE_SAMPLE_RATE,
+    ):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self._active = False
+
+    def _trigger(self, scope) -> str | None:
+        for name, value in scope["headers"]:
+            if name == _HEADER_KEY:
+                return (
+                    "header" if verify_profile_token(value.decode("latin-1")) else None
+                )
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active:
+            return await self.app(scope, receive, send)
+        trigger = self._trigger(scope)
+        if trigger is None:
+            return await self.app(scope, receive, send)
+
+        profile_id = self.store.new_id()
+        status = 0
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = [
+                    *message.get("headers", ()),
+                    (b"x-profile-id", profile_id.encode()),
+                ]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # 已有其他剖析工具 (调试器、覆盖率) 在运行
+            return await self.app(scope, receive, send)
+        self._active = True
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.disable()
+            self._active = False
+            meta = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope["query_string"].decode("latin-1"),
+                "status": status,
+                "durationMs": round((time.perf_counter() - start) * 1000, 2),
+                "trigger": trigger,
+                "createdAt": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            try:
+                await asyncio.to_thread(self.store.save, profile_id, profiler, meta)
+            except Exception:
+                logger.exception("Failed to save profile %s", profile_id)
@@ -0,0 +1,169 @@
+"""
+基于 Redis 的滑动窗口限流
+
+一次 EVALSHA 完成过期清理、计数判断、锁定与记录，时间取自 Redis 服务端，
+多进程/多实例共享同一计数。超出预算后可按指数退避锁定。
+"""
+
+import logging
+import uuid
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request, status
+
+from app.core.redis import breaker, redis_client
+
+logger = logging.getLogger(__name__)
+
+# KEYS: 每条规则 3 个键 [窗口 ZSET, 锁定标记, 锁定次数]
+# ARGV: [本次请求标识, 每条规则 4 个参数: limit, window_ms, lockout_ms, max_lockout_ms]
+# 返回 0 表示放行，否则为需要等待的毫秒数
+_SLIDING_WINDOW_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local n = #KEYS / 3
+local retry = 0
+for i = 0, n - 1 do
+    local zkey, lkey, skey = KEYS[i * 3 + 1], KEYS[i * 3 + 2], KEYS[i * 3 + 3]
+    local limit = tonumber(ARGV[i * 4 + 2])
+    local window = tonumber(ARGV[i * 4 + 3])
+    local lockout = tonumber(ARGV[i * 4 + 4])
+    local max_lockout = tonumber(ARGV[i * 4 + 5])
+    local locked = redis.call('PTTL', lkey)
+    if locked > 0 then
+        retry = math.max(retry, locked)
+    else
+        redis.call('ZREMRANGEBYSCORE', zkey, '-inf', now - window)
+        if redis.call('ZCARD', zkey) >= limit then
+            local wait
+            if lockout > 0 then
+                local strikes = redis.call('INCR', skey)
+                redis.call('PEXPIRE', skey, max_lockout * 2)
+                wait = math.floor(math.min(lockout * 2 ^ (strikes - 1), max_lockout))
+                redis.call('SET', lkey, 1, 'PX', wait)
+            else
+                local oldest = redis.call('ZRANGE', zkey, 0, 0, 'WITHSCORES')
+                wait = tonumber(oldest[2]) + window - now
+            end
+            retry = math.max(retry, wait, 1)
+        end
+    end
+end
+if retry > 0 then
+    return retry
+end
+for i = 0, n - 1 do
+    redis.call('ZADD', KEYS[i * 3 + 1], now, ARGV[1])
+    redis.call('PEXPIRE', KEYS[i * 3 + 1], tonumber(ARGV[i * 4 + 3]))
+end
+return 0
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class RateRule:
+    """
+    限流规则
+    :param key: 计数维度 (如 login:user:admin)
+    :param limit: 窗口内允许的次数
+    :param window: 窗口长度(秒)
+    :param lockout: 超限后首次锁定秒数，之后每次翻倍；0 表示不锁定，仅等待窗口滑出
+    :param max_lockout: 锁定时长上限(秒)
+    """
+
+    key: str
+    limit: int
+    window: int
+    lockout: int = 0
+    max_lockout: int = 0
+
+
+class SlidingWindowLimiter:
+    def __init__(self, redis=redis_client, prefix: str = "rate:"):
+        self.prefix = prefix
+        self._redis = redis
+        self._script = redis.register_script(_SLIDING_WINDOW_SCRIPT)
+
+    def _keys(self, key: str) -> list[str]:
+        base = f"{self.prefix}{key}"
+        return [base, f"{base}:lock", f"{base}:strikes"]
+
+    async def hit(self, *rules: RateRule) -> float:
+        """
+        记录一次访问；所有规则均未超限时才计数
+        :return: 0 表示放行，否则为需要等待的秒数
+        """
+        keys: list[str] = []
+        args: list = [uuid.uuid4().hex]
+        for rule in rules:
+            keys.extend(self._keys(rule.key))
+            args.extend(
+                [
+                    rule.limit,
+                    rule.window * 1000,
+                    rule.lockout * 1000,
+                    max(rule.max_lockout, rule.lockout) * 1000,
+                ]
+            )
+        if not breaker.available:
+            # 熔断期间直接放行，不再等待 Redis 超时
+            return 0
+        try:
+            retry_ms = await self._script(keys=keys, args=args)
+        except Exception as exc:
+            # 限流器故障时放行，避免 Redis 异常导致登录等核心功能不可用
+            logger.warning("Rate limiter unavailable, allowing request: %s", exc)
+            breaker.record_failure()
+            return 0
+        breaker.record_success()
+        return int(retry_ms) / 1000
+
+    async def enforce(self, *rules: RateRule) -> None:
+        """超限时抛出 429"""
+        retry_after = await self.hit(*rules)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="请求过于频繁，请稍后再试",
+                headers={"Retry-After": str(max(1, round(retry_after)))},
+            )
+
+    async def reset(self, *keys: str) -> None:
+        """清空指定维度的计数与锁定次数 (如登录成功后)"""
+        try:
+            await self._redis.delete(*[k for key in keys for k in self._keys(key)])
+        except Exception as exc:
+            logger.warning("Rate limiter reset failed: %s", exc)
+
+
+limiter = SlidingWindowLimiter()
+
+
+def client_ip(request: Request) -> str:
+    """客户端 IP (部署在反向代理后时需开启 uvicorn --proxy-headers)"""
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit(
+    scope: str,
+    limit: int,
+    window: int,
+    lockout: int = 0,
+    max_lockout: int = 0,
+    key_func=client_ip,
+):
+    """
+    限流依赖工厂，可用于任意开销较大的接口
+
+    用法:
+        @router.post("/export", dependencies=[Depends(rate_limit("export", 5, 60))])
+    """
+
+    async def rate_limit_dependency(request: Request):
+        await limiter.enforce(
+            RateRule(
+                f"{scope}:{key_func(request)}", limit, window, lockout, max_lockout
+            )
+        )
+
+    return rate_limit_dependency
@@ -1,15 +1,141 @@
+"""
+Redis 客户端
+
+- 连接池大小、超时与健康检查均来自 Settings，连接在应用 lifespan 中建立与关闭
+- pipelined / mget_many / mset_many 将批量操作合并为少量往返
+- breaker 为各组件共享的熔断器：Redis 变慢或不可用时各组件按自身语义降级
+  (限流放行、缓存直接查库、失效通知仅本地生效等)，请求只会多一点延迟而不是直接失败
+"""
+
+import logging
+import time
+from collections.abc import Iterable, Mapping
+from typing import Any
+
 import redis.asyncio as redis
 
 from app.core.config import settings
 
-# 创建异步 Redis 实例
-redis_client = redis.from_url(
+logger = logging.getLogger(__name__)
+
+# 阻塞式连接池：连接耗尽时最多等待 REDIS_POOL_TIMEOUT 秒，而不是无限制地新建连接
+pool = redis.BlockingConnectionPool.from_url(
     settings.REDIS_URL,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    timeout=settings.REDIS_POOL_TIMEOUT,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+    health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
     encoding="utf-8",
     decode_responses=True,  # 自动将返回结果转为字符串而非 bytes
 )
 
+# 创建异步 Redis 实例
+redis_client = redis.Redis(connection_pool=pool)
+
 
 async def get_redis():
     """供 FastAPI Depends 使用的依赖函数"""
     return redis_client
+
+
+async def init_redis() -> bool:
+    """应用启动时建立连接并检查可用性；不可用时仅记录日志，以降级模式启动"""
+    try:
+        await redis_client.ping()
+    except Exception as exc:
+        logger.warning("Redis unavailable at startup, running degraded: %s", exc)
+        breaker.record_failure()
+        return False
+    breaker.record_success()
+    return True
+
+
+async def close_redis() -> None:
+    """应用关闭时断开连接池"""
+    await redis_client.aclose()
+    await pool.disconnect()
+
+
+async def pipelined(commands: Iterable[tuple], transaction: bool = False) -> list:
+    """
+    批量命令合并为一次往返
+
+    用法:
+        value, counter = await pipelined([("get", "a"), ("incr", "b")])
+    """
+    async with redis_client.pipeline(transaction=transaction) as pipe:
+        for method, *args in commands:
+            getattr(pipe, method)(*args)
+        return await pipe.execute()
+
+
+async def mget_many(
+    keys: Iterable[str], chunk_size: int = 500, client: redis.Redis | None = None
+) -> list[Any]:
+    """分块 MGET，避免单条命令过大阻塞 Redis；client 为空时使用全局客户端"""
+    client = client or redis_client
+    keys = list(keys)
+    values: list[Any] = []
+    for i in range(0, len(keys), chunk_size):
+        values.extend(await client.mget(keys[i : i + chunk_size]))
+    return values
+
+
+async def mset_many(
+    mapping: Mapping[str, Any],
+    ex: int | None = None,
+    chunk_size: int = 500,
+    client: redis.Redis | None = None,
+) -> None:
+    """分块 MSET；指定过期时间时改用 pipeline 批量 SET EX"""
+    client = client or redis_client
+    items = list(mapping.items())
+    for i in range(0, len(items), chunk_size):
+        chunk = items[i : i + chunk_size]
+        if ex is None:
+            await client.mset(dict(chunk))
+            continue
+        async with client.pipeline(transaction=False) as pipe:
+            for key, value in chunk:
+                pipe.set(key, value, ex=ex)
+            await pipe.execute()
+
+
+class CircuitBreaker:
+    """
+    连续失败达到阈值后熔断 reset_timeout 秒，期间直接走降级逻辑；
+    超时后放行一次试探请求 (半开)，成功即恢复
+    """
+
+    def __init__(self, threshold: int, reset_timeout: float):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    @property
+    def available(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            # 半开：允许试探，失败时 record_failure 会重新计时
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            if self.opened_at is None:
+                logger.warning("Redis circuit opened after %s failures", self.failures)
+            self.opened_at = time.monotonic()
+
+
+breaker = CircuitBreaker(
+    settings.REDIS_BREAKER_THRESHOLD, settings.REDIS_BREAKER_RESET_SECONDS
+)
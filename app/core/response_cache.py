@@ -0,0 +1,222 @@
+"""
+Redis 响应缓存 (多 worker 共享)
+
+    @router.get("/list", response_model=...)
+    @cache_response(ttl=60, tags=("role",))
+    async def list_roles(...): ...
+
+- 缓存键由路由、规范化后的查询参数、权限范围 (scope) 以及各标签的版本号组成；
+  标签即失效总线的命名空间，bump_version(tag) 后旧键不再命中，随 TTL 自然过期
+- 概率提前刷新 (XFetch)：临近过期时按重建耗时随机提前重建，避免集中过期
+- 分布式单飞锁：同一键只有一个请求重建，其他请求返回旧值或短暂等待新值
+- Redis 不可用时直接执行接口，不影响可用性
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import logging
+import math
+import random
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+from app.core.cache import render_route_payload
+from app.core.config import settings
+from app.core.invalidation import bump_version, get_version
+from app.core.redis import breaker, redis_client
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "rcache"
+
+Compute = Callable[[], Awaitable[bytes]]
+
+# KEYS: [锁]  ARGV: [持有者标识]  仅释放自己持有的锁
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+_release = redis_client.register_script(_RELEASE_SCRIPT)
+
+
+def normalize_query(request: Request) -> str:
+    """查询参数排序并去掉空值，参数顺序不同的请求共用缓存"""
+    items = sorted((k, v) for k, v in request.query_params.multi_items() if v != "")
+    return urlencode(items)
+
+
+def build_key(request: Request, scope: Hashable, tags: tuple[str, ...]) -> str:
+    route = request.scope.get("route")
+    path = getattr(route, "path", request.url.path)
+    versions = ".".join(str(get_version(tag)) for tag in tags)
+    digest = hashlib.blake2b(
+        f"{scope}|{normalize_query(request)}".encode(), digest_size=12
+    ).hexdigest()
+    return f"{PREFIX}:{request.method}:{path}:{versions}:{digest}"
+
+
+def should_refresh(delta: float, expiry: float, beta: float) -> bool:
+    """XFetch：重建耗时 delta 秒，越接近过期、重建越慢，提前刷新的概率越大"""
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expiry
+
+
+async def invalidate_tags(*tags: str) -> None:
+    """按标签批量失效 (递增命名空间版本号并广播)"""
+    await bump_version(*tags)
+
+
+async def _compute_entry(compute: Compute) -> dict[str, Any]:
+    body = await compute()
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    return {"body": body, "etag": etag}
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        lock_timeout: float = settings.REDIS_CACHE_LOCK_TIMEOUT,
+        wait_timeout: float = settings.REDIS_CACHE_WAIT_TIMEOUT,
+        beta: float = settings.REDIS_CACHE_BETA,
+    ):
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.beta = beta
+
+    async def _read(self, key: str) -> dict | None:
+        try:
+            entry = await redis_client.hgetall(key)
+        except Exception as exc:
+            breaker.record_failure()
+            logger.warning("Response cache read failed: %s", exc)
+            return None
+        return entry or None
+
+    async def _build(self, key: str, ttl: int, compute: Compute) -> dict:
+        start = time.perf_counter()
+        entry = await _compute_entry(compute)
+        entry["delta"] = time.perf_counter() - start
+        entry["expiry"] = time.time() + ttl
+        try:
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping=entry)
+                pipe.expire(key, ttl)
+                await pipe.execute()
+        except Exception as exc:
+            breaker.record_failure()
+            logger.warning("Response cache write failed: %s", exc)
+        return entry
+
+    async def fetch(self, key: str, ttl: int, compute: Compute) -> tuple[dict, str]:
+        """
+        获取缓存条目，必要时重建
+        :param compute: 生成响应体的协程函数
+        :return: (条目, 状态 HIT / STALE / MISS / BYPASS)
+        """
+        if not breaker.available:
+            return await _compute_entry(compute), "BYPASS"
+
+        entry = await self._read(key)
+        if entry is not None and not should_refresh(
+            float(entry["delta"]), float(entry["expiry"]), self.beta
+        ):
+            return entry, "HIT"
+
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis_client.set(
+                lock_key, token, nx=True, px=int(self.lock_timeout * 1000)
+            )
+        except Exception as exc:
+            breaker.record_failure()
+            logger.warning("Response cache lock failed: %s", exc)
+            return await _compute_entry(compute), "BYPASS"
+
+        if acquired:
+            try:
+                return await self._build(key, ttl, compute), "MISS"
+            finally:
+                try:
+                    await _release(keys=[lock_key], args=[token])
+                except Exception as exc:
+                    logger.warning("Response cache unlock failed: %s", exc)
+
+        # 其他请求正在重建：有旧值直接返回，否则等待新值
+        if entry is not None:
+            return entry, "STALE"
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            entry = await self._read(key)
+            if entry is not None:
+                return entry, "HIT"
+        # 等待超时 (重建过慢或持锁者异常退出)，自行计算但不写入
+        return await _compute_entry(compute), "MISS"
+
+
+response_cache = ResponseCache()
+
+
+def cache_response(
+    ttl: int,
+    tags: tuple[str, ...] = (),
+    scope: Callable[[dict[str, Any]], Hashable] | None = None,
+):
+    """
+    接口响应缓存装饰器 (写在 @router.get 之下)，依赖项 (含鉴权) 在命中时照常执行
+    :param ttl: 缓存秒数
+    :param tags: 依赖的命名空间，任一版本变化即失效
+    :param scope: 权限范围，以接口解析后的参数调用，返回值参与缓存键；
+                  为空时所有有权访问该接口的用户共享同一份缓存
+    """
+
+    def decorator(endpoint):
+        signature = inspect.signature(endpoint)
+        request_param = next(
+            (n for n, p in signature.parameters.items() if p.annotation is Request),
+            None,
+        )
+
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            if request_param is None:
+                request: Request = kwargs.pop("request")
+            else:
+                request = kwargs[request_param]
+            key = build_key(request, scope(kwargs) if scope else "", tags)
+
+            async def compute() -> bytes:
+                content = await endpoint(**kwargs)
+                if isinstance(content, Response):
+                    return content.body
+                return await render_route_payload(request.scope.get("route"), content)
+
+            entry, status = await response_cache.fetch(key, ttl, compute)
+            headers = {"ETag": entry["etag"], "X-Cache": status}
+            if request.headers.get("if-none-match") == entry["etag"]:
+                return Response(status_code=304, headers=headers)
+            return Response(
+                content=entry["body"], media_type="application/json", headers=headers
+            )
+
+        if request_param is None:
+            # 接口未声明 Request 时追加该参数，由 FastAPI 注入
+            params = [
+                *signature.parameters.values(),
+                inspect.Parameter(
+                    "request", inspect.Parameter.KEYWORD_ONLY, annotation=Request
+                ),
+            ]
+            wrapper.__signature__ = signature.replace(parameters=params)
+        return wrapper
+
+    return decorator
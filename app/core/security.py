@@ -1,14 +1,28 @@
+import asyncio
+import uuid
+from collections.abc import Sequence
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-import bcrypt
-from jose import jwt
-
 from app.core.config import settings
 
+# bcrypt 与 jose(含 cryptography 后端) 导入较慢，延迟到首次使用时再导入，
+# 使 CLI 脚本及不涉及认证的进程启动更快；服务进程在 lifespan 中调用 preload 预先导入
+LAZY_MODULES = ("bcrypt", "jose.jwt")
+
+
+def preload() -> None:
+    """预先导入延迟加载的模块，避免首个认证请求承担导入耗时"""
+    import importlib
+
+    for name in LAZY_MODULES:
+        importlib.import_module(name)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """验证明文密码与哈希值是否匹配"""
+    import bcrypt
+
     return bcrypt.checkpw(
         plain_password.encode("utf-8"), hashed_password.encode("utf-8")
     )
@@ -16,20 +30,51 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """生成密码哈希值"""
+    import bcrypt
+
     pwd_bytes = password.encode("utf-8")
     salt = bcrypt.gensalt()
     hashed = bcrypt.hashpw(pwd_bytes, salt)
     return hashed.decode("utf-8")
 
 
+async def hash_passwords(passwords: Sequence[str]) -> list[str]:
+    """
+    批量生成密码哈希：在线程池中并行计算，不阻塞事件循环
+    (bcrypt 计算期间释放 GIL，可利用多核)
+    """
+    return list(
+        await asyncio.gather(
+            *(asyncio.to_thread(get_password_hash, p) for p in passwords)
+        )
+    )
+
+
 def create_access_token(subject: str | Any) -> str:
     """生成 JWT Access Token"""
+    from jose import jwt
 
-    expire = datetime.now(UTC) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    now = datetime.now(UTC)
+    expire = now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
 
-    # 负载信息：sub 字段通常存放 user_id
-    to_encode = {"exp": expire, "sub": str(subject)}
+    # 负载信息：sub 字段通常存放 user_id，jti 为 token 唯一标识 (用于吊销)
+    to_encode = {
+        "exp": expire,
+        "iat": now,
+        "sub": str(subject),
+        "jti": uuid.uuid4().hex,
+    }
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
     return encoded_jwt
+
+
+def decode_access_token(token: str) -> dict | None:
+    """解码并校验 JWT，签名无效或已过期时返回 None"""
+    from jose import JWTError, jwt
+
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
@@ -0,0 +1,80 @@
+"""
+进程内单飞 (single-flight)
+
+同一键的并发调用只执行一次，其余调用等待同一结果：
+
+    routes_flight = SingleFlight("user-routes")
+    data = await routes_flight.do(("routes", role_ids, version), build)
+
+- 实际执行放在独立任务中，某个调用方被取消 (如客户端断开) 不影响其他等待者；
+  全部等待者都取消时才取消执行任务
+- 执行出错时所有等待者收到同一异常，键随即释放，下次调用重新执行
+- 只合并同时进行中的调用，不缓存结果；键中应包含版本号等区分内容的全部因素
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0  # 调用总数
+        self.executions = 0  # 实际执行次数
+        self._inflight: dict[Hashable, _Call] = {}
+        # 同名实例只登记第一个 (如测试中临时创建的实例不覆盖全局实例)
+        _registry.setdefault(name, self)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        call = self._inflight.get(key)
+        if call is None:
+            self.executions += 1
+            call = _Call(asyncio.ensure_future(fn()))
+            self._inflight[key] = call
+            call.task.add_done_callback(lambda t: self._finish(key, call))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _finish(self, key: Hashable, call: _Call) -> None:
+        if self._inflight.get(key) is call:
+            del self._inflight[key]
+        if not call.task.cancelled():
+            # 标记异常已读取，无等待者时也不会产生 "exception was never retrieved" 警告
+            call.task.exception()
+
+    def stats(self) -> dict[str, Any]:
+        coalesced = self.calls - self.executions
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": coalesced,
+            "coalesceRate": round(coalesced / self.calls, 4) if self.calls else 0.0,
+            "inflight": len(self._inflight),
+        }
+
+
+_registry: dict[str, SingleFlight] = {}
+
+
+def singleflight_stats() -> list[dict[str, Any]]:
+    """各单飞实例的合并统计，合并率 = 被合并的调用数 / 调用总数"""
+    return [flight.stats() for flight in _registry.values()]
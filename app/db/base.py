@@ -1,4 +1,4 @@
-from sqlalchemy import BigInteger, Column, ForeignKey, Table
+from sqlalchemy import BigInteger, Column, ForeignKey, Index, Table
 from sqlalchemy.orm import DeclarativeBase
 
 
@@ -22,6 +22,8 @@ user_roles = Table(
         ForeignKey("sys_role.role_id", ondelete="CASCADE"),
         primary_key=True,
     ),
+    # 主键为 (user_id, role_id)，按角色反查用户需要单独的索引
+    Index("ix_sys_user_role_role_id", "role_id"),
 )
 
 
@@ -41,4 +43,6 @@ role_menus = Table(
         ForeignKey("sys_menu.menu_id", ondelete="CASCADE"),
         primary_key=True,
     ),
+    # 主键为 (role_id, menu_id)，按菜单反查/级联删除需要单独的索引
+    Index("ix_sys_role_menu_menu_id", "menu_id"),
 )
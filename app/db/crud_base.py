@@ -0,0 +1,295 @@
+"""
+通用异步 CRUD 基类
+
+- get / get_many / get_by / get_many_by: 按主键或字段查询，批量查询只发一条 IN 语句
+- profiles: 命名的加载方案 (load_only / selectinload / noload 等)，各接口按需选择，
+  避免为取一个字段加载整张表或级联加载关联
+- project: 只查询指定列，返回 Row 而非 ORM 对象
+- create_unique: INSERT ... ON CONFLICT DO NOTHING RETURNING 一次往返完成创建与
+  唯一性校验，并发创建同一唯一值时只有一方成功，另一方得到 UniqueViolationError
+- loader: 请求级批量加载器，同一轮事件循环内的多次 load(key) 合并为一次 IN 查询
+- 查询语句按 (类型, 字段, profile) 构建一次后缓存复用；IN 条件使用 expanding
+  参数，不同数量的 ID 共用同一条编译结果
+"""
+
+import asyncio
+from collections.abc import Awaitable, Hashable, Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    bindparam,
+    delete,
+    func,
+    inspect,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload
+from sqlalchemy.orm.interfaces import ORMOption
+
+
+class UniqueViolationError(Exception):
+    """创建时违反唯一约束，field 为冲突的字段"""
+
+    def __init__(self, field: str):
+        super().__init__(field)
+        self.field = field
+
+
+class CRUDBase[ModelT]:
+    def __init__(
+        self,
+        model: type[ModelT],
+        profiles: dict[str, Sequence[ORMOption]] | None = None,
+    ):
+        self.model = model
+        self.pk_name = inspect(model).primary_key[0].key
+        self.profiles: dict[str, Sequence[ORMOption]] = {
+            "default": (),
+            **(profiles or {}),
+        }
+        self._statements: dict[Hashable, Select] = {}
+
+    def _column(self, field: str | None):
+        return getattr(self.model, field or self.pk_name)
+
+    def _statement(self, kind: str, field: str | None, profile: str) -> Select:
+        key = (kind, field, profile)
+        stmt = self._statements.get(key)
+        if stmt is None:
+            column = self._column(field)
+            if kind == "in":
+                condition = column.in_(bindparam("values", expanding=True))
+            else:
+                condition = column == bindparam("value")
+            stmt = select(self.model).where(condition).options(*self.profiles[profile])
+            self._statements[key] = stmt
+        return stmt
+
+    async def get(
+        self, db: AsyncSession, id: Any, profile: str = "default"
+    ) -> ModelT | None:
+        """按主键获取；默认方案优先使用会话的 identity map"""
+        if profile == "default":
+            return await db.get(self.model, id)
+        return await self.get_by(db, self.pk_name, id, profile)
+
+    async def get_by(
+        self, db: AsyncSession, field: str, value: Any, profile: str = "default"
+    ) -> ModelT | None:
+        """按字段获取单条 (如唯一编码)"""
+        stmt = self._statement("eq", field, profile)
+        result = await db.execute(stmt, {"value": value})
+        return result.scalars().first()
+
+    async def get_map(
+        self,
+        db: AsyncSession,
+        values: Iterable[Any],
+        field: str | None = None,
+        profile: str = "default",
+    ) -> dict[Any, ModelT]:
+        """一次 IN 查询，返回 {字段值: 对象}；字段默认为主键"""
+        values = list(dict.fromkeys(values))
+        if not values:
+            return {}
+        stmt = self._statement("in", field, profile)
+        result = await db.execute(stmt, {"values": values})
+        key = field or self.pk_name
+        return {getattr(obj, key): obj for obj in result.scalars().all()}
+
+    async def get_many(
+        self, db: AsyncSession, ids: Iterable[Any], profile: str = "default"
+    ) -> list[ModelT]:
+        """按主键批量获取，按传入顺序返回，不存在的跳过"""
+        ids = list(ids)
+        found = await self.get_map(db, ids, profile=profile)
+        return [found[i] for i in dict.fromkeys(ids) if i in found]
+
+    async def get_many_by(
+        self,
+        db: AsyncSession,
+        field: str,
+        values: Iterable[Any],
+        profile: str = "default",
+    ) -> list[ModelT]:
+        """按字段批量获取 (如 role_code 列表)，按传入顺序返回"""
+        values = list(values)
+        found = await self.get_map(db, values, field, profile)
+        return [found[v] for v in dict.fromkeys(values) if v in found]
+
+    async def exists(self, db: AsyncSession, *where: ColumnElement) -> bool:
+        """是否存在满足条件的记录，只查询主键"""
+        stmt = select(self._column(None)).where(*where).limit(1)
+        return (await db.execute(stmt)).first() is not None
+
+    async def exists_by(
+        self, db: AsyncSession, field: str, value: Any, *where: ColumnElement
+    ) -> bool:
+        """字段值是否已存在 (唯一性校验)"""
+        return await self.exists(db, self._column(field) == value, *where)
+
+    async def project(
+        self,
+        db: AsyncSession,
+        columns: Sequence[str],
+        *where: ColumnElement,
+        order_by: Sequence[ColumnElement] = (),
+    ) -> list[Any]:
+        """只查询指定列，返回 Row 列表"""
+        stmt = (
+            select(*(self._column(c) for c in columns))
+            .where(*where)
+            .order_by(*order_by)
+        )
+        return list((await db.execute(stmt)).all())
+
+    async def find(
+        self,
+        db: AsyncSession,
+        *where: ColumnElement,
+        order_by: Sequence[ColumnElement] = (),
+        profile: str = "default",
+    ) -> list[ModelT]:
+        """按条件查询全部 (不分页)"""
+        stmt = (
+            select(self.model)
+            .where(*where)
+            .order_by(*order_by)
+            .options(*self.profiles[profile])
+        )
+        return list((await db.execute(stmt)).scalars().all())
+
+    async def paginate(
+        self,
+        db: AsyncSession,
+        *where: ColumnElement,
+        current: int = 1,
+        size: int = 10,
+        order_by: Sequence[ColumnElement] = (),
+        profile: str = "default",
+    ) -> tuple[int, list[ModelT]]:
+        """
+        分页查询
+        :return: (总数, 当前页数据)
+        """
+        count_stmt = select(func.count()).select_from(self.model).where(*where)
+        total = (await db.execute(count_stmt)).scalar() or 0
+        if not total:
+            return 0, []
+        stmt = (
+            select(self.model)
+            .where(*where)
+            .order_by(*order_by)
+            .offset((current - 1) * size)
+            .limit(size)
+            .options(*self.profiles[profile])
+        )
+        return total, list((await db.execute(stmt)).scalars().all())
+
+    async def create_unique(
+        self, db: AsyncSession, values: dict[str, Any], unique: Sequence[str]
+    ) -> ModelT:
+        """
+        插入一条记录，任一唯一约束冲突时不插入并抛出 UniqueViolationError；
+        不负责提交事务。unique 为需要区分提示的唯一字段，按优先级排列
+        """
+        stmt = (
+            pg_insert(self.model)
+            .values(**values)
+            .on_conflict_do_nothing()
+            .returning(self.model)
+        )
+        # 新记录尚无关联数据，不触发 selectin 等预加载
+        stmt = select(self.model).from_statement(stmt).options(noload("*"))
+        obj = (await db.execute(stmt)).scalars().first()
+        if obj is not None:
+            return obj
+        # 仅在冲突时多查一次，确定是哪个字段冲突
+        rows = await self.project(
+            db, unique, or_(*(self._column(f) == values.get(f) for f in unique))
+        )
+        taken = {f for row in rows for f in unique if getattr(row, f) == values.get(f)}
+        raise UniqueViolationError(next((f for f in unique if f in taken), unique[0]))
+
+    async def delete_many(self, db: AsyncSession, ids: Iterable[Any]) -> int:
+        """按主键批量删除，不负责提交事务，返回删除数量"""
+        stmt = delete(self.model).where(self._column(None).in_(list(ids)))
+        result = await db.execute(stmt)
+        return result.rowcount
+
+    def loader(
+        self, db: AsyncSession, field: str | None = None, profile: str = "default"
+    ) -> "BatchLoader[ModelT]":
+        """获取该会话 (即当前请求) 共享的批量加载器"""
+        loaders = db.info.setdefault("crud_loaders", {})
+        key = (self.model, field, profile)
+        if key not in loaders:
+            loaders[key] = BatchLoader(self, db, field, profile)
+        return loaders[key]
+
+
+class BatchLoader[ModelT]:
+    """
+    请求级批量加载器 (DataLoader)
+
+    用法:
+        loader = role_crud.loader(db)
+        a, b = await asyncio.gather(loader.load(1), loader.load(2))  # 一次 IN 查询
+
+    结果按 key 缓存至请求结束；同一会话不能并发执行语句，批次之间串行执行
+    """
+
+    def __init__(
+        self,
+        crud: CRUDBase[ModelT],
+        db: AsyncSession,
+        field: str | None = None,
+        profile: str = "default",
+    ):
+        self.crud = crud
+        self.db = db
+        self.field = field
+        self.profile = profile
+        self._futures: dict[Any, asyncio.Future] = {}
+        self._pending: list[Any] = []
+        self._lock = asyncio.Lock()
+
+    def load(self, key: Any) -> Awaitable[ModelT | None]:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[key] = future
+            if not self._pending:
+                # 当前事件循环轮次结束后统一派发，期间的 load 合并为一批
+                loop.call_soon(lambda: asyncio.ensure_future(self._dispatch()))
+            self._pending.append(key)
+        return future
+
+    async def load_many(self, keys: Iterable[Any]) -> list[ModelT | None]:
+        return list(await asyncio.gather(*(self.load(k) for k in keys)))
+
+    def prime(self, key: Any, obj: ModelT) -> None:
+        """写入已加载的对象，后续 load 直接命中"""
+        if key not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(obj)
+            self._futures[key] = future
+
+    async def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        try:
+            async with self._lock:
+                found = await self.crud.get_map(self.db, keys, self.field, self.profile)
+        except Exception as exc:
+            for key in keys:
+                # 失败的 key 不缓存，允许重试
+                self._futures.pop(key).set_exception(exc)
+            return
+        for key in keys:
+            self._futures[key].set_result(found.get(key))
@@ -4,12 +4,13 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
+from app.db import slow_query
 
 # 1. 创建异步数据库引擎
-# echo=True 会在终端打印 SQL 语句，开发环境下很有用
+# DB_ECHO 会在终端打印全部 SQL 语句，仅用于本地调试；慢语句由慢查询日志记录
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=True,
+    echo=settings.DB_ECHO,
     pool_pre_ping=True,  # 自动检查连接是否存活
     pool_size=10,  # 连接池大小
     max_overflow=20,  # 超过池大小后允许的额外连接数
@@ -17,6 +18,7 @@ engine = create_async_engine(
     pool_timeout=30,  # 等待连接池中连接释放的最大秒数
     pool_use_lifo=True,  # 优先使用最近使用过的连接（保持连接活跃，减少被断开风险）
 )
+slow_query.install(engine.sync_engine)
 
 # 2. 创建异步 Session 工厂
 AsyncSessionLocal = async_sessionmaker(
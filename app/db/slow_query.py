@@ -0,0 +1,135 @@
+"""
+慢查询日志
+
+- 通过 before/after_cursor_execute 事件为每条语句计时，只记录超过 DB_SLOW_QUERY_MS 的语句，
+  附带所属路由、参数形状 (只记录类型与数量，不记录值) 与耗时
+- 非生产环境下为慢 SELECT 自动抓取 EXPLAIN (ANALYZE, BUFFERS)：在保存点内用原始游标执行，
+  不触发事件、失败不影响当前事务；ANALYZE 会再执行一次语句，同一语句每
+  DB_SLOW_QUERY_EXPLAIN_INTERVAL 秒最多抓取一次；执行计划中可能出现参数值，因此生产环境不抓取
+- 路由由 QueryContextMiddleware 写入上下文变量，后台任务等请求之外的语句记为 "-"
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_request_scope: ContextVar[dict | None] = ContextVar("request_scope", default=None)
+_explained: dict[str, float] = {}
+_EXPLAINED_MAXSIZE = 1000
+
+
+class QueryContextMiddleware:
+    """纯 ASGI 中间件，记录当前请求供慢查询日志标注路由"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
+
+
+def current_route() -> str:
+    scope = _request_scope.get()
+    if scope is None:
+        return "-"
+    # 路由匹配后 scope 中带有 route，使用路径模板便于聚合
+    route = scope.get("route")
+    return f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+
+
+def parameter_shape(parameters, executemany: bool = False) -> str:
+    """参数的类型与数量，不包含参数值"""
+    if executemany:
+        rows = list(parameters or ())
+        first = parameter_shape(rows[0]) if rows else "()"
+        return f"{len(rows)} x {first}"
+    if isinstance(parameters, dict):
+        items = ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items())
+        return f"{{{items}}}"
+    if isinstance(parameters, list | tuple):
+        return f"({', '.join(type(v).__name__ for v in parameters)})"
+    return type(parameters).__name__
+
+
+def _should_explain(statement: str, executemany: bool) -> bool:
+    if settings.ENV == "prod" or not settings.DB_SLOW_QUERY_EXPLAIN or executemany:
+        return False
+    # ANALYZE 会实际执行语句，只对只读查询抓取
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return False
+    now = time.monotonic()
+    last = _explained.get(statement)
+    if last is not None and now - last < settings.DB_SLOW_QUERY_EXPLAIN_INTERVAL:
+        return False
+    if len(_explained) >= _EXPLAINED_MAXSIZE:
+        _explained.clear()
+    _explained[statement] = now
+    return True
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception as exc:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return f"EXPLAIN failed: {exc}"
+        cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+    finally:
+        cursor.close()
+
+
+def install(engine: Engine, threshold_ms: float = settings.DB_SLOW_QUERY_MS) -> None:
+    """为同步引擎 (异步引擎传入 engine.sync_engine) 注册计时事件；阈值 <= 0 时不注册"""
+    if threshold_ms <= 0:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, _cursor, _statement, _parameters, _context, _executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, _cursor, statement, parameters, _context, executemany):
+        elapsed = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+        if elapsed < threshold_ms:
+            return
+        plan = ""
+        if _should_explain(statement, executemany):
+            try:
+                plan = "\n" + _explain(conn, statement, parameters)
+            except Exception as exc:
+                plan = f"\nEXPLAIN failed: {exc}"
+        logger.warning(
+            "Slow query %.1f ms [%s] params=%s\n%s%s",
+            elapsed,
+            current_route(),
+            parameter_shape(parameters, executemany),
+            statement,
+            plan,
+        )
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        # 执行失败时不会触发 after_cursor_execute，弹出计时避免错位
+        starts = (
+            context.connection.info.get("query_start") if context.connection else None
+        )
+        if starts:
+            starts.pop()
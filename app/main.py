@@ -1,16 +1,87 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from sqlalchemy.orm import configure_mappers
 
+from app.core.config import settings
+from app.core.id_generator import worker_lease
+from app.core.invalidation import invalidation_bus
+from app.core.lifecycle import InFlightMiddleware, request_tracker, warm_up_pool
+from app.core.profiling import ProfilingMiddleware
+from app.core.redis import close_redis, init_redis, redis_client
+from app.core.security import preload
+from app.db.session import AsyncSessionLocal, engine
+from app.db.slow_query import QueryContextMiddleware
+from app.modules.auth.api import prime_user_routes
 from app.modules.auth.api import router as auth_router
+from app.modules.auth.membership import route_names, user_names
+from app.modules.auth.revocation import token_revocations
+from app.modules.auth.sessions import last_login_writer
+from app.modules.system.api.dict import router as dict_router
+from app.modules.system.api.job import router as job_router
+from app.modules.system.api.menu import prime_menu_tree_list
 from app.modules.system.api.menu import router as menu_router
+from app.modules.system.api.monitor import router as monitor_router
 from app.modules.system.api.role import router as role_router
 from app.modules.system.api.user import router as user_router
+from app.modules.system.crud.crud_oper_log import oper_log_writer
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up(app: FastAPI) -> None:
+    """预热：使滚动发布后的首批请求与稳态一样快"""
+    configure_mappers()
+    preload()
+    # 数据库不可用时直接抛出，阻止实例接收流量
+    await warm_up_pool(engine, settings.DB_WARMUP_CONNECTIONS)
+    app.openapi()
+    # 缓存预热失败不影响启动，首次请求时会自行构建
+    try:
+        await prime_menu_tree_list()
+        async with AsyncSessionLocal() as db:
+            await prime_user_routes(db)
+        await token_revocations.refresh()
+        await route_names.refresh()
+        await user_names.refresh()
+    except Exception:
+        logger.exception("Cache warm-up failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 启动：检查 Redis 连接并订阅缓存失效消息，申请雪花 ID 实例号租约，再预热数据库与缓存
+    await init_redis()
+    await invalidation_bus.start()
+    await worker_lease.start(redis_client)
+    await warm_up(app)
+    await oper_log_writer.start()
+    await last_login_writer.start()
+    yield
+    # 关闭：等待进行中的请求完成，释放租约并停止订阅，最后断开 Redis 与数据库连接池
+    await request_tracker.drain(settings.SHUTDOWN_DRAIN_TIMEOUT)
+    # 请求处理完后再写完操作日志队列与最近登录信息
+    await oper_log_writer.stop()
+    await last_login_writer.stop()
+    await worker_lease.stop()
+    await invalidation_bus.stop()
+    await close_redis()
+    await engine.dispose()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(QueryContextMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(InFlightMiddleware)
 
 app.include_router(auth_router, prefix="/auth", tags=["认证模块"])
 app.include_router(user_router, prefix="/system/user", tags=["用户管理"])
 app.include_router(role_router, prefix="/system/role", tags=["角色管理"])
 app.include_router(menu_router, prefix="/system/menu", tags=["菜单管理"])
+app.include_router(dict_router, prefix="/system/dict", tags=["字典管理"])
+app.include_router(job_router, prefix="/system/job", tags=["后台任务"])
+app.include_router(monitor_router, prefix="/system/monitor", tags=["系统监控"])
 
 
 @app.get("/")
@@ -1,15 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.params import Query
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.constants.static_routes import CONSTANT_ROUTES
 from app.core.base_response import ResponseModel
+from app.core.cache import payload_cache, route_for
+from app.core.config import settings
+from app.core.invalidation import bump_version
+from app.core.rate_limit import RateRule, client_ip, limiter
 from app.core.security import get_password_hash
+from app.db.base import user_roles
+from app.db.crud_base import UniqueViolationError
 from app.db.session import get_db
+from app.modules.auth.membership import route_names, user_names
+from app.modules.auth.revocation import token_revocations
 from app.modules.auth.schemas.auth import LoginCredentials
-from app.modules.auth.service import auth_service, build_menu_tree, get_current_user
-from app.modules.system.models.menu import Menu
+from app.modules.auth.service import (
+    auth_service,
+    build_menu_tree,
+    get_current_user,
+    get_token_payload,
+)
+from app.modules.auth.sessions import session_tracker
+from app.modules.system.crud.crud_user import user_crud
+from app.modules.system.models.role import Role
 from app.modules.system.models.user import User
 from app.modules.system.schemas.user import UserCreate, UserOut
 
@@ -19,36 +36,65 @@ router = APIRouter()
 @router.post("/register", response_model=UserOut, summary="用户注册")
 async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     """
-    注册新用户：校验重复 -> Hash密码 -> 持久化
+    注册新用户：Hash密码 -> 持久化 (唯一性由数据库约束保证)
     """
-    # 检查用户名是否已存在
-    result = await db.execute(select(User).where(User.user_name == user_in.user_name))
-    if result.scalars().first():
-        raise HTTPException(status_code=400, detail="该用户名已被注册")
-
-    # 创建用户实例
-    new_user = User(
-        user_name=user_in.user_name,
-        nickname=user_in.nickname,
-        hashed_password=get_password_hash(user_in.password),  # 密码加密
-        status="1",
-    )
-
-    db.add(new_user)
+    values = {
+        "user_name": user_in.user_name,
+        "nickname": user_in.nickname,
+        "hashed_password": get_password_hash(user_in.password),  # 密码加密
+        "status": "1",
+    }
+    try:
+        new_user = await user_crud.create_unique(db, values, ("user_name",))
+    except UniqueViolationError:
+        raise HTTPException(status_code=400, detail="该用户名已被注册") from None
     await db.commit()
-    await db.refresh(new_user)
+    # 新用户名随通知广播，各 worker 的用户名索引原地追加
+    await bump_version("user", members=[new_user.user_name])
     return new_user
 
 
 @router.post("/login", summary="用户登录")
 async def login(
     credentials: LoginCredentials,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    result = await auth_service.authenticate(credentials, db)
+    # 限流必须在任何数据库查询与密码哈希校验之前执行
+    user_key = f"login:user:{credentials.user_name}"
+    await limiter.enforce(
+        RateRule(
+            user_key,
+            settings.LOGIN_RATE_LIMIT_USER,
+            settings.LOGIN_RATE_LIMIT_WINDOW,
+            settings.LOGIN_LOCKOUT_SECONDS,
+            settings.LOGIN_LOCKOUT_MAX_SECONDS,
+        ),
+        RateRule(
+            f"login:ip:{client_ip(request)}",
+            settings.LOGIN_RATE_LIMIT_IP,
+            settings.LOGIN_RATE_LIMIT_WINDOW,
+            settings.LOGIN_LOCKOUT_SECONDS,
+            settings.LOGIN_LOCKOUT_MAX_SECONDS,
+        ),
+    )
+
+    result = await auth_service.authenticate(credentials, db, request)
+    # 登录成功后清空该账号的失败计数，IP 维度计数保留
+    await limiter.reset(user_key)
     return result
 
 
+@router.post("/logout", summary="退出登录")
+async def logout(payload: dict = Depends(get_token_payload)):
+    """
+    吊销当前 token，之后使用该 token 的请求均返回 401
+    """
+    await token_revocations.revoke_token(payload)
+    await session_tracker.end(payload)
+    return ResponseModel.success(msg="退出成功")
+
+
 @router.get("/getUserInfo", summary="获取当前登录用户信息及权限")
 async def get_user_info(current_user: User = Depends(get_current_user)):
     """
@@ -79,13 +125,66 @@ async def get_user_info(current_user: User = Depends(get_current_user)):
 @router.get(
     "/getUserRoutes", response_model_exclude_none=True, summary="获取动态路由菜单"
 )
-async def get_user_routes(current_user: User = Depends(get_current_user)):
+async def get_user_routes(
+    request: Request, current_user: User = Depends(get_current_user)
+):
     """
     获取当前用户的动态路由树
     """
-    # 汇总当前用户所有角色下的菜单 (去重)
+    # 路由树只取决于角色集合，同一角色组合的用户共享缓存
+    role_ids = tuple(sorted(role.role_id for role in current_user.roles))
+    return await payload_cache.respond(
+        request,
+        ("auth:user-routes", role_ids),
+        ("menu", "role"),
+        lambda: _build_user_routes(current_user.roles),
+    )
+
+
+async def prime_user_routes(db: AsyncSession, limit: int = 100) -> None:
+    """
+    启动预热：为最常见的角色组合生成动态路由缓存
+    :param limit: 最多预热的角色组合数量
+    """
+    role_set = func.array_agg(
+        aggregate_order_by(user_roles.c.role_id, user_roles.c.role_id)
+    )
+    per_user = (
+        select(role_set.label("role_ids")).group_by(user_roles.c.user_id).subquery()
+    )
+    # 按使用人数排序，优先预热覆盖用户最多的组合
+    result = await db.execute(
+        select(per_user.c.role_ids)
+        .group_by(per_user.c.role_ids)
+        .order_by(func.count().desc())
+        .limit(limit)
+    )
+    role_sets = [tuple(row) for row in result.scalars().all()]
+    if not role_sets:
+        return
+
+    result = await db.execute(
+        select(Role)
+        .where(Role.role_id.in_({rid for rs in role_sets for rid in rs}))
+        .options(selectinload(Role.menus))
+    )
+    roles = {role.role_id: role for role in result.scalars().all()}
+    route = route_for(router, get_user_routes)
+    for role_ids in role_sets:
+        await payload_cache.prime(
+            route,
+            ("auth:user-routes", role_ids),
+            ("menu", "role"),
+            lambda ids=role_ids: _build_user_routes(
+                [roles[rid] for rid in ids if rid in roles]
+            ),
+        )
+
+
+async def _build_user_routes(roles: list[Role]) -> ResponseModel:
+    # 汇总所有角色下的菜单 (去重)
     all_menus_dict = {}
-    for role in current_user.roles:
+    for role in roles:
         for menu in role.menus:
             # 过滤掉按钮级权限，只保留菜单和目录
             if menu.menu_type in ["M", "C"] and menu.status == "1":
@@ -125,7 +224,14 @@ async def is_route_exist(
     route_name: str = Query(..., description="前端路由名称"),
     db: AsyncSession = Depends(get_db),
 ):
-    stmt = select(Menu).where(Menu.route_name == route_name)
-    result = await db.execute(stmt)
-    exists = result.scalars().first() is not None
+    exists = await route_names.contains(db, route_name)
+    return ResponseModel.success(data=exists)
+
+
+@router.get("/isUserNameExist", summary="检查用户名是否已被注册")
+async def is_user_name_exist(
+    user_name: str = Query(..., description="用户名"),
+    db: AsyncSession = Depends(get_db),
+):
+    exists = await user_names.contains(db, user_name)
     return ResponseModel.success(data=exists)
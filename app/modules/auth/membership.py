@@ -0,0 +1,139 @@
+"""
+存在性索引
+
+菜单编辑器逐键检查路由名称、注册表单检查用户名，每次都查询数据库。
+每个 worker 在内存中维护一份索引：
+- 路由名称：数量少，直接保存为集合，存在与否都由内存回答
+- 用户名：数量大，保存为布隆过滤器，判断为不存在时直接返回，可能存在时再查数据库
+写操作提交后 bump_version 通过失效总线通知各 worker：
+- 新增类写操作随通知广播新增的值，各 worker 原地追加，不查询数据库
+- 删除、修改等其他通知：布隆过滤器忽略 (残留的值只会造成误判，由数据库确认)，
+  精确集合标记为过期，下次查询时重建
+- 漏收通知 (版本号不连续) 或无法得知新增内容时标记为过期；布隆过滤器另按
+  rebuild_interval 定期重建、写满后重建，清理已删除的值
+重建失败或尚未加载时回退为直接查询数据库。
+通知到达前的短暂窗口内结果可能滞后，唯一性最终由数据库约束保证
+"""
+
+import logging
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.invalidation import get_version, on_invalidate
+from app.core.singleflight import SingleFlight
+from app.db.crud_base import CRUDBase
+from app.db.session import AsyncSessionLocal
+from app.modules.system.crud.crud_menu import menu_crud
+from app.modules.system.crud.crud_user import user_crud
+from app.utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+
+class MembershipIndex:
+    def __init__(
+        self,
+        crud: CRUDBase,
+        field: str,
+        namespace: str,
+        bloom_capacity: int | None = None,
+        rebuild_interval: float | None = None,
+    ):
+        """
+        bloom_capacity 为空时保存精确集合，否则保存布隆过滤器 (按实际数量扩容)
+        rebuild_interval 为全量重建的间隔(秒)，为空时只在过期时重建
+        """
+        self.crud = crud
+        self.field = field
+        self.namespace = namespace
+        self.bloom_capacity = bloom_capacity
+        self.rebuild_interval = rebuild_interval
+        self._members: frozenset[str] | BloomFilter | None = None
+        self._stale = True
+        # 已加载内容对应的命名空间版本号，加载期间为 None
+        self._version: int | None = None
+        self._loaded_at = 0.0
+        self._flight = SingleFlight(f"membership:{crud.model.__tablename__}:{field}")
+        on_invalidate(namespace, self._on_invalidate, members=True)
+
+    def _on_invalidate(
+        self, _namespace: str, version: int, members: tuple[str, ...] | None
+    ) -> None:
+        if members is None or self._version is None or version != self._version + 1:
+            # 漏收通知、来自定期追平或正在加载，无法确认变化内容
+            self._stale = True
+            return
+        self._version = version
+        if members:
+            self.add(*members)
+        elif self.exact:
+            self._stale = True
+
+    def add(self, *values: str) -> None:
+        """将新增的值追加到已加载的索引"""
+        if isinstance(self._members, BloomFilter):
+            self._members.update(values)
+            if self._members.saturated:
+                self._stale = True
+        elif self._members is not None:
+            self._members = self._members | frozenset(values)
+
+    @property
+    def exact(self) -> bool:
+        return self.bloom_capacity is None
+
+    async def refresh(self) -> None:
+        """从数据库全量加载"""
+        # 先清除标记并记录版本号，加载期间到达的通知会再次置位
+        self._stale = False
+        self._version = None
+        version = get_version(self.namespace)
+        column = getattr(self.crud.model, self.field)
+        try:
+            async with AsyncSessionLocal() as db:
+                rows = await self.crud.project(db, [self.field], column.is_not(None))
+        except Exception:
+            self._stale = True
+            raise
+        values = [getattr(row, self.field) for row in rows]
+        if self.exact:
+            self._members = frozenset(values)
+        else:
+            members = BloomFilter(max(self.bloom_capacity, len(values) * 2))
+            members.update(values)
+            self._members = members
+        self._version = version
+        self._loaded_at = time.monotonic()
+
+    async def contains(self, db: AsyncSession, value: str) -> bool:
+        if (
+            self.rebuild_interval is not None
+            and time.monotonic() - self._loaded_at > self.rebuild_interval
+        ):
+            self._stale = True
+        if self._stale:
+            try:
+                # 并发的首批查询只触发一次重建
+                await self._flight.do("refresh", self.refresh)
+            except Exception as exc:
+                logger.warning("Membership index refresh failed: %s", exc)
+        members = self._members
+        if members is not None and not self._stale:
+            if value not in members:
+                return False
+            if self.exact:
+                return True
+        # 未加载、已过期或布隆过滤器可能误判时以数据库为准
+        return await self.crud.exists_by(db, self.field, value)
+
+
+route_names = MembershipIndex(menu_crud, "route_name", "menu")
+user_names = MembershipIndex(
+    user_crud,
+    "user_name",
+    "user",
+    settings.USER_NAME_BLOOM_CAPACITY,
+    settings.USER_NAME_BLOOM_REBUILD_SECONDS,
+)
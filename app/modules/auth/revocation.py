@@ -0,0 +1,139 @@
+"""
+Token 吊销
+
+- 注销时吊销单个 token (jti)，管理员踢人或禁用账号时吊销该用户此前签发的全部 token
+- 吊销记录存放在 Redis 中直至 token 过期，同时写入一个按吊销时间排序的 ZSET
+- 每个 worker 维护吊销记录的布隆过滤器，绝大多数未吊销的 token 只需一次内存判断；
+  命中过滤器时再查询 Redis 确认。吊销后通过失效总线通知各 worker 增量拉取 ZSET
+"""
+
+import logging
+import time
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.invalidation import bump_version, on_invalidate
+from app.core.redis import breaker, redis_client
+from app.utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "token"
+# 增量拉取时回看的毫秒数，覆盖并发写入时 ZSET 分数与提交顺序不一致的情况
+_OVERLAP_MS = 5000
+
+# KEYS: [吊销记录 ZSET, 吊销标记键]  ARGV: [成员, 标记过期秒数, ZSET 保留毫秒数]
+# 标记键的值为吊销时刻(秒)，踢人时用于与 token 的 iat 比较
+_REVOKE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('SET', KEYS[2], t[1], 'EX', ARGV[2])
+redis.call('ZADD', KEYS[1], now, ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - tonumber(ARGV[3]))
+return now
+"""
+
+
+class TokenRevocations:
+    def __init__(
+        self,
+        capacity: int = settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+        prefix: str = "auth:revoked",
+    ):
+        self.prefix = prefix
+        self.max_lifetime = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600
+        self._filter = BloomFilter(capacity)
+        self._cursor: float | None = None
+        self._stale = True
+        self._script = redis_client.register_script(_REVOKE_SCRIPT)
+        on_invalidate(NAMESPACE, self._mark_stale)
+
+    def _mark_stale(self, _namespace: str, _version: int) -> None:
+        self._stale = True
+
+    def _key(self, member: str) -> str:
+        return f"{self.prefix}:{member}"
+
+    async def refresh(self) -> None:
+        """增量拉取上次之后新增的吊销记录；过滤器写满后全量重建"""
+        # 先清除标记，拉取期间到达的新通知会再次置位
+        self._stale = False
+        try:
+            if self._filter.saturated:
+                self._filter.clear()
+                self._cursor = None
+            start = "-inf" if self._cursor is None else self._cursor - _OVERLAP_MS
+            entries = await redis_client.zrangebyscore(
+                self.prefix, start, "+inf", withscores=True
+            )
+        except Exception:
+            self._stale = True
+            raise
+        for member, score in entries:
+            # 回看窗口内的记录会重复返回，跳过已存在的避免虚增计数
+            if member not in self._filter:
+                self._filter.add(member)
+            self._cursor = max(self._cursor or 0, score)
+
+    async def _revoke(self, member: str, ttl: int) -> None:
+        try:
+            await self._script(
+                keys=[self.prefix, self._key(member)],
+                args=[member, ttl, self.max_lifetime * 1000],
+            )
+        except Exception as exc:
+            logger.warning("Token revocation failed: %s", exc)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="服务暂不可用，请稍后再试",
+            )
+        self._filter.add(member)
+        await bump_version(NAMESPACE)
+
+    async def revoke_token(self, payload: dict) -> None:
+        """吊销单个 token，记录保留到该 token 过期"""
+        jti = payload.get("jti")
+        ttl = int(payload.get("exp", 0) - time.time())
+        if jti and ttl > 0:
+            await self._revoke(f"jti:{jti}", ttl)
+
+    async def revoke_user(self, user_id: int) -> None:
+        """吊销用户此前签发的全部 token (踢下线、禁用账号)"""
+        await self._revoke(f"user:{user_id}", self.max_lifetime)
+
+    async def is_revoked(self, payload: dict) -> bool:
+        """
+        判断 token 是否已吊销
+        Redis 不可用时放行 (仅记录日志)，账号状态仍由数据库校验兜底
+        """
+        if self._stale and breaker.available:
+            try:
+                await self.refresh()
+            except Exception as exc:
+                logger.warning("Token revocation refresh failed: %s", exc)
+
+        jti_member = f"jti:{payload.get('jti')}"
+        user_member = f"user:{payload.get('sub')}"
+        candidates = [m for m in (jti_member, user_member) if m in self._filter]
+        if not candidates:
+            return False
+
+        # 布隆过滤器可能误判，命中时以 Redis 为准
+        try:
+            values = await redis_client.mget([self._key(m) for m in candidates])
+        except Exception as exc:
+            logger.warning("Token revocation lookup failed: %s", exc)
+            return False
+        for member, value in zip(candidates, values, strict=True):
+            if value is None:
+                continue
+            if member == jti_member:
+                return True
+            # 踢人：吊销时刻(含)之前签发的 token 均失效
+            if payload.get("iat", 0) <= int(value):
+                return True
+        return False
+
+
+token_revocations = TokenRevocations()
@@ -1,17 +1,20 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.core.base_response import ResponseModel
-from app.core.config import settings
-from app.core.security import create_access_token, verify_password
+from app.core.rate_limit import client_ip
+from app.core.security import (
+    create_access_token,
+    decode_access_token,
+    verify_password,
+)
 from app.db.session import get_db
+from app.modules.auth.revocation import token_revocations
 from app.modules.auth.schemas.auth import LoginCredentials, RouteMeta, UserRoute
+from app.modules.auth.sessions import last_login_writer, session_tracker
+from app.modules.system.crud.crud_user import user_crud
 from app.modules.system.models.menu import Menu
-from app.modules.system.models.role import Role
 from app.modules.system.models.user import User
 
 # 定义 OAuth2 方案，指定获取 Token 的 URL
@@ -19,7 +22,9 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
 class AuthService:
-    async def authenticate(self, credentials: LoginCredentials, db: AsyncSession):
+    async def authenticate(
+        self, credentials: LoginCredentials, db: AsyncSession, request: Request
+    ):
         # 策略分发
         if credentials.login_type == "password":
             user = await self._verify_password_login(credentials, db)
@@ -32,6 +37,14 @@ class AuthService:
 
         # 统一签发 Token
         token = create_access_token(subject=str(user.user_id))
+
+        # 登记在线会话，最近登录信息延迟批量写回数据库
+        ip = client_ip(request)
+        await session_tracker.start(
+            decode_access_token(token), user, ip, request.headers.get("user-agent")
+        )
+        last_login_writer.record(user.user_id, ip)
+
         result = {
             "token": token,
             "refreshToken": "...",  # 如果需要可在此扩展
@@ -41,8 +54,7 @@ class AuthService:
 
     async def _verify_password_login(self, cred, db):
         # 1. 查找用户
-        result = await db.execute(select(User).where(User.user_name == cred.user_name))
-        user = result.scalars().first()
+        user = await user_crud.get_by(db, "user_name", cred.user_name, profile="login")
 
         # 2. 验证密码
         if not user or not verify_password(cred.password, user.hashed_password):
@@ -63,40 +75,47 @@ class AuthService:
 auth_service = AuthService()
 
 
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token 无效或已过期",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
+    """
+    解码 JWT 并校验是否已吊销 (注销、踢下线)
+    """
+    payload = decode_access_token(token)
+    if payload is None or payload.get("sub") is None:
+        raise _credentials_exception()
+    if await token_revocations.is_revoked(payload):
+        raise _credentials_exception()
+    await session_tracker.touch(payload)
+    return payload
+
+
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+    request: Request,
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_db),
 ) -> User:
     """
     JWT Token 验证依赖项
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Token 无效或已过期",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    credentials_exception = _credentials_exception()
 
+    # 1. 解析用户ID
+    # --- 核心修复点：将字符串转为整数 ---
     try:
-        # 1. 解码 Token
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        user_id_str: str = payload.get("sub")
-        if user_id_str is None:
-            raise credentials_exception
-
-        # --- 核心修复点：将字符串转为整数 ---
-        user_id = int(user_id_str)
-    except JWTError:
+        user_id = int(payload["sub"])
+    except ValueError:
         raise credentials_exception
 
     # 2. 查询用户并预加载角色和菜单 (RBAC 核心)
     # 使用 selectinload 解决异步环境下的关联查询
-    result = await db.execute(
-        select(User)
-        .where(User.user_id == user_id)
-        .options(selectinload(User.roles).selectinload(Role.menus))
-    )
-    user = result.scalars().first()
+    user = await user_crud.get(db, user_id, profile="auth")
 
     if user is None:
         raise credentials_exception
@@ -104,6 +123,8 @@ async def get_current_user(
     if not user.status or user.status == "2":
         raise HTTPException(status_code=403, detail="账号已被禁用")
 
+    # 供操作日志等同一请求内的组件读取当前用户，无需再次查询
+    request.state.current_user = user
     return user
 
 
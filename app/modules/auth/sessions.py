@@ -0,0 +1,275 @@
+"""
+在线会话与登录统计
+
+- 每个 token (jti) 对应一个会话：ZSET {prefix}:sessions 按最近活跃时间排序，
+  会话详情存放在 {prefix}:session:{jti} 哈希中，随空闲超时自动过期
+- {prefix}:user:{user_id} 记录用户的全部会话，踢下线、禁用账号时批量移除
+- 日活使用 HyperLogLog ({prefix}:active:YYYYMMDD)，每天固定约 12KB
+- 在线列表与统计全部由 Redis 提供，不查询数据库
+- 最近登录时间与 IP 先在进程内合并，由后台任务定期批量 UPDATE 写回 sys_user，
+  避免每次登录都对用户表加行锁
+"""
+
+import asyncio
+import logging
+import time
+from datetime import date, datetime, timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.redis import breaker, redis_client
+from app.db.session import engine
+from app.modules.system.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def _unavailable(exc: Exception) -> HTTPException:
+    logger.warning("Session store unavailable: %s", exc)
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="服务暂不可用，请稍后再试",
+    )
+
+
+class SessionTracker:
+    # 本地节流表超过该大小时清理过期条目
+    _TOUCHED_MAXSIZE = 10000
+
+    def __init__(self, prefix: str = "online"):
+        self.prefix = prefix
+        self.timeout = settings.ONLINE_SESSION_TIMEOUT
+        self.touch_interval = settings.ONLINE_TOUCH_INTERVAL
+        self.user_ttl = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600
+        self.active_ttl = settings.ACTIVE_USER_RETENTION_DAYS * 24 * 3600
+        # jti -> 本 worker 最近一次刷新活跃时间的时刻 (monotonic)
+        self._touched: dict[str, float] = {}
+
+    @property
+    def _index(self) -> str:
+        return f"{self.prefix}:sessions"
+
+    def _session_key(self, jti: str) -> str:
+        return f"{self.prefix}:session:{jti}"
+
+    def _user_key(self, user_id) -> str:
+        return f"{self.prefix}:user:{user_id}"
+
+    def _active_key(self, day: date) -> str:
+        return f"{self.prefix}:active:{day:%Y%m%d}"
+
+    async def start(
+        self, payload: dict, user: User, ip: str, user_agent: str | None = None
+    ) -> None:
+        """登录成功后登记会话；Redis 不可用时仅记录日志，不影响登录"""
+        jti = payload["jti"]
+        now = time.time()
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(
+                    self._session_key(jti),
+                    mapping={
+                        "user_id": user.user_id,
+                        "user_name": user.user_name,
+                        "nickname": user.nickname or "",
+                        "ip": ip,
+                        "user_agent": (user_agent or "")[:255],
+                        "login_time": now,
+                    },
+                )
+                pipe.expire(self._session_key(jti), self.timeout)
+                pipe.zadd(self._index, {jti: now})
+                pipe.sadd(self._user_key(user.user_id), jti)
+                pipe.expire(self._user_key(user.user_id), self.user_ttl)
+                self._count_active(pipe, user.user_id)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("Failed to register session: %s", exc)
+            return
+        self._touched[jti] = time.monotonic()
+
+    async def touch(self, payload: dict) -> None:
+        """
+        刷新会话的最近活跃时间并计入日活
+        同一会话在 touch_interval 内只写一次 Redis
+        """
+        jti = payload.get("jti")
+        if not jti or not breaker.available:
+            return
+        now = time.monotonic()
+        last = self._touched.get(jti)
+        if last is not None and now - last < self.touch_interval:
+            return
+        self._touched[jti] = now
+        if len(self._touched) > self._TOUCHED_MAXSIZE:
+            self._touched = {
+                k: v for k, v in self._touched.items() if now - v < self.touch_interval
+            }
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                # xx: 只更新仍在线的会话，已退出的不会被重新加入
+                pipe.zadd(self._index, {jti: time.time()}, xx=True)
+                pipe.expire(self._session_key(jti), self.timeout)
+                self._count_active(pipe, payload.get("sub"))
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("Failed to touch session: %s", exc)
+
+    def _count_active(self, pipe, user_id) -> None:
+        key = self._active_key(date.today())
+        pipe.pfadd(key, str(user_id))
+        pipe.expire(key, self.active_ttl)
+
+    async def end(self, payload: dict) -> None:
+        """退出登录时移除会话"""
+        jti = payload.get("jti")
+        if not jti:
+            return
+        self._touched.pop(jti, None)
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.zrem(self._index, jti)
+                pipe.delete(self._session_key(jti))
+                pipe.srem(self._user_key(payload.get("sub")), jti)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("Failed to end session: %s", exc)
+
+    async def end_user(self, user_id: int) -> None:
+        """移除用户的全部会话 (踢下线、禁用账号)"""
+        try:
+            jtis = await redis_client.smembers(self._user_key(user_id))
+            async with redis_client.pipeline(transaction=False) as pipe:
+                if jtis:
+                    pipe.zrem(self._index, *jtis)
+                    pipe.delete(*(self._session_key(jti) for jti in jtis))
+                pipe.delete(self._user_key(user_id))
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("Failed to end sessions of user %s: %s", user_id, exc)
+
+    async def list_online(self, current: int = 1, size: int = 10):
+        """
+        按最近活跃时间倒序分页获取在线会话
+        :return: (总数, 会话列表)
+        """
+        start = (max(current, 1) - 1) * size
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                # 先清理空闲超时的会话，总数即为在线会话数
+                pipe.zremrangebyscore(self._index, "-inf", time.time() - self.timeout)
+                pipe.zcard(self._index)
+                pipe.zrevrange(self._index, start, start + size - 1, withscores=True)
+                _, total, entries = await pipe.execute()
+            if not entries:
+                return total, []
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for jti, _ in entries:
+                    pipe.hgetall(self._session_key(jti))
+                details = await pipe.execute()
+        except Exception as exc:
+            raise _unavailable(exc)
+
+        sessions = []
+        for (jti, last_active), info in zip(entries, details, strict=True):
+            # 详情已过期的会话在下次清理时移除
+            if not info:
+                continue
+            sessions.append(
+                {
+                    **info,
+                    "token_id": jti,
+                    "login_time": datetime.fromtimestamp(float(info["login_time"])),
+                    "last_active_time": datetime.fromtimestamp(last_active),
+                }
+            )
+        return total, sessions
+
+    async def active_stats(self, days: int = 7) -> dict:
+        """在线会话数与最近 days 天的日活"""
+        today = date.today()
+        day_list = [today - timedelta(days=i) for i in range(days)]
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.zcount(self._index, time.time() - self.timeout, "+inf")
+                for day in day_list:
+                    pipe.pfcount(self._active_key(day))
+                online, *counts = await pipe.execute()
+        except Exception as exc:
+            raise _unavailable(exc)
+        return {
+            "online": online,
+            "daily": [
+                {"date": day.isoformat(), "count": count}
+                for day, count in zip(day_list, counts, strict=True)
+            ],
+        }
+
+
+class LastLoginWriter:
+    """
+    最近登录信息延迟写回
+    同一用户多次登录只保留最后一次，按用户 ID 排序批量更新以保持加锁顺序一致
+    """
+
+    def __init__(self, engine: AsyncEngine, flush_interval: float):
+        self.engine = engine
+        self.flush_interval = flush_interval
+        self._pending: dict[int, tuple[datetime, str]] = {}
+        self._task: asyncio.Task | None = None
+
+    def record(self, user_id: int, ip: str) -> None:
+        self._pending[user_id] = (datetime.now(), ip)
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await asyncio.shield(self.flush())
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        table = User.__table__
+        stmt = (
+            update(table)
+            .where(table.c.user_id == bindparam("b_user_id"))
+            # 登录不属于资料修改，保持 update_time 不变
+            .values(
+                last_login_time=bindparam("b_time"),
+                last_login_ip=bindparam("b_ip"),
+                update_time=table.c.update_time,
+            )
+        )
+        params = [
+            {"b_user_id": user_id, "b_time": login_time, "b_ip": ip}
+            for user_id, (login_time, ip) in sorted(pending.items())
+        ]
+        try:
+            async with self.engine.begin() as conn:
+                await conn.execute(stmt, params)
+        except Exception:
+            logger.exception("Failed to write last login of %s users", len(params))
+            # 放回待写队列，期间的新登录记录优先
+            for user_id, value in pending.items():
+                self._pending.setdefault(user_id, value)
+
+
+session_tracker = SessionTracker()
+last_login_writer = LastLoginWriter(engine, settings.LAST_LOGIN_FLUSH_INTERVAL)
@@ -0,0 +1,344 @@
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from sqlalchemy import and_, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import get_current_user
+from app.core.base_response import PageResult, ResponseModel
+from app.core.cache import payload_cache
+from app.core.invalidation import bump_version
+from app.db.session import AsyncSessionLocal, get_db
+from app.modules.auth.service import get_token_payload
+from app.modules.system.crud.crud_dict import NAMESPACE, dict_cache
+from app.modules.system.crud.crud_oper_log import OperLogRecorder, oper_logger
+from app.modules.system.models.dict import DictData, DictType
+from app.modules.system.models.user import User
+from app.modules.system.schemas.dict import (
+    DictDataCreate,
+    DictDataOut,
+    DictDataQuery,
+    DictDataUpdate,
+    DictOption,
+    DictTypeCreate,
+    DictTypeOut,
+    DictTypeQuery,
+    DictTypeUpdate,
+)
+
+router = APIRouter()
+
+# 单次请求最多获取的字典类型数量
+MAX_OPTION_TYPES = 50
+
+
+@router.get(
+    "/options",
+    response_model=ResponseModel[dict[str, list[DictOption]]],
+    summary="批量获取字典项",
+)
+async def get_dict_options(
+    request: Request,
+    types: str = Query(..., description="字典类型编码，逗号分隔"),
+    _payload: dict = Depends(get_token_payload),
+):
+    """
+    一次请求获取多个字典，数据来自进程内缓存，支持 ETag
+    """
+    dict_types = tuple(sorted({t.strip() for t in types.split(",") if t.strip()}))
+    if not dict_types:
+        raise HTTPException(status_code=400, detail="未指定字典类型")
+    if len(dict_types) > MAX_OPTION_TYPES:
+        raise HTTPException(
+            status_code=400, detail=f"单次最多获取 {MAX_OPTION_TYPES} 个字典"
+        )
+
+    async def build():
+        # 合并后的构建任务由多个请求共享，使用独立会话，不依赖发起请求的会话
+        async with AsyncSessionLocal() as db:
+            options = await dict_cache.get_many(db, dict_types)
+        return ResponseModel.success(data=options)
+
+    return await payload_cache.respond(
+        request, ("dict:options", dict_types), (NAMESPACE,), build
+    )
+
+
+@router.get(
+    "/type/list",
+    response_model=ResponseModel[PageResult[DictTypeOut]],
+    summary="获取字典类型列表分页",
+)
+async def list_dict_types(
+    query: DictTypeQuery = Depends(),
+    db: AsyncSession = Depends(get_db),
+    _current_user: User = Depends(get_current_user),
+):
+    filters = []
+    if query.dict_name:
+        filters.append(DictType.dict_name.contains(query.dict_name))
+    if query.dict_type:
+        filters.append(DictType.dict_type.contains(query.dict_type))
+    if query.status:
+        filters.append(DictType.status == query.status)
+
+    count_stmt = select(func.count()).select_from(DictType).where(and_(*filters))
+    total = (await db.execute(count_stmt)).scalar() or 0
+
+    stmt = (
+        select(DictType)
+        .where(and_(*filters))
+        .offset((query.current - 1) * query.size)
+        .limit(query.size)
+        .order_by(DictType.create_time.desc(), DictType.dict_id)
+    )
+    result = await db.execute(stmt)
+
+    return ResponseModel.success(
+        data=PageResult(
+            records=result.scalars().all(),
+            total=total,
+            current=query.current,
+            size=query.size,
+        )
+    )
+
+
+@router.post("/type/add", summary="创建字典类型")
+async def add_dict_type(
+    type_in: DictTypeCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("字典管理")),
+):
+    check = await db.execute(
+        select(DictType.dict_id).where(DictType.dict_type == type_in.dict_type)
+    )
+    if check.first():
+        raise HTTPException(status_code=400, detail="字典类型编码已存在")
+
+    new_type = DictType(**type_in.model_dump(), create_by=current_user.user_name)
+    db.add(new_type)
+    await db.commit()
+    await bump_version(NAMESPACE)
+    await oper_log.record(
+        "add",
+        target=new_type.dict_id,
+        detail=type_in.model_dump(),
+        oper_name=current_user.user_name,
+    )
+    return ResponseModel.success(msg="字典类型创建成功")
+
+
+@router.put("/type/{dict_id}", summary="修改字典类型")
+async def update_dict_type(
+    dict_id: int,
+    type_in: DictTypeUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("字典管理")),
+):
+    """
+    修改类型编码时，字典项通过外键级联更新
+    """
+    dict_type = await db.get(DictType, dict_id)
+    if not dict_type:
+        raise HTTPException(status_code=404, detail="字典类型不存在")
+
+    update_data = type_in.model_dump(exclude_unset=True)
+    new_code = update_data.get("dict_type")
+    if new_code and new_code != dict_type.dict_type:
+        check = await db.execute(
+            select(DictType.dict_id).where(DictType.dict_type == new_code)
+        )
+        if check.first():
+            raise HTTPException(status_code=400, detail="字典类型编码已存在")
+
+    for field, value in update_data.items():
+        setattr(dict_type, field, value)
+    dict_type.update_by = current_user.user_name
+    await db.commit()
+    await bump_version(NAMESPACE)
+    await oper_log.record(
+        "update", target=dict_id, detail=update_data, oper_name=current_user.user_name
+    )
+    return ResponseModel.success(msg="字典类型更新成功")
+
+
+@router.delete("/type/{dict_id}", summary="删除字典类型")
+async def delete_dict_type(
+    dict_id: int,
+    db: AsyncSession = Depends(get_db),
+    _current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("字典管理")),
+):
+    """
+    删除类型及其全部字典项
+    """
+    dict_type = await db.get(DictType, dict_id)
+    if not dict_type:
+        raise HTTPException(status_code=404, detail="字典类型不存在")
+
+    await db.delete(dict_type)
+    await db.commit()
+    await bump_version(NAMESPACE)
+    await oper_log.record(
+        "delete", target=dict_id, detail={"dict_type": dict_type.dict_type}
+    )
+    return ResponseModel.success(msg="字典类型删除成功")
+
+
+@router.post("/type/batch-delete", summary="批量删除字典类型")
+async def batch_delete_dict_types(
+    ids: list[int] = Body(...),
+    db: AsyncSession = Depends(get_db),
+    _current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("字典管理")),
+):
+    if not ids:
+        return ResponseModel.error(msg="未选择要删除的字典类型")
+
+    result = await db.execute(delete(DictType).where(DictType.dict_id.in_(ids)))
+    await db.commit()
+    await bump_version(NAMESPACE)
+    await oper_log.record("delete", target=ids)
+    return ResponseModel.success(msg=f"成功删除 {result.rowcount} 条数据")
+
+
+@router.get(
+    "/data/list",
+    response_model=ResponseModel[PageResult[DictDataOut]],
+    summary="获取字典项列表分页",
+)
+async def list_dict_data(
+    query: DictDataQuery = Depends(),
+    db: AsyncSession = Depends(get_db),
+    _current_user: User = Depends(get_current_user),
+):
+    filters = []
+    if query.dict_type:
+        filters.append(DictData.dict_type == query.dict_type)
+    if query.dict_label:
+        filters.append(DictData.dict_label.contains(query.dict_label))
+    if query.status:
+        filters.append(DictData.status == query.status)
+
+    count_stmt = select(func.count()).select_from(DictData).where(and_(*filters))
+    total = (await db.execute(count_stmt)).scalar() or 0
+
+    stmt = (
+        select(DictData)
+        .where(and_(*filters))
+        .offset((query.current - 1) * query.size)
+        .limit(query.size)
+        .order_by(DictData.dict_type, DictData.sort, DictData.data_id)
+    )
+    result = await db.execute(stmt)
+
+    return ResponseModel.success(
+        data=PageResult(
+            records=result.scalars().all(),
+            total=total,
+            current=query.current,
+            size=query.size,
+        )
+    )
+
+
+@router.post("/data/add", summary="创建字典项")
+async def add_dict_data(
+    data_in: DictDataCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("字典管理")),
+):
+    type_check = await db.execute(
+        select(DictType.dict_id).where(DictType.dict_type == data_in.dict_type)
+    )
+    if not type_check.first():
+        raise HTTPException(status_code=400, detail="字典类型不存在")
+
+    await _check_value_unique(db, data_in.dict_type, data_in.dict_value)
+
+    new_data = DictData(**data_in.model_dump(), create_by=current_user.user_name)
+    db.add(new_data)
+    await db.commit()
+    await bump_version(NAMESPACE)
+    await oper_log.record(
+        "add",
+        target=new_data.data_id,
+        detail=data_in.model_dump(),
+        oper_name=current_user.user_name,
+    )
+    return ResponseModel.success(msg="字典项创建成功")
+
+
+@router.put("/data/{data_id}", summary="修改字典项")
+async def update_dict_data(
+    data_id: int,
+    data_in: DictDataUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("字典管理")),
+):
+    dict_data = await db.get(DictData, data_id)
+    if not dict_data:
+        raise HTTPException(status_code=404, detail="字典项不存在")
+
+    update_data = data_in.model_dump(exclude_unset=True)
+    new_value = update_data.get("dict_value")
+    if new_value is not None and new_value != dict_data.dict_value:
+        await _check_value_unique(db, dict_data.dict_type, new_value)
+
+    for field, value in update_data.items():
+        setattr(dict_data, field, value)
+    dict_data.update_by = current_user.user_name
+    await db.commit()
+    await bump_version(NAMESPACE)
+    await oper_log.record(
+        "update", target=data_id, detail=update_data, oper_name=current_user.user_name
+    )
+    return ResponseModel.success(msg="字典项更新成功")
+
+
+@router.delete("/data/{data_id}", summary="删除字典项")
+async def delete_dict_data(
+    data_id: int,
+    db: AsyncSession = Depends(get_db),
+    _current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("字典管理")),
+):
+    dict_data = await db.get(DictData, data_id)
+    if not dict_data:
+        raise HTTPException(status_code=404, detail="字典项不存在")
+
+    await db.delete(dict_data)
+    await db.commit()
+    await bump_version(NAMESPACE)
+    await oper_log.record("delete", target=data_id)
+    return ResponseModel.success(msg="字典项删除成功")
+
+
+@router.post("/data/batch-delete", summary="批量删除字典项")
+async def batch_delete_dict_data(
+    ids: list[int] = Body(...),
+    db: AsyncSession = Depends(get_db),
+    _current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("字典管理")),
+):
+    if not ids:
+        return ResponseModel.error(msg="未选择要删除的字典项")
+
+    result = await db.execute(delete(DictData).where(DictData.data_id.in_(ids)))
+    await db.commit()
+    await bump_version(NAMESPACE)
+    await oper_log.record("delete", target=ids)
+    return ResponseModel.success(msg=f"成功删除 {result.rowcount} 条数据")
+
+
+async def _check_value_unique(db: AsyncSession, dict_type: str, dict_value: str):
+    check = await db.execute(
+        select(DictData.data_id).where(
+            DictData.dict_type == dict_type, DictData.dict_value == dict_value
+        )
+    )
+    if check.first():
+        raise HTTPException(status_code=400, detail="该字典类型下键值已存在")
@@ -0,0 +1,45 @@
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+
+from app.core.auth import get_current_user
+from app.core.base_response import ResponseModel
+from app.core.jobs import get_job, get_job_file
+from app.modules.system.models.user import User
+from app.modules.system.schemas.job import JobOut
+
+router = APIRouter()
+
+
+async def _get_owned_job(job_id: str, current_user: User) -> dict:
+    detail = await get_job(job_id)
+    if detail is None:
+        raise HTTPException(status_code=404, detail="任务不存在或已过期")
+    is_admin = any(r.role_code == "admin" for r in current_user.roles)
+    if not is_admin and detail.get("owner") != str(current_user.user_id):
+        raise HTTPException(status_code=403, detail="无权查看该任务")
+    return detail
+
+
+@router.get("/{job_id}", response_model=ResponseModel[JobOut], summary="获取任务状态")
+async def get_job_status(job_id: str, current_user: User = Depends(get_current_user)):
+    """任务状态与进度，结束后保留 JOB_RESULT_TTL 秒"""
+    detail = await _get_owned_job(job_id, current_user)
+    return ResponseModel.success(data=JobOut.model_validate(detail))
+
+
+@router.get("/{job_id}/file", summary="下载任务生成的文件")
+async def download_job_file(
+    job_id: str, current_user: User = Depends(get_current_user)
+):
+    await _get_owned_job(job_id, current_user)
+    file = await get_job_file(job_id)
+    if file is None:
+        raise HTTPException(status_code=404, detail="文件不存在或已过期")
+    return Response(
+        content=file["content"],
+        media_type=file["media_type"],
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(file['filename'])}"
+        },
+    )
@@ -1,12 +1,28 @@
-from fastapi import APIRouter, Body, Depends, HTTPException
-from sqlalchemy import and_, delete, func, select
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.auth import get_current_user
+from app.core.auth import check_permissions, get_current_user
 from app.core.base_response import PageResult, ResponseModel
-from app.db.session import get_db
+from app.core.cache import payload_cache, route_for
+from app.core.id_generator import next_id
+from app.core.invalidation import bump_version, get_version
+from app.core.response_cache import cache_response
+from app.core.singleflight import SingleFlight
+from app.db.session import AsyncSessionLocal, get_db
+from app.modules.system.crud.crud_menu import (
+    assign_tree_path,
+    build_tree_path,
+    delete_subtrees,
+    has_children,
+    menu_crud,
+    move_subtree,
+)
+from app.modules.system.crud.crud_oper_log import OperLogRecorder, oper_logger
+from app.modules.system.jobs import rebuild_menu_tree
 from app.modules.system.models.menu import Menu
 from app.modules.system.models.user import User
+from app.modules.system.schemas.job import JobCreatedOut
 from app.modules.system.schemas.menu import (
     MenuCreate,
     MenuOut,
@@ -19,15 +35,24 @@ from app.modules.system.schemas.menu import (
 
 router = APIRouter()
 
+menu_tree_flight = SingleFlight("menu-tree")
+
 
 # 树形列表 (通常用于前端菜单管理页面)
 @router.get(
     "/tree", response_model=ResponseModel[list[MenuTreeOut]], summary="获取菜单树形列表"
 )
-async def get_menu_tree(db: AsyncSession = Depends(get_db)):
-    stmt = select(Menu).order_by(Menu.order.asc())
-    result = await db.execute(stmt)
-    menus = result.scalars().all()
+async def get_menu_tree():
+    # 同一版本的并发请求只查询、组装一次
+    return await menu_tree_flight.do(
+        ("menu:tree", get_version("menu")), _build_menu_tree
+    )
+
+
+async def _build_menu_tree() -> ResponseModel:
+    # 合并后的构建任务由多个请求共享，使用独立会话，不依赖发起请求的会话
+    async with AsyncSessionLocal() as db:
+        menus = await menu_crud.find(db, order_by=(Menu.order.asc(),))
 
     # 递归组装树形结构
     menu_map = {m.menu_id: MenuTreeOut.model_validate(m).model_dump() for m in menus}
@@ -49,9 +74,7 @@ async def get_menu_tree(db: AsyncSession = Depends(get_db)):
     summary="获取菜单树形列表(前端option结构)",
 )
 async def get_menu_tree_option(db: AsyncSession = Depends(get_db)):
-    stmt = select(Menu).where(Menu.status == "1").order_by(Menu.order.asc())
-    result = await db.execute(stmt)
-    menus = result.scalars().all()
+    menus = await menu_crud.find(db, Menu.status == "1", order_by=(Menu.order.asc(),))
 
     # 递归组装树形结构
     menu_map = {}
@@ -82,10 +105,27 @@ async def get_menu_tree_option(db: AsyncSession = Depends(get_db)):
     response_model=ResponseModel[PageResult[MenuTreeOut]],
     summary="获取菜单树形列表(带伪分页数据-适配前端)",
 )
-async def get_menu_tree_list(db: AsyncSession = Depends(get_db)):
-    stmt = select(Menu).order_by(Menu.order.asc())
-    result = await db.execute(stmt)
-    menus = result.scalars().all()
+async def get_menu_tree_list(request: Request):
+    # 菜单树与用户无关，按菜单版本缓存序列化及压缩后的结果
+    return await payload_cache.respond(
+        request, ("menu:tree-list",), ("menu",), _build_menu_tree_list
+    )
+
+
+async def prime_menu_tree_list() -> None:
+    """启动预热：生成菜单树列表的缓存载荷"""
+    await payload_cache.prime(
+        route_for(router, get_menu_tree_list),
+        ("menu:tree-list",),
+        ("menu",),
+        _build_menu_tree_list,
+    )
+
+
+async def _build_menu_tree_list() -> ResponseModel:
+    # 与 _build_menu_tree 相同，使用独立会话
+    async with AsyncSessionLocal() as db:
+        menus = await menu_crud.find(db, order_by=(Menu.order.asc(),))
 
     # 预处理：将所有数据转为字典，并初始化 children 和 buttons
     menu_map = {}
@@ -130,20 +170,17 @@ async def get_menu_tree_list(db: AsyncSession = Depends(get_db)):
     response_model=ResponseModel[PageResult[MenuOut]],
     summary="获取菜单分页列表",
 )
+@cache_response(ttl=600, tags=("menu",))
 async def list_menus(query: MenuQuery = Depends(), db: AsyncSession = Depends(get_db)):
-    count_stmt = select(func.count()).select_from(Menu)
-    total = (await db.execute(count_stmt)).scalar() or 0
-
-    stmt = (
-        select(Menu)
-        .offset((query.current - 1) * query.size)
-        .limit(query.size)
-        .order_by(Menu.order.asc())
+    total, menus = await menu_crud.paginate(
+        db,
+        current=query.current,
+        size=query.size,
+        order_by=(Menu.order.asc(), Menu.menu_id),
     )
-    result = await db.execute(stmt)
     return ResponseModel.success(
         data=PageResult(
-            records=result.scalars().all(),
+            records=menus,
             total=total,
             current=query.current,
             size=query.size,
@@ -160,9 +197,7 @@ async def get_all_menu(
     db: AsyncSession = Depends(get_db), _current_user: User = Depends(get_current_user)
 ):
     # 只查询状态为 "1" (启用) 的菜单，按创建时间排序
-    stmt = select(Menu).where(Menu.status == "1").order_by(Menu.order.asc())
-    result = await db.execute(stmt)
-    menus = result.scalars().all()
+    menus = await menu_crud.find(db, Menu.status == "1", order_by=(Menu.order.asc(),))
 
     return ResponseModel.success(data=menus)
 
@@ -176,13 +211,14 @@ async def get_all_pages(
     db: AsyncSession = Depends(get_db), _current_user: User = Depends(get_current_user)
 ):
     # 只查询状态为 "1" (启用) 的菜单，按创建时间排序
-    stmt = (
-        select(Menu.route_name)
-        .where(Menu.status == "1", Menu.menu_type == "C")
-        .order_by(Menu.order.asc())
+    rows = await menu_crud.project(
+        db,
+        ("route_name",),
+        Menu.status == "1",
+        Menu.menu_type == "C",
+        order_by=(Menu.order.asc(),),
     )
-    result = await db.execute(stmt)
-    menus = result.scalars().all()
+    menus = [row.route_name for row in rows]
 
     return ResponseModel.success(data=menus)
 
@@ -197,10 +233,19 @@ async def add_menu(
     menu_in: MenuCreate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("菜单管理")),
 ):
     new_menu = Menu(**menu_in.model_dump(), create_by=current_user.user_name)
+    await assign_tree_path(db, new_menu)
     db.add(new_menu)
     await db.commit()
+    await bump_version("menu")
+    await oper_log.record(
+        "add",
+        target=new_menu.menu_id,
+        detail=menu_in.model_dump(),
+        oper_name=current_user.user_name,
+    )
     return ResponseModel.success(msg="菜单创建成功")
 
 
@@ -215,12 +260,18 @@ async def update_menu(
     menu_in: MenuUpdate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("菜单管理")),
 ):
-    menu = await db.get(Menu, menu_id)
+    menu = await menu_crud.get(db, menu_id)
     if not menu:
         raise HTTPException(status_code=404, detail="菜单不存在")
 
-    update_data = menu_in.model_dump(exclude_unset=True)
+    update_data = menu_in.model_dump(exclude_unset=True, exclude={"buttons"})
+    # 父节点变化时同步重写整棵子树的层级路径
+    if "parent_id" in update_data:
+        new_parent_id = update_data.pop("parent_id")
+        if new_parent_id != menu.parent_id:
+            await move_subtree(db, menu, new_parent_id)
     for field, value in update_data.items():
         setattr(menu, field, value)
 
@@ -236,6 +287,7 @@ async def update_menu(
         new_buttons = []
         for btn in menu_in.buttons:
             button_menu = Menu(
+                menu_id=next_id(),
                 menu_name=btn.desc,
                 permission=btn.code,
                 menu_type="F",
@@ -245,12 +297,22 @@ async def update_menu(
                 order=0,
                 status="1",
             )
+            button_menu.tree_path, button_menu.tree_depth = build_tree_path(
+                menu, button_menu.menu_id
+            )
             new_buttons.append(button_menu)
 
         db.add_all(new_buttons)
 
     menu.update_by = current_user.user_name
     await db.commit()
+    await bump_version("menu")
+    await oper_log.record(
+        "update",
+        target=menu_id,
+        detail=menu_in.model_dump(exclude_unset=True),
+        oper_name=current_user.user_name,
+    )
     return ResponseModel.success(msg="菜单更新成功")
 
 
@@ -260,19 +322,33 @@ async def update_menu(
     summary="删除单个菜单",
     # dependencies=[Depends(require_permissions("sys:menu:delete"))],
 )
-async def delete_menu(menu_id: int, db: AsyncSession = Depends(get_db)):
+async def delete_menu(
+    menu_id: int,
+    cascade: bool = Query(False, description="是否级联删除全部子菜单及按钮"),
+    db: AsyncSession = Depends(get_db),
+    oper_log: OperLogRecorder = Depends(oper_logger("菜单管理")),
+):
+    if cascade:
+        count = await delete_subtrees(db, [menu_id])
+        if not count:
+            raise HTTPException(status_code=404, detail="菜单不存在")
+        await db.commit()
+        await bump_version("menu")
+        await oper_log.record("delete", target=menu_id, detail={"cascade": count})
+        return ResponseModel.success(msg=f"成功删除 {count} 个菜单")
+
     # 检查是否有子菜单
-    child_stmt = select(Menu).where(Menu.parent_id == menu_id)
-    child = (await db.execute(child_stmt)).first()
-    if child:
+    if await has_children(db, menu_id):
         raise HTTPException(status_code=400, detail="请先删除子菜单")
 
-    menu = await db.get(Menu, menu_id)
+    menu = await menu_crud.get(db, menu_id)
     if not menu:
         raise HTTPException(status_code=404, detail="菜单不存在")
 
     await db.delete(menu)
     await db.commit()
+    await bump_version("menu")
+    await oper_log.record("delete", target=menu_id)
     return ResponseModel.success(msg="菜单删除成功")
 
 
@@ -283,22 +359,41 @@ async def delete_menu(menu_id: int, db: AsyncSession = Depends(get_db)):
     # dependencies=[Depends(require_permissions("sys:menu:delete"))],
 )
 async def batch_delete_menus(
-    ids: list[int] = Body(...), db: AsyncSession = Depends(get_db)
+    ids: list[int] = Body(...),
+    cascade: bool = Query(False, description="是否级联删除全部子菜单及按钮"),
+    db: AsyncSession = Depends(get_db),
+    oper_log: OperLogRecorder = Depends(oper_logger("菜单管理")),
 ):
     if not ids:
         return ResponseModel.error(msg="请选择要删除的菜单")
 
+    if cascade:
+        count = await delete_subtrees(db, ids)
+        await db.commit()
+        await bump_version("menu")
+        await oper_log.record("delete", target=ids, detail={"cascade": count})
+        return ResponseModel.success(msg=f"成功删除 {count} 个菜单")
+
     # 批量检查子菜单逻辑 (简单处理：如果选中的菜单中有任何一个包含不在选中列表里的子菜单，则禁止)
-    check_stmt = select(Menu).where(
-        and_(Menu.parent_id.in_(ids), ~Menu.menu_id.in_(ids))
-    )
-    has_child = (await db.execute(check_stmt)).first()
-    if has_child:
+    if await menu_crud.exists(db, Menu.parent_id.in_(ids), ~Menu.menu_id.in_(ids)):
         raise HTTPException(
             status_code=400, detail="选中的菜单中包含未选中的子菜单，请先处理"
         )
 
-    stmt = delete(Menu).where(Menu.menu_id.in_(ids))
-    result = await db.execute(stmt)
+    count = await menu_crud.delete_many(db, ids)
     await db.commit()
-    return ResponseModel.success(msg=f"成功删除 {result.rowcount} 个菜单")
+    await bump_version("menu")
+    await oper_log.record("delete", target=ids)
+    return ResponseModel.success(msg=f"成功删除 {count} 个菜单")
+
+
+@router.post(
+    "/rebuild-tree",
+    response_model=ResponseModel[JobCreatedOut],
+    dependencies=[Depends(check_permissions("sys:menu:edit"))],
+    summary="重建菜单层级路径 (后台任务)",
+)
+async def rebuild_tree(current_user: User = Depends(get_current_user)):
+    """按 parent_id 重新计算全部菜单的 tree_path，用于数据导入或手工修改后的修复"""
+    job_id = await rebuild_menu_tree.enqueue(owner=current_user.user_id)
+    return ResponseModel.success(data=JobCreatedOut(job_id=job_id))
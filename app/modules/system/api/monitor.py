@@ -0,0 +1,49 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from app.core.auth import check_permissions
+from app.core.base_response import ResponseModel
+from app.core.profiling import HEADER, create_profile_token, profile_store
+from app.core.singleflight import singleflight_stats
+
+router = APIRouter(dependencies=[Depends(check_permissions("sys:monitor:view"))])
+
+
+@router.get("/singleflight", summary="获取单飞合并统计")
+async def get_singleflight_stats():
+    """本进程内各单飞实例的调用数、实际执行数与合并率"""
+    return ResponseModel.success(data=singleflight_stats())
+
+
+@router.post("/profiles/token", summary="签发请求剖析令牌")
+async def issue_profile_token(ttl: int = Query(600, ge=1, le=86400)):
+    """请求带上返回的请求头即会被剖析，响应头 X-Profile-Id 为剖析结果 ID"""
+    return ResponseModel.success(
+        data={"header": HEADER, "token": create_profile_token(ttl)}
+    )
+
+
+@router.get("/profiles", summary="获取请求剖析列表")
+async def list_profiles():
+    """按时间倒序，最多保留 PROFILE_MAX_FILES 份"""
+    return ResponseModel.success(data=await asyncio.to_thread(profile_store.list))
+
+
+@router.get("/profiles/{profile_id}", summary="下载请求剖析结果")
+async def download_profile(
+    profile_id: str,
+    format: str = Query("prof", pattern="^(prof|text)$"),
+    limit: int = Query(50, ge=1, le=1000),
+):
+    """prof 为 cProfile 原始数据 (可用 snakeviz 等工具查看)，text 为按累计耗时排序的报告"""
+    if format == "text":
+        report = await asyncio.to_thread(profile_store.text, profile_id, limit)
+        if report is None:
+            raise HTTPException(status_code=404, detail="剖析结果不存在或已被清理")
+        return PlainTextResponse(report)
+    path = profile_store.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="剖析结果不存在或已被清理")
+    return FileResponse(path, filename=path.name)
@@ -1,11 +1,17 @@
 from fastapi import APIRouter, Body, Depends, HTTPException
-from sqlalchemy import and_, delete, func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user
 from app.core.base_response import PageResult, ResponseModel
+from app.core.invalidation import bump_version
+from app.core.response_cache import cache_response
 from app.db.base import role_menus
+from app.db.crud_base import UniqueViolationError
 from app.db.session import get_db
+from app.modules.system.crud.crud_menu import leaf_condition, menu_crud
+from app.modules.system.crud.crud_oper_log import OperLogRecorder, oper_logger
+from app.modules.system.crud.crud_role import role_crud
 from app.modules.system.models.menu import Menu
 from app.modules.system.models.role import Role
 from app.modules.system.models.user import User
@@ -19,12 +25,15 @@ from app.modules.system.schemas.role import (
 
 router = APIRouter()
 
+ROLE_CONFLICTS = {"role_code": "角色编码已存在", "role_name": "角色名称已存在"}
+
 
 @router.get(
     "/list",
     response_model=ResponseModel[PageResult[RoleOut]],
     summary="获取角色列表分页",
 )
+@cache_response(ttl=300, tags=("role",))
 async def list_roles(
     query: RoleQuery = Depends(),
     db: AsyncSession = Depends(get_db),
@@ -41,23 +50,18 @@ async def list_roles(
     if query.status:
         filters.append(Role.status == query.status)
 
-    # 计算总数
-    count_stmt = select(func.count()).select_from(Role).where(and_(*filters))
-    total = (await db.execute(count_stmt)).scalar() or 0
-
-    # 分页数据
-    stmt = (
-        select(Role)
-        .where(and_(*filters))
-        .offset((query.current - 1) * query.size)
-        .limit(query.size)
-        .order_by(Role.create_time.desc())
+    total, roles = await role_crud.paginate(
+        db,
+        *filters,
+        current=query.current,
+        size=query.size,
+        order_by=(Role.create_time.desc(),),
+        profile="brief",
     )
-    result = await db.execute(stmt)
 
     return ResponseModel.success(
         data=PageResult(
-            records=result.scalars().all(),
+            records=roles,
             total=total,
             current=query.current,
             size=query.size,
@@ -78,9 +82,12 @@ async def get_all_roles(
     # 仅限拥有 'sys:role:all' 权限或管理员访问。
     """
     # 只查询状态为 "1" (启用) 的角色，按创建时间排序
-    stmt = select(Role).where(Role.status == "1").order_by(Role.create_time.asc())
-    result = await db.execute(stmt)
-    roles = result.scalars().all()
+    roles = await role_crud.find(
+        db,
+        Role.status == "1",
+        order_by=(Role.create_time.asc(),),
+        profile="brief",
+    )
 
     return ResponseModel.success(data=roles)
 
@@ -95,19 +102,14 @@ async def get_menus(
     db: AsyncSession = Depends(get_db),
     _current_user: User = Depends(get_current_user),
 ):
-    # 子查询：找出该角色拥有的菜单中，作为 parent_id 出现过的 ID
-    subquery = (
-        select(Menu.parent_id)
-        .join(role_menus, Menu.menu_id == role_menus.c.menu_id)
-        .where(role_menus.c.role_id == role_id)
-        .scalar_subquery()  # 转换为标量子查询
-    )
+    # 该角色拥有的菜单ID，叶子判断只考虑角色范围内的子节点
+    role_menu_ids = select(role_menus.c.menu_id).where(role_menus.c.role_id == role_id)
 
-    # 主查询
+    # 主查询：角色菜单中不存在(角色内)子节点的叶子菜单，NOT EXISTS 走 parent_id 索引
     stmt = (
         select(Menu.menu_id)
-        .outerjoin(role_menus, Menu.menu_id == role_menus.c.menu_id)
-        .where(and_(role_menus.c.role_id == role_id, Menu.menu_id.not_in(subquery)))
+        .join(role_menus, Menu.menu_id == role_menus.c.menu_id)
+        .where(role_menus.c.role_id == role_id, leaf_condition(role_menu_ids))
         .order_by(Menu.parent_id, Menu.order)
     )
 
@@ -122,18 +124,24 @@ async def add_role(
     role_in: RoleCreate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("角色管理")),
 ):
     """
-    创建角色，并自动记录创建人
+    创建角色，并自动记录创建人；编码、名称的唯一性由数据库约束保证
     """
-    # 检查编码唯一性
-    check = await db.execute(select(Role).where(Role.role_code == role_in.role_code))
-    if check.scalars().first():
-        raise HTTPException(status_code=400, detail="角色编码已存在")
-
-    new_role = Role(**role_in.model_dump(), create_by=current_user.user_name)
-    db.add(new_role)
+    values = {**role_in.model_dump(), "create_by": current_user.user_name}
+    try:
+        new_role = await role_crud.create_unique(db, values, ("role_code", "role_name"))
+    except UniqueViolationError as exc:
+        raise HTTPException(status_code=400, detail=ROLE_CONFLICTS[exc.field]) from None
     await db.commit()
+    await bump_version("role")
+    await oper_log.record(
+        "add",
+        target=new_role.role_id,
+        detail=role_in.model_dump(),
+        oper_name=current_user.user_name,
+    )
     return ResponseModel.success(msg="角色创建成功")
 
 
@@ -143,11 +151,12 @@ async def update_role(
     role_in: RoleUpdate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("角色管理")),
 ):
     """
     根据 ID 更新角色基本信息，并自动更新修改人
     """
-    role = await db.get(Role, role_id)
+    role = await role_crud.get(db, role_id, profile="brief")
     if not role:
         raise HTTPException(status_code=404, detail="角色不存在")
 
@@ -157,6 +166,10 @@ async def update_role(
 
     role.update_by = current_user.user_name
     await db.commit()
+    await bump_version("role")
+    await oper_log.record(
+        "update", target=role_id, detail=update_data, oper_name=current_user.user_name
+    )
     return ResponseModel.success(msg="角色更新成功")
 
 
@@ -166,34 +179,49 @@ async def update_role_menu(
     ids: list[int] = Body(...),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("角色管理")),
 ):
     """
     根据 ID 更新角色 菜单权限，并自动更新修改人
     """
-    role = await db.get(Role, role_id)
+    # 替换菜单关联需要加载原有菜单，使用默认方案
+    role = await role_crud.get(db, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="角色不存在")
 
     if ids:
-        menu_result = await db.execute(select(Menu).where(Menu.menu_id.in_(ids)))
-        role.menus = menu_result.scalars().all()
+        role.menus = await menu_crud.get_many(db, ids)
 
     role.update_by = current_user.user_name
     await db.commit()
+    await bump_version("role")
+    await oper_log.record(
+        "grant",
+        target=role_id,
+        detail={"menu_ids": ids},
+        oper_name=current_user.user_name,
+    )
     return ResponseModel.success(msg="角色更新成功")
 
 
 @router.delete("/{role_id}", summary="删除指定角色")
-async def delete_role(role_id: int, db: AsyncSession = Depends(get_db)):
+async def delete_role(
+    role_id: int,
+    db: AsyncSession = Depends(get_db),
+    _current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("角色管理")),
+):
     """
     物理删除角色。注意：在有用户关联此角色时应谨慎操作
     """
-    role = await db.get(Role, role_id)
+    role = await role_crud.get(db, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="角色不存在")
 
     await db.delete(role)
     await db.commit()
+    await bump_version("role")
+    await oper_log.record("delete", target=role_id)
     return ResponseModel.success(msg="角色删除成功")
 
 
@@ -202,22 +230,20 @@ async def batch_delete_roles(
     ids: list[int] = Body(...),
     db: AsyncSession = Depends(get_db),
     _current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("角色管理")),
 ):
     # 过滤掉 超级管理员 权限，防止误删
-    check_stmt = select(Role.role_id).where(
-        and_(Role.role_id.in_(ids), Role.role_code == "R_SUPER")
-    )
-    admin_result = await db.execute(check_stmt)
-    if admin_result.scalars().first():
+    if await role_crud.exists_by(db, "role_code", "R_SUPER", Role.role_id.in_(ids)):
         raise HTTPException(
             status_code=400, detail="所选列表中包含系统管理员角色，禁止批量删除"
         )
 
-    stmt = delete(Role).where(Role.role_id.in_(ids))
-    result = await db.execute(stmt)
+    count = await role_crud.delete_many(db, ids)
 
     await db.commit()
-    return ResponseModel.success(msg=f"成功删除 {result.rowcount} 条数据")
+    await bump_version("role")
+    await oper_log.record("delete", target=ids)
+    return ResponseModel.success(msg=f"成功删除 {count} 条数据")
 
 
 @router.get("/{role_id}", response_model=ResponseModel[RoleOut], summary="获取角色详情")
@@ -225,7 +251,7 @@ async def get_role_detail(role_id: int, db: AsyncSession = Depends(get_db)):
     """
     根据 ID 获取单个角色的完整信息
     """
-    role = await db.get(Role, role_id)
+    role = await role_crud.get(db, role_id, profile="brief")
     if not role:
         raise HTTPException(status_code=404, detail="角色不存在")
     return ResponseModel.success(data=role)
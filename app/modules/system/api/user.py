@@ -1,15 +1,31 @@
-from fastapi import APIRouter, Body, Depends, HTTPException
-from sqlalchemy import and_, delete, func, select
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.core.auth import get_current_user
+from app.core.auth import check_permissions, get_current_user
 from app.core.base_response import PageResult, ResponseModel
+from app.core.invalidation import bump_version
 from app.core.security import get_password_hash
+from app.db.base import user_roles
+from app.db.crud_base import UniqueViolationError
 from app.db.session import get_db
+from app.modules.auth.revocation import token_revocations
+from app.modules.auth.sessions import session_tracker
+from app.modules.system.crud.crud_oper_log import OperLogRecorder, oper_logger
+from app.modules.system.crud.crud_role import role_crud
+from app.modules.system.crud.crud_user import (
+    batch_create_users,
+    user_crud,
+    user_filters,
+)
+from app.modules.system.jobs import export_users
 from app.modules.system.models.role import Role
 from app.modules.system.models.user import User
+from app.modules.system.schemas.job import JobCreatedOut
 from app.modules.system.schemas.user import (
+    OnlineUserOut,
+    OnlineUserQuery,
+    UserBatchCreateOut,
     UserCreate,
     UserItemOut,
     UserQuery,
@@ -18,6 +34,8 @@ from app.modules.system.schemas.user import (
 
 router = APIRouter()
 
+MAX_BATCH_CREATE = 1000  # 单次批量创建的最大用户数
+
 
 @router.get(
     "/list",
@@ -29,37 +47,17 @@ async def get_user_list(
     db: AsyncSession = Depends(get_db),
     _current_user: User = Depends(get_current_user),
 ):
-    # 构建查询条件
-    filters = []
-    if query.user_name:
-        filters.append(User.user_name.contains(query.user_name))
-    if query.nickname:
-        filters.append(User.nickname.contains(query.nickname))
-    if query.user_gender:
-        filters.append(User.user_gender.contains(query.user_gender))
-    if query.user_phone:
-        filters.append(User.user_phone.contains(query.user_phone))
-    if query.user_email:
-        filters.append(User.user_email.contains(query.user_email))
-    if query.status:
-        filters.append(User.status == query.status)
-
-    # 查询总数
-    count_stmt = select(func.count()).select_from(User).where(and_(*filters))
-    total = (await db.execute(count_stmt)).scalar() or 0
-
-    # 分页查询数据
-    # 使用 selectinload 预加载角色信息
-    stmt = (
-        select(User)
-        .where(and_(*filters))
-        .offset((query.current - 1) * query.size)
-        .limit(query.size)
-        .options(selectinload(User.roles))
-        .order_by(User.create_time.desc())
+    filters = user_filters(query)
+
+    # 分页查询，预加载角色 (不含角色菜单)
+    total, users = await user_crud.paginate(
+        db,
+        *filters,
+        current=query.current,
+        size=query.size,
+        order_by=(User.create_time.desc(),),
+        profile="roles",
     )
-    result = await db.execute(stmt)
-    users = result.scalars().all()
 
     # 转换为 Schema 对象 (处理角色简化)
     user_list = []
@@ -75,38 +73,137 @@ async def get_user_list(
     return ResponseModel.success(data=page_data)
 
 
-@router.post("/add", summary="创建用户")
-async def add_user(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
-    # 检查唯一性
-    result = await db.execute(select(User).where(User.user_name == user_in.user_name))
-    if result.scalars().first():
-        raise HTTPException(status_code=400, detail="用户名已存在")
+@router.get(
+    "/online",
+    response_model=ResponseModel[PageResult[OnlineUserOut]],
+    dependencies=[Depends(check_permissions("sys:user:online"))],
+    summary="获取在线用户分页",
+)
+async def get_online_users(query: OnlineUserQuery = Depends()):
+    """
+    按最近活跃时间倒序列出在线会话，数据全部来自 Redis
+    """
+    total, sessions = await session_tracker.list_online(query.current, query.size)
+    page_data = PageResult(
+        records=[OnlineUserOut.model_validate(s) for s in sessions],
+        total=total,
+        current=query.current,
+        size=query.size,
+    )
+    return ResponseModel.success(data=page_data)
 
-    # 准备用户数据
-    obj_data = user_in.model_dump(exclude={"roles", "password"})
-    new_user = User(**obj_data)
-    new_user.hashed_password = get_password_hash(user_in.password)
 
-    # 分配角色
+@router.get(
+    "/active-stats",
+    dependencies=[Depends(check_permissions("sys:user:online"))],
+    summary="获取在线人数与日活统计",
+)
+async def get_active_stats(days: int = Query(7, ge=1, le=90)):
+    return ResponseModel.success(data=await session_tracker.active_stats(days))
+
+
+@router.post(
+    "/export",
+    response_model=ResponseModel[JobCreatedOut],
+    dependencies=[Depends(check_permissions("sys:user:export"))],
+    summary="导出用户 (后台任务)",
+)
+async def export_user_list(
+    query: UserQuery = Depends(), current_user: User = Depends(get_current_user)
+):
+    """
+    按列表页的查询条件导出 CSV，立即返回任务 ID；
+    通过 /system/job/{jobId} 查询进度，完成后从 /system/job/{jobId}/file 下载
+    """
+    params = query.model_dump(exclude={"current", "size"}, exclude_none=True)
+    job_id = await export_users.enqueue(owner=current_user.user_id, **params)
+    return ResponseModel.success(data=JobCreatedOut(job_id=job_id))
+
+
+@router.post("/add", summary="创建用户")
+async def add_user(
+    user_in: UserCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("用户管理")),
+):
+    role_ids = []
     if user_in.roles:
-        role_result = await db.execute(
-            select(Role).where(Role.role_code.in_(user_in.roles))
+        rows = await role_crud.project(
+            db, ["role_id"], Role.role_code.in_(user_in.roles)
         )
-        new_user.roles = role_result.scalars().all()
+        role_ids = [row.role_id for row in rows]
 
-    db.add(new_user)
+    values = {
+        **user_in.model_dump(exclude={"roles", "password"}),
+        "hashed_password": get_password_hash(user_in.password),
+    }
+    # 唯一性由数据库约束保证，并发创建同名用户时只有一个成功
+    try:
+        new_user = await user_crud.create_unique(db, values, ("user_name",))
+    except UniqueViolationError:
+        raise HTTPException(status_code=400, detail="用户名已存在") from None
+
+    # 分配角色
+    if role_ids:
+        await db.execute(
+            insert(user_roles),
+            [{"user_id": new_user.user_id, "role_id": r} for r in role_ids],
+        )
     await db.commit()
+    await bump_version("user", members=[user_in.user_name])
+    await oper_log.record(
+        "add",
+        target=new_user.user_id,
+        detail=user_in.model_dump(exclude={"password"}),
+        oper_name=current_user.user_name,
+    )
     return ResponseModel.success(msg="创建成功")
 
 
+@router.post(
+    "/batch-add",
+    response_model=ResponseModel[UserBatchCreateOut],
+    dependencies=[Depends(check_permissions("sys:user:add"))],
+    summary="批量创建用户",
+)
+async def batch_add_users(
+    users_in: list[UserCreate] = Body(..., min_length=1, max_length=MAX_BATCH_CREATE),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("用户管理")),
+):
+    """
+    逐条返回创建结果；校验失败的用户跳过，其余在同一事务中写入
+    """
+    results = await batch_create_users(db, users_in)
+    created = [r.user_id for r in results if r.success]
+    if created:
+        await db.commit()
+        await bump_version("user", members=[r.user_name for r in results if r.success])
+        await oper_log.record(
+            "add",
+            target=created,
+            detail={"count": len(created)},
+            oper_name=current_user.user_name,
+        )
+    return ResponseModel.success(
+        data=UserBatchCreateOut(
+            succeeded=len(created), failed=len(results) - len(created), items=results
+        )
+    )
+
+
 @router.put("/{user_id}", summary="修改用户")
 async def update_user(
-    user_id: int, user_in: UserUpdate, db: AsyncSession = Depends(get_db)
+    user_id: int,
+    user_in: UserUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("用户管理")),
 ):
     # 查询用户（带角色预加载）
-    stmt = select(User).where(User.user_id == user_id).options(selectinload(User.roles))
-    result = await db.execute(stmt)
-    user = result.scalars().first()
+    user = await user_crud.get(db, user_id, profile="roles")
     if not user:
         raise HTTPException(status_code=404, detail="用户不存在")
 
@@ -117,18 +214,57 @@ async def update_user(
 
     # 更新角色关联
     if user_in.roles is not None:
-        role_result = await db.execute(
-            select(Role).where(Role.role_code.in_(user_in.roles))
+        user.roles = await role_crud.get_many_by(
+            db, "role_code", user_in.roles, profile="brief"
         )
-        user.roles = role_result.scalars().all()
 
     await db.commit()
+    # 修改用户名时新名称需加入用户名索引
+    renamed = [update_data["user_name"]] if "user_name" in update_data else []
+    await bump_version("user", members=renamed)
+    # 禁用账号后立即使其已签发的 token 失效
+    if update_data.get("status") == "2":
+        await token_revocations.revoke_user(user_id)
+        await session_tracker.end_user(user_id)
+    await oper_log.record(
+        "update",
+        target=user_id,
+        detail=user_in.model_dump(exclude={"password"}, exclude_unset=True),
+        oper_name=current_user.user_name,
+    )
     return ResponseModel.success(msg="更新成功")
 
 
+@router.post(
+    "/{user_id}/kick",
+    dependencies=[Depends(check_permissions("sys:user:kick"))],
+    summary="强制下线",
+)
+async def kick_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("用户管理")),
+):
+    """
+    吊销用户此前签发的全部 token，用户需重新登录
+    """
+    if not await user_crud.exists_by(db, "user_id", user_id):
+        raise HTTPException(status_code=404, detail="用户不存在")
+    await token_revocations.revoke_user(user_id)
+    await session_tracker.end_user(user_id)
+    await oper_log.record("kick", target=user_id, oper_name=current_user.user_name)
+    return ResponseModel.success(msg="已强制下线")
+
+
 @router.delete("/{user_id}", summary="删除用户")
-async def delete_user(user_id: int, db: AsyncSession = Depends(get_db)):
-    user = await db.get(User, user_id)
+async def delete_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("用户管理")),
+):
+    user = await user_crud.get(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="用户不存在")
     if user.user_name == "admin":
@@ -136,6 +272,13 @@ async def delete_user(user_id: int, db: AsyncSession = Depends(get_db)):
 
     await db.delete(user)
     await db.commit()
+    await bump_version("user")
+    await oper_log.record(
+        "delete",
+        target=user_id,
+        detail={"user_name": user.user_name},
+        oper_name=current_user.user_name,
+    )
     return ResponseModel.success(msg="删除成功")
 
 
@@ -144,6 +287,7 @@ async def batch_delete_users(
     ids: list[int] = Body(...),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    oper_log: OperLogRecorder = Depends(oper_logger("用户管理")),
 ):
     """
     批量删除用户，自动跳过超级管理员
@@ -153,11 +297,7 @@ async def batch_delete_users(
 
     # 过滤掉 admin 账号，防止误删
     # 先查询这些 ID 中是否包含 admin
-    check_stmt = select(User.user_id).where(
-        and_(User.user_id.in_(ids), User.user_name == "admin")
-    )
-    admin_result = await db.execute(check_stmt)
-    if admin_result.scalars().first():
+    if await user_crud.exists_by(db, "user_name", "admin", User.user_id.in_(ids)):
         raise HTTPException(
             status_code=400, detail="所选列表中包含系统管理员，禁止批量删除"
         )
@@ -168,10 +308,11 @@ async def batch_delete_users(
 
     # 执行批量删除
     # 使用 sqlalchemy 的 delete 语句更高效
-    stmt = delete(User).where(User.user_id.in_(ids))
-    result = await db.execute(stmt)
+    count = await user_crud.delete_many(db, ids)
 
     # 提交事务
     await db.commit()
+    await bump_version("user")
+    await oper_log.record("delete", target=ids, oper_name=current_user.user_name)
 
-    return ResponseModel.success(msg=f"成功删除 {result.rowcount} 个用户")
+    return ResponseModel.success(msg=f"成功删除 {count} 个用户")
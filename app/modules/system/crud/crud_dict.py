@@ -0,0 +1,60 @@
+"""
+字典项读取缓存
+
+全部启用的字典项在进程内保存一份快照，与 dict 命名空间版本号绑定；
+字典写操作 bump_version("dict") 后，各 worker 在下次读取时重新加载。
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.invalidation import get_version
+from app.modules.system.models.dict import DictData, DictType
+from app.modules.system.schemas.dict import DictOption
+
+NAMESPACE = "dict"
+
+
+async def load_dict_options(db: AsyncSession) -> dict[str, list[DictOption]]:
+    """一次查询加载全部启用的字典项，按类型分组"""
+    stmt = (
+        select(
+            DictData.dict_type,
+            DictData.dict_label,
+            DictData.dict_value,
+            DictData.tag_type,
+        )
+        .join(DictType, DictType.dict_type == DictData.dict_type)
+        .where(DictType.status == "1", DictData.status == "1")
+        .order_by(DictData.dict_type, DictData.sort, DictData.data_id)
+    )
+    options: dict[str, list[DictOption]] = {}
+    for dict_type, label, value, tag_type in await db.execute(stmt):
+        options.setdefault(dict_type, []).append(
+            DictOption(label=label, value=value, tag_type=tag_type)
+        )
+    return options
+
+
+class DictCache:
+    def __init__(self):
+        self._version: int | None = None
+        self._options: dict[str, list[DictOption]] = {}
+
+    async def get_many(
+        self, db: AsyncSession, dict_types: tuple[str, ...]
+    ) -> dict[str, list[DictOption]]:
+        """批量获取字典项，不存在或已禁用的类型返回空列表"""
+        # 先取版本号再加载：加载期间的写操作会使快照在下次读取时重新加载
+        version = get_version(NAMESPACE)
+        if version != self._version:
+            self._options = await load_dict_options(db)
+            self._version = version
+        return {t: self._options.get(t, []) for t in dict_types}
+
+    def clear(self) -> None:
+        self._version = None
+        self._options = {}
+
+
+dict_cache = DictCache()
@@ -0,0 +1,139 @@
+"""
+菜单层级(物化路径)维护与查询
+
+tree_path 形如 /根ID/父ID/自身ID/，tree_depth 为祖先数量。
+子树查询使用 tree_path 前缀匹配，祖先直接从 tree_path 解析，均无需递归扫描。
+"""
+
+from fastapi import HTTPException
+from sqlalchemy import and_, delete, exists, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.id_generator import next_id
+from app.db.base import role_menus
+from app.db.crud_base import CRUDBase
+from app.modules.system.models.menu import Menu
+
+menu_crud = CRUDBase(Menu)
+
+
+def build_tree_path(parent: Menu | None, menu_id: int) -> tuple[str, int]:
+    """根据父节点计算 (tree_path, tree_depth)；无父节点时作为根节点"""
+    if parent is None:
+        return f"/{menu_id}/", 0
+    return f"{parent.tree_path}{menu_id}/", parent.tree_depth + 1
+
+
+async def assign_tree_path(db: AsyncSession, menu: Menu) -> None:
+    """为新菜单写入层级路径 (flush 前调用)"""
+    if menu.menu_id is None:
+        menu.menu_id = next_id()
+    parent = await menu_crud.get(db, menu.parent_id) if menu.parent_id else None
+    menu.tree_path, menu.tree_depth = build_tree_path(parent, menu.menu_id)
+
+
+async def move_subtree(db: AsyncSession, menu: Menu, new_parent_id: int | None) -> None:
+    """
+    移动菜单到新的父节点，并以一条 UPDATE 重写整棵子树的路径
+    """
+    parent = await menu_crud.get(db, new_parent_id) if new_parent_id else None
+    if parent is not None and parent.tree_path.startswith(menu.tree_path):
+        raise HTTPException(status_code=400, detail="不能将菜单移动到自身或其子菜单下")
+
+    old_path, old_depth = menu.tree_path, menu.tree_depth
+    new_path, new_depth = build_tree_path(parent, menu.menu_id)
+    menu.parent_id = new_parent_id
+    if new_path == old_path:
+        return
+
+    await db.execute(
+        update(Menu)
+        .where(Menu.tree_path.like(f"{old_path}%"))
+        .values(
+            tree_path=func.concat(
+                new_path, func.substr(Menu.tree_path, len(old_path) + 1)
+            ),
+            tree_depth=Menu.tree_depth + (new_depth - old_depth),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    menu.tree_path, menu.tree_depth = new_path, new_depth
+
+
+def subtree_condition(menu: Menu, include_self: bool = True):
+    """子树过滤条件 (走 tree_path 前缀索引)"""
+    condition = Menu.tree_path.like(f"{menu.tree_path}%")
+    if not include_self:
+        condition = and_(condition, Menu.menu_id != menu.menu_id)
+    return condition
+
+
+async def get_subtree_ids(
+    db: AsyncSession, menu: Menu, include_self: bool = True
+) -> list[int]:
+    """获取子树内全部菜单ID (含按钮)"""
+    result = await db.execute(
+        select(Menu.menu_id).where(subtree_condition(menu, include_self))
+    )
+    return list(result.scalars().all())
+
+
+def get_ancestor_ids(menu: Menu) -> list[int]:
+    """从根到父节点的祖先ID列表，直接解析路径，无需查询"""
+    return [int(i) for i in menu.tree_path.strip("/").split("/")[:-1]]
+
+
+async def has_children(db: AsyncSession, menu_id: int) -> bool:
+    """是否存在子节点 (走 parent_id 索引)"""
+    stmt = select(exists().where(Menu.parent_id == menu_id))
+    return bool((await db.execute(stmt)).scalar())
+
+
+def leaf_condition(scope=None):
+    """
+    叶子节点过滤条件：不存在以其为父节点的菜单
+    :param scope: 可选的菜单ID子查询，仅在该范围内判断子节点 (如某角色拥有的菜单)
+    """
+    child = aliased(Menu)
+    child_exists = exists().where(child.parent_id == Menu.menu_id)
+    if scope is not None:
+        child_exists = child_exists.where(child.menu_id.in_(scope))
+    return ~child_exists
+
+
+def subtree_cte(root_ids: list[int]):
+    """
+    递归 CTE：收集若干根节点及其全部后代 (含 F 按钮)
+    使用 UNION 去重，选中节点互为祖先或数据存在环时也能正常结束
+    """
+    tree = (
+        select(Menu.menu_id)
+        .where(Menu.menu_id.in_(root_ids))
+        .cte("menu_subtree", recursive=True)
+    )
+    child = aliased(Menu)
+    return tree.union(
+        select(child.menu_id).join(tree, child.parent_id == tree.c.menu_id)
+    )
+
+
+async def delete_subtrees(db: AsyncSession, root_ids: list[int]) -> int:
+    """
+    级联删除子树：先删角色关联再删菜单，均为基于 CTE 的集合操作
+    不负责提交事务，返回删除的菜单数量
+    """
+    tree = subtree_cte(root_ids)
+    subtree_ids = select(tree.c.menu_id)
+
+    await db.execute(
+        delete(role_menus)
+        .where(role_menus.c.menu_id.in_(subtree_ids))
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(
+        delete(Menu)
+        .where(Menu.menu_id.in_(subtree_ids))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -0,0 +1,100 @@
+"""
+操作日志记录
+
+用法:
+    @router.put("/{role_id}")
+    async def update_role(..., oper_log: OperLogRecorder = Depends(oper_logger("角色管理"))):
+        ...
+        await db.commit()
+        await oper_log.record("update", target=role_id, detail=update_data)
+
+记录只进入内存队列，由 oper_log_writer 在后台批量写入，不增加接口延迟。
+操作人姓名取自接口鉴权时加载的当前用户，接口需依赖 get_current_user (或 check_permissions)。
+"""
+
+import time
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from fastapi import Depends, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.security import OAuth2PasswordBearer
+
+from app.core.batch_writer import BatchWriter
+from app.core.config import settings
+from app.core.id_generator import next_id
+from app.core.rate_limit import client_ip
+from app.core.security import decode_access_token
+from app.db.session import engine
+from app.modules.system.models.oper_log import OperLog
+
+oper_log_writer = BatchWriter(
+    OperLog.__table__,
+    engine,
+    maxsize=settings.OPER_LOG_QUEUE_SIZE,
+    batch_size=settings.OPER_LOG_BATCH_SIZE,
+    flush_interval=settings.OPER_LOG_FLUSH_INTERVAL,
+    overflow=settings.OPER_LOG_OVERFLOW,
+)
+
+# 仅用于识别操作人，不强制登录 (鉴权仍由各接口自己的依赖负责)
+_optional_token = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
+
+
+class OperLogRecorder:
+    def __init__(self, request: Request, title: str, oper_user_id: int | None):
+        self.request = request
+        self.title = title
+        self.oper_user_id = oper_user_id
+        self._start = time.perf_counter()
+
+    async def record(
+        self,
+        business_type: str,
+        target: Any = None,
+        detail: Any = None,
+        oper_name: str | None = None,
+        status: str = "1",
+    ) -> bool:
+        """
+        记录一条操作日志，返回 False 表示队列已满被丢弃
+        未指定 oper_name 时取本次请求中 get_current_user 解析出的用户名
+        """
+        if oper_name is None:
+            user = getattr(self.request.state, "current_user", None)
+            if user is not None and user.user_id == self.oper_user_id:
+                oper_name = user.user_name
+        if isinstance(target, Iterable) and not isinstance(target, str):
+            target = ",".join(str(t) for t in target)
+        return await oper_log_writer.submit(
+            {
+                "oper_id": next_id(),
+                "title": self.title,
+                "business_type": business_type,
+                "request_method": self.request.method,
+                "request_url": self.request.url.path,
+                "oper_user_id": self.oper_user_id,
+                "oper_name": oper_name,
+                "oper_ip": client_ip(self.request),
+                "target_id": None if target is None else str(target)[:255],
+                "detail": jsonable_encoder(detail) if detail is not None else None,
+                "status": status,
+                "cost_time": int((time.perf_counter() - self._start) * 1000),
+                "oper_time": datetime.now(),
+            }
+        )
+
+
+def oper_logger(title: str):
+    """操作日志依赖工厂，title 为模块标题 (如 角色管理)"""
+
+    async def oper_log_dependency(
+        request: Request, token: str | None = Depends(_optional_token)
+    ) -> OperLogRecorder:
+        payload = decode_access_token(token) if token else None
+        sub = payload.get("sub") if payload else None
+        oper_user_id = int(sub) if sub and sub.isdigit() else None
+        return OperLogRecorder(request, title, oper_user_id)
+
+    return oper_log_dependency
@@ -0,0 +1,13 @@
+from sqlalchemy.orm import noload
+
+from app.db.crud_base import CRUDBase
+from app.modules.system.models.role import Role
+
+role_crud = CRUDBase(
+    Role,
+    profiles={
+        # 不加载菜单 (列表、为用户分配角色)
+        # 注意：需要修改 role.menus 的场景必须使用默认方案，否则无法比对原有关联
+        "brief": (noload(Role.menus),),
+    },
+)
@@ -0,0 +1,136 @@
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, noload, selectinload
+
+from app.core.id_generator import next_ids
+from app.core.security import hash_passwords
+from app.db.base import user_roles
+from app.db.crud_base import CRUDBase
+from app.modules.system.crud.crud_role import role_crud
+from app.modules.system.models.role import Role
+from app.modules.system.models.user import User
+from app.modules.system.schemas.user import (
+    UserBatchItemResult,
+    UserCreate,
+    UserQuery,
+)
+
+# User.roles 与 Role.menus 默认都会级联加载，按接口需要裁剪
+user_crud = CRUDBase(
+    User,
+    profiles={
+        # 登录校验：只需账号字段，不加载角色
+        "login": (noload(User.roles),),
+        # 鉴权：角色及其菜单 (权限标识、动态路由)
+        "auth": (selectinload(User.roles).selectinload(Role.menus),),
+        # 列表与角色分配：角色不含菜单
+        "roles": (selectinload(User.roles).noload(Role.menus),),
+        # 存在性与名称校验
+        "brief": (
+            load_only(User.user_id, User.user_name, User.status),
+            noload(User.roles),
+        ),
+    },
+)
+
+
+def user_filters(query: UserQuery) -> list:
+    """用户列表与导出共用的查询条件"""
+    filters = []
+    if query.user_name:
+        filters.append(User.user_name.contains(query.user_name))
+    if query.nickname:
+        filters.append(User.nickname.contains(query.nickname))
+    if query.user_gender:
+        filters.append(User.user_gender.contains(query.user_gender))
+    if query.user_phone:
+        filters.append(User.user_phone.contains(query.user_phone))
+    if query.user_email:
+        filters.append(User.user_email.contains(query.user_email))
+    if query.status:
+        filters.append(User.status == query.status)
+    return filters
+
+
+async def batch_create_users(
+    db: AsyncSession, users_in: list[UserCreate]
+) -> list[UserBatchItemResult]:
+    """
+    批量创建用户，不负责提交事务，返回与输入一一对应的结果
+
+    用户名与角色编码各一次查询校验，密码在线程池中并行哈希，
+    用户与角色关联各一条多行 INSERT 写入
+    """
+    results = [
+        UserBatchItemResult(index=i, user_name=u.user_name, success=False)
+        for i, u in enumerate(users_in)
+    ]
+    first_index: dict[str, int] = {}
+    for i, u in enumerate(users_in):
+        if u.user_name in first_index:
+            results[i].msg = "批次内用户名重复"
+        else:
+            first_index[u.user_name] = i
+
+    rows = await user_crud.project(
+        db, ["user_name"], User.user_name.in_(list(first_index))
+    )
+    existing = {row.user_name for row in rows}
+    codes = {code for u in users_in for code in u.roles}
+    role_ids = {}
+    if codes:
+        rows = await role_crud.project(
+            db, ["role_code", "role_id"], Role.role_code.in_(codes)
+        )
+        role_ids = dict(rows)
+
+    pending = []
+    for i in first_index.values():
+        u = users_in[i]
+        missing = [code for code in u.roles if code not in role_ids]
+        if u.user_name in existing:
+            results[i].msg = "用户名已存在"
+        elif not u.password:
+            results[i].msg = "密码不能为空"
+        elif missing:
+            results[i].msg = f"角色不存在: {', '.join(missing)}"
+        else:
+            pending.append(i)
+    if not pending:
+        return results
+
+    hashes = await hash_passwords([users_in[i].password for i in pending])
+    values = [
+        {
+            **users_in[i].model_dump(exclude={"roles", "password"}),
+            "user_id": user_id,
+            "hashed_password": hashed,
+        }
+        for i, user_id, hashed in zip(
+            pending, next_ids(len(pending)), hashes, strict=True
+        )
+    ]
+    # 校验之后可能有并发请求创建了同名用户：冲突的行跳过，以 RETURNING 的结果为准
+    stmt = (
+        pg_insert(User)
+        .on_conflict_do_nothing(index_elements=[User.user_name])
+        .returning(User.user_name, User.user_id)
+    )
+    created = dict((await db.execute(stmt, values)).all())
+
+    links = []
+    for i in pending:
+        u = users_in[i]
+        user_id = created.get(u.user_name)
+        if user_id is None:
+            results[i].msg = "用户名已存在"
+            continue
+        results[i].success = True
+        results[i].user_id = str(user_id)
+        links.extend(
+            {"user_id": user_id, "role_id": role_ids[c]} for c in dict.fromkeys(u.roles)
+        )
+    if links:
+        await db.execute(insert(user_roles), links)
+    return results
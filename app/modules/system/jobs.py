@@ -0,0 +1,116 @@
+"""
+系统管理后台任务 (由 worker 进程执行，见 app/core/jobs.py)
+"""
+
+import csv
+import io
+from datetime import datetime
+
+from sqlalchemy import func, select, update
+
+from app.core.invalidation import bump_version
+from app.core.jobs import JobContext, job
+from app.db.session import AsyncSessionLocal
+from app.modules.system.crud.crud_menu import build_tree_path
+from app.modules.system.crud.crud_user import user_filters
+from app.modules.system.models.menu import Menu
+from app.modules.system.models.user import User
+from app.modules.system.schemas.user import UserQuery
+from app.utils.mask_util import mask_rows
+
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_COLUMNS = {
+    "user_id": "用户ID",
+    "user_name": "账号",
+    "nickname": "昵称",
+    "user_email": "邮箱",
+    "user_phone": "手机号",
+    "user_gender": "性别",
+    "status": "状态",
+    "create_time": "创建时间",
+    "last_login_time": "最近登录时间",
+}
+EXPORT_MASKS = {"user_email": "email", "user_phone": "phone"}
+
+
+@job("user.export", max_retries=1)
+async def export_users(ctx: JobContext, **params) -> dict:
+    """按列表页的查询条件导出用户 CSV (邮箱、手机号脱敏)"""
+    filters = user_filters(UserQuery(**params))
+    columns = [getattr(User, c) for c in EXPORT_COLUMNS]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS.values())
+
+    async with AsyncSessionLocal() as db:
+        total = await db.scalar(select(func.count()).select_from(User).where(*filters))
+        exported, last_id = 0, None
+        # 按主键游标分块读取，避免深分页与一次性加载全部用户
+        while True:
+            stmt = select(*columns).where(*filters)
+            if last_id is not None:
+                stmt = stmt.where(User.user_id > last_id)
+            stmt = stmt.order_by(User.user_id).limit(EXPORT_CHUNK_SIZE)
+            rows = [dict(row._mapping) for row in await db.execute(stmt)]
+            if not rows:
+                break
+            for row in mask_rows(rows, EXPORT_MASKS):
+                writer.writerow(_csv_value(row[c]) for c in EXPORT_COLUMNS)
+            exported += len(rows)
+            last_id = rows[-1]["user_id"]
+            await ctx.progress(exported * 100 / max(total, 1), f"{exported}/{total}")
+
+    filename = f"users_{datetime.now():%Y%m%d%H%M%S}.csv"
+    # 带 BOM，便于 Excel 正确识别中文
+    await ctx.save_file(filename, "\ufeff" + buffer.getvalue())
+    return {"filename": filename, "rows": exported}
+
+
+def _csv_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value)
+
+
+@job("menu.rebuild_tree")
+async def rebuild_menu_tree(ctx: JobContext) -> dict:
+    """按 parent_id 重新计算全部菜单的 tree_path / tree_depth，只更新有变化的行"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Menu.menu_id, Menu.parent_id, Menu.tree_path, Menu.tree_depth)
+        )
+        menus = {row.menu_id: row for row in result}
+        await ctx.progress(20, f"已读取 {len(menus)} 个菜单")
+
+        paths: dict[int, tuple[str, int]] = {}
+
+        def resolve(menu_id: int, seen: frozenset = frozenset()) -> tuple[str, int]:
+            if menu_id in paths:
+                return paths[menu_id]
+            parent_id = menus[menu_id].parent_id
+            # 父节点不存在或成环时作为根节点
+            if parent_id not in menus or parent_id in seen or parent_id == menu_id:
+                paths[menu_id] = build_tree_path(None, menu_id)
+            else:
+                parent_path, parent_depth = resolve(parent_id, seen | {menu_id})
+                paths[menu_id] = (f"{parent_path}{menu_id}/", parent_depth + 1)
+            return paths[menu_id]
+
+        changed = []
+        for menu_id, row in menus.items():
+            path, depth = resolve(menu_id)
+            if (path, depth) != (row.tree_path, row.tree_depth):
+                changed.append(
+                    {"menu_id": menu_id, "tree_path": path, "tree_depth": depth}
+                )
+
+        if changed:
+            # 按主键批量更新 (executemany)
+            await db.execute(update(Menu), changed)
+            await db.commit()
+            await bump_version("menu")
+
+    return {"total": len(menus), "updated": len(changed)}
@@ -1,5 +1,7 @@
+from .dict import DictData, DictType
 from .menu import Menu
+from .oper_log import OperLog
 from .role import Role
 from .user import User
 
-__all__ = ["User", "Role", "Menu"]
+__all__ = ["User", "Role", "Menu", "OperLog", "DictType", "DictData"]
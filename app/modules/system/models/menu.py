@@ -1,7 +1,16 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import JSON, BigInteger, Boolean, DateTime, Integer, String, func
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.id_generator import next_id
@@ -13,12 +22,22 @@ if TYPE_CHECKING:
 
 class Menu(Base):
     __tablename__ = "sys_menu"
+    __table_args__ = (
+        # varchar_pattern_ops 使 LIKE '前缀%' 的子树查询可以走索引
+        Index(
+            "ix_sys_menu_tree_path",
+            "tree_path",
+            postgresql_ops={"tree_path": "varchar_pattern_ops"},
+        ),
+        # 启用菜单/页面列表: WHERE status = ? AND menu_type = ? ORDER BY order
+        Index("ix_sys_menu_status_type_order", "status", "menu_type", "order"),
+    )
 
     menu_id: Mapped[int] = mapped_column(
         BigInteger, primary_key=True, default=next_id, comment="菜单ID"
     )
     parent_id: Mapped[int] = mapped_column(
-        BigInteger, nullable=True, comment="父菜单ID"
+        BigInteger, nullable=True, index=True, comment="父菜单ID"
     )
     menu_name: Mapped[str] = mapped_column(
         String(50), nullable=False, comment="菜单标题"
@@ -33,7 +52,7 @@ class Menu(Base):
     path: Mapped[str] = mapped_column(String(255), nullable=True, comment="路由路径")
     component: Mapped[str] = mapped_column(String(255), nullable=True, comment="组件")
     route_name: Mapped[str] = mapped_column(
-        String(50), nullable=True, comment="前端路由名称（name）"
+        String(50), nullable=True, index=True, comment="前端路由名称（name）"
     )
     route_path: Mapped[str] = mapped_column(
         String(255), nullable=True, comment="前端路由路径"
@@ -80,6 +99,18 @@ class Menu(Base):
 
     query: Mapped[list] = mapped_column(JSON, nullable=True, comment="路由参数")
 
+    # 物化路径：由 crud_menu 在新增/移动时维护，用于子树、祖先查询
+    tree_path: Mapped[str] = mapped_column(
+        String(1024), nullable=False, comment="层级路径: /根ID/.../自身ID/"
+    )
+    tree_depth: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="层级深度(根节点为0)",
+    )
+
     roles: Mapped[list["Role"]] = relationship(
         "Role", secondary=role_menus, back_populates="menus"
     )
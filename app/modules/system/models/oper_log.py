@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, BigInteger, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.id_generator import next_id
+from app.db.base import Base
+
+
+class OperLog(Base):
+    """操作日志 (由后台任务批量写入，见 crud_oper_log)"""
+
+    __tablename__ = "sys_oper_log"
+
+    oper_id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, default=next_id, comment="日志ID"
+    )
+    title: Mapped[str] = mapped_column(String(50), nullable=False, comment="模块标题")
+    business_type: Mapped[str] = mapped_column(
+        String(20), nullable=False, comment="操作类型: add/update/delete/..."
+    )
+    request_method: Mapped[str] = mapped_column(
+        String(10), nullable=True, comment="请求方式"
+    )
+    request_url: Mapped[str] = mapped_column(
+        String(255), nullable=True, comment="请求地址"
+    )
+    oper_user_id: Mapped[int] = mapped_column(
+        BigInteger, nullable=True, comment="操作人ID"
+    )
+    oper_name: Mapped[str] = mapped_column(String(50), nullable=True, comment="操作人")
+    oper_ip: Mapped[str] = mapped_column(String(64), nullable=True, comment="操作IP")
+    target_id: Mapped[str] = mapped_column(
+        String(255), nullable=True, comment="操作对象ID(批量时逗号分隔)"
+    )
+    detail: Mapped[dict] = mapped_column(JSON, nullable=True, comment="操作详情")
+    status: Mapped[str] = mapped_column(
+        String(2), default="1", comment="状态：1-成功，2-失败"
+    )
+    cost_time: Mapped[int] = mapped_column(Integer, nullable=True, comment="耗时(毫秒)")
+    oper_time: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, comment="操作时间"
+    )
+
+    __table_args__ = (
+        # 按时间倒序分页、按操作人查询
+        Index("ix_sys_oper_log_oper_time", "oper_time"),
+        Index("ix_sys_oper_log_oper_user_id", "oper_user_id", "oper_time"),
+    )
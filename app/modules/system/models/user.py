@@ -34,9 +34,16 @@ class User(Base):
     user_gender: Mapped[str] = mapped_column(
         String(1), nullable=True, comment="用户性别: 0:未知,1:男,2:女"
     )
+    # 由登录会话跟踪批量回写，不保证实时
+    last_login_time: Mapped[datetime] = mapped_column(
+        DateTime, nullable=True, comment="最近登录时间"
+    )
+    last_login_ip: Mapped[str] = mapped_column(
+        String(64), nullable=True, comment="最近登录IP"
+    )
 
     create_time: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), comment="创建时间"
+        DateTime, server_default=func.now(), index=True, comment="创建时间"
     )
     update_time: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), onupdate=func.now(), comment="更新时间"
@@ -0,0 +1,111 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
+from pydantic.alias_generators import to_camel
+
+
+class DictTypeBase(BaseModel):
+    dict_name: str = Field(..., max_length=100, description="字典名称")
+    dict_type: str = Field(
+        ..., max_length=100, pattern=r"^[a-z][a-z0-9_]*$", description="字典类型编码"
+    )
+    status: str = "1"  # "1"-启用, "2"-禁用
+    remark: str | None = Field(None, max_length=255)
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class DictTypeCreate(DictTypeBase):
+    pass
+
+
+class DictTypeUpdate(BaseModel):
+    dict_name: str | None = Field(None, max_length=100)
+    dict_type: str | None = Field(None, max_length=100, pattern=r"^[a-z][a-z0-9_]*$")
+    status: str | None = None
+    remark: str | None = Field(None, max_length=255)
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class DictTypeOut(DictTypeBase):
+    dict_id: int
+    create_time: datetime
+
+    @field_serializer("dict_id")
+    def serialize_id(self, dict_id: int, _info):
+        return str(dict_id)
+
+    model_config = ConfigDict(
+        from_attributes=True, alias_generator=to_camel, populate_by_name=True
+    )
+
+
+class DictTypeQuery(BaseModel):
+    current: int = 1
+    size: int = 10
+    dict_name: str | None = None
+    dict_type: str | None = None
+    status: str | None = None
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class DictDataBase(BaseModel):
+    dict_type: str = Field(..., max_length=100, description="字典类型编码")
+    dict_label: str = Field(..., max_length=100, description="字典标签")
+    dict_value: str = Field(..., max_length=100, description="字典键值")
+    sort: int = 0
+    tag_type: str | None = Field(None, max_length=20, description="标签样式")
+    status: str = "1"
+    remark: str | None = Field(None, max_length=255)
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class DictDataCreate(DictDataBase):
+    pass
+
+
+class DictDataUpdate(BaseModel):
+    dict_label: str | None = Field(None, max_length=100)
+    dict_value: str | None = Field(None, max_length=100)
+    sort: int | None = None
+    tag_type: str | None = Field(None, max_length=20)
+    status: str | None = None
+    remark: str | None = Field(None, max_length=255)
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class DictDataOut(DictDataBase):
+    data_id: int
+    create_time: datetime
+
+    @field_serializer("data_id")
+    def serialize_id(self, data_id: int, _info):
+        return str(data_id)
+
+    model_config = ConfigDict(
+        from_attributes=True, alias_generator=to_camel, populate_by_name=True
+    )
+
+
+class DictDataQuery(BaseModel):
+    current: int = 1
+    size: int = 10
+    dict_type: str | None = None
+    dict_label: str | None = None
+    status: str | None = None
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class DictOption(BaseModel):
+    """前端下拉、标签渲染使用的字典项"""
+
+    label: str
+    value: str
+    tag_type: str | None = None
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, field_serializer
+from pydantic.alias_generators import to_camel
+
+
+class JobCreatedOut(BaseModel):
+    """入队结果"""
+
+    job_id: str
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class JobOut(BaseModel):
+    """后台任务状态"""
+
+    job_id: str
+    name: str
+    status: str  # queued / running / retrying / succeeded / failed
+    progress: float = 0
+    message: str | None = None
+    attempts: int = 0
+    result: Any = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    @field_serializer("created_at", "started_at", "finished_at")
+    def serialize_time(self, dt: datetime | None) -> str | None:
+        return dt.strftime("%Y-%m-%d %H:%M:%S") if dt else None
@@ -1,9 +1,10 @@
 from datetime import datetime
+from typing import Annotated
 
 from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_validator
 from pydantic.alias_generators import to_camel
 
-from app.utils.mask_util import MaskUtil
+from app.utils.mask_util import Mask
 
 
 class UserBase(BaseModel):
@@ -22,6 +23,24 @@ class UserCreate(UserBase):
     password: str | None = Field(..., min_length=6, description="明文密码")
 
 
+class UserBatchItemResult(BaseModel):
+    """批量创建中单个用户的结果"""
+
+    index: int  # 在请求列表中的位置
+    user_name: str
+    success: bool
+    user_id: str | None = None
+    msg: str | None = None
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class UserBatchCreateOut(BaseModel):
+    succeeded: int
+    failed: int
+    items: list[UserBatchItemResult]
+
+
 class UserUpdate(UserBase):
     password: str | None = Field(..., description="明文密码")
 
@@ -67,11 +86,13 @@ class UserItemOut(BaseModel):
     user_id: int
     user_name: str
     nickname: str | None = None
-    user_email: str | None = None
-    user_phone: str | None = None
+    user_email: Annotated[str | None, Mask("email")] = None
+    user_phone: Annotated[str | None, Mask("phone")] = None
     user_gender: str | None = None
     status: str | None = None
     create_time: datetime
+    last_login_time: datetime | None = None
+    last_login_ip: str | None = None
     # 可以在此扩展角色信息
     roles: list[str] = []
 
@@ -84,17 +105,9 @@ class UserItemOut(BaseModel):
     def serialize_id(self, user_id: int, _info):
         return str(user_id)
 
-    @field_serializer("user_phone")
-    def serialize_phone(self, v: str) -> str:
-        return MaskUtil.phone(v)
-
-    @field_serializer("user_email")
-    def serialize_email(self, v: str) -> str:
-        return MaskUtil.email(v)
-
-    @field_serializer("create_time")
-    def serialize_create_time(self, dt: datetime) -> str:
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
+    @field_serializer("create_time", "last_login_time")
+    def serialize_time(self, dt: datetime | None) -> str | None:
+        return dt.strftime("%Y-%m-%d %H:%M:%S") if dt else None
 
     @field_validator("roles", mode="before")
     @classmethod
@@ -103,3 +116,29 @@ class UserItemOut(BaseModel):
         if v and not isinstance(v[0], str):
             return [r.role_name for r in v]
         return v
+
+
+class OnlineUserQuery(BaseModel):
+    """在线用户查询参数"""
+
+    current: int = Field(1, ge=1)
+    size: int = Field(10, ge=1, le=100)
+
+
+class OnlineUserOut(BaseModel):
+    """在线会话"""
+
+    token_id: str
+    user_id: str
+    user_name: str
+    nickname: str | None = None
+    ip: str | None = None
+    user_agent: str | None = None
+    login_time: datetime
+    last_active_time: datetime
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    @field_serializer("login_time", "last_active_time")
+    def serialize_time(self, dt: datetime) -> str:
+        return dt.strftime("%Y-%m-%d %H:%M:%S")
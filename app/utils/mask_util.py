@@ -1,6 +1,33 @@
+"""
+敏感数据脱敏
+
+- MaskUtil: 单值脱敏，适用于 API 响应、日志打印等场景
+- Mask: 在 schema 字段上声明脱敏策略，序列化时自动生效
+    user_phone: Annotated[str | None, Mask("phone")] = None
+- mask_column / mask_rows: 导出、列表页的批量脱敏，按列一次取出处理函数
+"""
+
 import re
+from collections.abc import Callable, Iterable
 from typing import Any
 
+from pydantic import PlainSerializer
+
+# 预编译的正则仅在快速路径不适用时使用
+_NON_DIGIT = re.compile(r"\D")
+# 手机号、银行卡常见的分隔符，先用 translate 删除，通常即可得到纯数字
+_SEPARATORS = str.maketrans("", "", " -+()")
+
+
+def _digits(value: Any) -> str:
+    s = str(value)
+    if s.isdigit():
+        return s
+    s = s.translate(_SEPARATORS)
+    if s.isdigit():
+        return s
+    return _NON_DIGIT.sub("", s)
+
 
 class MaskUtil:
     """
@@ -13,7 +40,7 @@ class MaskUtil:
         """手机号脱敏：13812345678 → 138****5678"""
         if not value:
             return ""
-        clean = re.sub(r"\D", "", str(value))
+        clean = _digits(value)
         if len(clean) == 11:
             return f"{clean[:3]}****{clean[7:]}"
         return clean
@@ -21,11 +48,13 @@ class MaskUtil:
     @staticmethod
     def email(value: str | None) -> str:
         """邮箱脱敏：abc@example.com → a**c@example.com"""
-        if not value or "@" not in str(value):
+        if not value:
+            return ""
+        local, at, domain = str(value).rpartition("@")
+        if not at:
             return ""
-        local, domain = str(value).rsplit("@", 1)
         if len(local) <= 2:
-            masked_local = local[0] + "*" * (len(local) - 1)
+            masked_local = local[:1] + "*" * (len(local) - 1)
         else:
             masked_local = local[0] + "**" + local[-1]
         return f"{masked_local}@{domain}"
@@ -35,7 +64,7 @@ class MaskUtil:
         """身份证脱敏：110101199003071234 → 110101********1234"""
         if not value:
             return ""
-        clean = re.sub(r"\s+", "", str(value))
+        clean = "".join(str(value).split())
         if len(clean) == 18:
             return f"{clean[:6]}********{clean[14:]}"
         return clean
@@ -45,11 +74,11 @@ class MaskUtil:
         """银行卡脱敏：6222081234567890123 → **** **** **** 0123"""
         if not value:
             return ""
-        clean = re.sub(r"\D", "", str(value))
+        clean = _digits(value)
         if len(clean) >= 4:
-            groups = [clean[i : i + 4] for i in range(0, len(clean), 4)]
-            masked_groups = ["****"] * (len(groups) - 1) + [groups[-1]]
-            return " ".join(masked_groups)
+            # 末组为最后 1-4 位，其余每 4 位一组全部遮盖
+            tail_len = len(clean) % 4 or 4
+            return "**** " * ((len(clean) - tail_len) // 4) + clean[-tail_len:]
         return clean
 
     @staticmethod
@@ -95,3 +124,38 @@ class MaskUtil:
             return mask_char * total
         masked_len = total - keep_head - keep_tail
         return s[:keep_head] + mask_char * masked_len + s[-keep_tail:]
+
+
+MASKERS: dict[str, Callable[[Any], str]] = {
+    "phone": MaskUtil.phone,
+    "email": MaskUtil.email,
+    "id_card": MaskUtil.id_card,
+    "bank_card": MaskUtil.bank_card,
+    "name": MaskUtil.name,
+    "address": MaskUtil.address,
+    "generic": MaskUtil.generic,
+}
+
+
+def Mask(kind: str) -> PlainSerializer:  # noqa: N802
+    """字段脱敏声明，kind 为 MASKERS 中的策略名"""
+    return PlainSerializer(MASKERS[kind], return_type=str)
+
+
+def mask_column(values: Iterable[Any], kind: str) -> list[str]:
+    """对一列值批量脱敏"""
+    masker = MASKERS[kind]
+    return [masker(v) for v in values]
+
+
+def mask_rows(rows: list[dict[str, Any]], policies: dict[str, str]) -> list[dict]:
+    """
+    按列批量脱敏字典行 (原地修改并返回)，用于导出
+    :param policies: {字段名: 策略名}
+    """
+    for field, kind in policies.items():
+        masker = MASKERS[kind]
+        for row in rows:
+            if field in row:
+                row[field] = masker(row[field])
+    return rows
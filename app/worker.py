@@ -0,0 +1,52 @@
+"""
+后台任务 worker
+
+用法: python -m app.worker [--concurrency 4]
+与 API 进程分开部署，可按队列积压情况独立扩容；收到 SIGTERM/SIGINT 后
+不再拉取新任务，等待执行中的任务完成 (最多 JOB_SHUTDOWN_TIMEOUT 秒) 后退出。
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.core.config import settings
+from app.core.id_generator import worker_lease
+from app.core.jobs import Worker
+from app.core.redis import close_redis, init_redis, redis_client
+from app.db.session import engine
+
+# 导入以注册任务
+from app.modules.system import jobs  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+async def run(concurrency: int) -> None:
+    await init_redis()
+    await worker_lease.start(redis_client)
+    worker = Worker(concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        await worker_lease.stop()
+        await close_redis()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="hohu-admin 后台任务 worker")
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# ruff: noqa: T201
+
+"""
+冷启动基准测试
+
+用法: python scripts/bench_startup.py [--runs 5] [--top 15] [--lifespan]
+- 使用 python -X importtime 统计导入 app.main 的耗时，并按顶层包汇总
+- 在全新进程中测量从解释器启动到首个响应返回的时间 (time-to-first-response)
+  默认不执行 lifespan；加 --lifespan 时包含 Redis/数据库检查与预热，需要可用的依赖
+- 导入时读取 .env 并校验 Settings 约 5ms，连接池、限流阈值等模块级对象都依赖配置，
+  因此未做延迟；耗时主要来自 pydantic_settings 的导入，已计入 importtime 统计
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+FIRST_RESPONSE_SNIPPET = """
+import asyncio
+import contextlib
+import sys
+
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+
+
+async def main(path, lifespan):
+    ctx = app.router.lifespan_context(app) if lifespan else contextlib.nullcontext()
+    async with ctx:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://bench"
+        ) as client:
+            response = await client.get(path)
+    print(response.status_code)
+
+
+asyncio.run(main(sys.argv[1], sys.argv[2] == "1"))
+"""
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """解析 -X importtime 输出为 (模块名, 自身耗时us, 累计耗时us)"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure_import(module: str) -> tuple[float, dict[str, float]]:
+    """返回 (模块累计导入秒数, 按顶层包汇总的自身耗时秒数)"""
+    result = run_python("-X", "importtime", "-c", f"import {module}")
+    rows = parse_importtime(result.stderr)
+    total = next(cum for name, _, cum in rows if name == module) / 1e6
+    by_package: dict[str, float] = defaultdict(float)
+    for name, self_us, _ in rows:
+        by_package[name.split(".")[0]] += self_us / 1e6
+    return total, by_package
+
+
+def measure_first_response(path: str, lifespan: bool) -> float:
+    start = time.perf_counter()
+    run_python("-c", FIRST_RESPONSE_SNIPPET, path, "1" if lifespan else "0")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--lifespan", action="store_true")
+    args = parser.parse_args()
+
+    imports, packages = [], defaultdict(list)
+    for _ in range(args.runs):
+        total, by_package = measure_import(args.module)
+        imports.append(total)
+        for name, seconds in by_package.items():
+            packages[name].append(seconds)
+
+    print(f"import {args.module}: median {statistics.median(imports) * 1000:.1f} ms")
+    print(f"\n导入耗时最高的包 (自身耗时中位数, top {args.top}):")
+    ranked = sorted(
+        packages.items(), key=lambda item: statistics.median(item[1]), reverse=True
+    )
+    for name, samples in ranked[: args.top]:
+        print(f"  {name:<24} {statistics.median(samples) * 1000:8.1f} ms")
+
+    ttfr = [measure_first_response(args.path, args.lifespan) for _ in range(args.runs)]
+    mode = "含 lifespan" if args.lifespan else "不含 lifespan"
+    print(
+        f"\ntime-to-first-response GET {args.path} ({mode}): "
+        f"median {statistics.median(ttfr) * 1000:.1f} ms, "
+        f"max {max(ttfr) * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 from app.core.id_generator import next_id
 from app.core.security import get_password_hash
+from app.modules.system.crud.crud_menu import build_tree_path
 from app.modules.system.models.menu import Menu
 from app.modules.system.models.role import Role
 from app.modules.system.models.user import User
@@ -108,6 +109,13 @@ init_menus = [
     ),
 ]
 
+# 计算初始菜单的层级路径 (父节点需排在子节点之前)
+menu_map = {m.menu_id: m for m in init_menus}
+for menu in init_menus:
+    menu.tree_path, menu.tree_depth = build_tree_path(
+        menu_map.get(menu.parent_id), menu.menu_id
+    )
+
 
 async def init_db():
     engine = create_async_engine(settings.DATABASE_URL)
@@ -0,0 +1,283 @@
+# ruff: noqa: T201
+
+"""
+压测脚本
+
+用法: python scripts/loadtest.py [--scenario session] [--concurrency 10] [--duration 30]
+      [--url http://127.0.0.1:8000] [--baseline scripts/loadtest_baseline.json]
+      [--threshold 0.15] [--save-baseline] [--output result.json]
+- 默认通过 httpx ASGITransport 在进程内驱动应用 (执行 lifespan，需要可用的数据库与 Redis)；
+  指定 --url 时压测本地启动的 uvicorn
+- 每个虚拟用户按场景顺序循环发送请求，前 --warmup 秒的请求不计入统计
+- 输出各接口及总计的吞吐、延迟分位数与错误率
+- 指定 --baseline 时与基线对比：吞吐下降或 p95/p99 上升超过阈值、错误率上升超过 1 个百分点
+  时以退出码 1 结束；基线只在相同机器、相同参数下可比，参数不一致时以退出码 2 结束
+- 登录接口有限流，进程内模式会调高限流阈值；压测 uvicorn 时需在其环境变量中设置
+  LOGIN_RATE_LIMIT_USER / LOGIN_RATE_LIMIT_IP
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient, Limits
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = ROOT / "scripts" / "loadtest_baseline.json"
+
+# 步骤名 -> (方法, 路径)
+STEPS = {
+    "login": ("POST", "/auth/login"),
+    "getUserInfo": ("GET", "/auth/getUserInfo"),
+    "getUserRoutes": ("GET", "/auth/getUserRoutes"),
+    "userList": ("GET", "/system/user/list?current=1&size=10"),
+    "roleList": ("GET", "/system/role/list?current=1&size=10"),
+    "menuList": ("GET", "/system/menu/list?current=1&size=10"),
+    "menuTree": ("GET", "/system/menu/tree"),
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    setup: tuple[str, ...]  # 每个虚拟用户开始时执行一次
+    loop: tuple[str, ...]  # 循环执行直至结束
+
+
+SCENARIOS = {
+    # 完整会话：每轮重新登录 (含密码哈希校验)
+    "session": Scenario(
+        (),
+        ("login", "getUserInfo", "getUserRoutes", "userList", "roleList", "menuList"),
+    ),
+    # 登录一次后反复浏览
+    "browse": Scenario(
+        ("login",),
+        ("getUserInfo", "getUserRoutes", "userList", "roleList", "menuList"),
+    ),
+    # 只压列表页
+    "lists": Scenario(("login",), ("userList", "roleList", "menuList", "menuTree")),
+}
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def record(self, step: str, seconds: float, ok: bool) -> None:
+        self.latencies[step].append(seconds * 1000)
+        if not ok:
+            self.errors[step] += 1
+
+    def summary(self, samples: list[float], errors: int, duration: float) -> dict:
+        count = len(samples)
+        result = {
+            "count": count,
+            "rps": round(count / duration, 2),
+            "error_rate": round(errors / count, 4) if count else 0.0,
+        }
+        if count >= 2:
+            cuts = statistics.quantiles(samples, n=100, method="inclusive")
+            result |= {
+                "p50_ms": round(cuts[49], 2),
+                "p90_ms": round(cuts[89], 2),
+                "p95_ms": round(cuts[94], 2),
+                "p99_ms": round(cuts[98], 2),
+                "max_ms": round(max(samples), 2),
+            }
+        return result
+
+    def report(self, duration: float) -> dict:
+        steps = {
+            step: self.summary(samples, self.errors[step], duration)
+            for step, samples in self.latencies.items()
+        }
+        every = [ms for samples in self.latencies.values() for ms in samples]
+        total = self.summary(every, sum(self.errors.values()), duration)
+        return {"steps": steps, "total": total}
+
+
+async def run_step(client: AsyncClient, step: str, state: dict) -> bool:
+    method, path = STEPS[step]
+    if step == "login":
+        response = await client.post(path, json=state["credentials"])
+        if response.status_code == 200:
+            token = response.json()["data"]["token"]
+            state["headers"] = {"Authorization": f"Bearer {token}"}
+    else:
+        response = await client.request(method, path, headers=state.get("headers"))
+    return response.status_code < 400
+
+
+async def virtual_user(
+    client: AsyncClient,
+    scenario: Scenario,
+    credentials: dict,
+    stats: Stats,
+    measure_from: float,
+    end: float,
+) -> None:
+    state = {"credentials": credentials}
+
+    async def timed(step: str) -> None:
+        start = time.perf_counter()
+        try:
+            ok = await run_step(client, step, state)
+        except Exception:
+            ok = False
+        if start >= measure_from:
+            stats.record(step, time.perf_counter() - start, ok)
+
+    for step in scenario.setup:
+        await timed(step)
+    while time.perf_counter() < end:
+        for step in scenario.loop:
+            if time.perf_counter() >= end:
+                break
+            await timed(step)
+
+
+@contextlib.asynccontextmanager
+async def open_client(url: str | None, concurrency: int):
+    if url:
+        limits = Limits(max_connections=concurrency)
+        async with AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+            yield client
+        return
+
+    from app.core.config import settings
+    from app.db.session import engine
+    from app.main import app
+
+    # SQL 回显与登录限流会主导压测结果，进程内模式下关闭
+    engine.echo = False
+    settings.LOGIN_RATE_LIMIT_USER = settings.LOGIN_RATE_LIMIT_IP = 10**9
+    async with app.router.lifespan_context(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(
+            transport=transport, base_url="http://loadtest", timeout=30
+        ) as client:
+            yield client
+
+
+async def run(args) -> dict:
+    scenario = SCENARIOS[args.scenario]
+    credentials = {"user_name": args.user, "password": args.password}
+    stats = Stats()
+    async with open_client(args.url, args.concurrency) as client:
+        now = time.perf_counter()
+        measure_from = now + args.warmup
+        end = measure_from + args.duration
+        await asyncio.gather(
+            *(
+                virtual_user(client, scenario, credentials, stats, measure_from, end)
+                for _ in range(args.concurrency)
+            )
+        )
+    return {
+        "scenario": args.scenario,
+        "target": args.url or "asgi",
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "python": platform.python_version(),
+        **stats.report(args.duration),
+    }
+
+
+def print_report(result: dict) -> None:
+    print(
+        f"场景 {result['scenario']}，目标 {result['target']}，"
+        f"并发 {result['concurrency']}，时长 {result['duration']}s"
+    )
+    header = f"{'step':<16}{'count':>8}{'rps':>10}{'err%':>8}"
+    header += "".join(f"{c:>10}" for c in ("p50", "p90", "p95", "p99", "max"))
+    print(header)
+    rows = [*result["steps"].items(), ("total", result["total"])]
+    for step, s in rows:
+        line = (
+            f"{step:<16}{s['count']:>8}{s['rps']:>10.1f}{s['error_rate'] * 100:>8.2f}"
+        )
+        for key in ("p50_ms", "p90_ms", "p95_ms", "p99_ms", "max_ms"):
+            line += f"{s[key]:>10.1f}" if key in s else f"{'-':>10}"
+        print(line)
+
+
+def compare(result: dict, baseline: dict, threshold: float) -> list[str]:
+    """返回超出阈值的退化项"""
+    current, base = result["total"], baseline["total"]
+    regressions = []
+    if current["rps"] < base["rps"] * (1 - threshold):
+        regressions.append(f"吞吐 {current['rps']} < 基线 {base['rps']}")
+    for key in ("p95_ms", "p99_ms"):
+        if key in base and current.get(key, 0) > base[key] * (1 + threshold):
+            regressions.append(f"{key} {current.get(key)} > 基线 {base[key]}")
+    if current["error_rate"] > base["error_rate"] + 0.01:
+        regressions.append(
+            f"错误率 {current['error_rate']} > 基线 {base['error_rate']}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", choices=SCENARIOS, default="session")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--url", help="压测已启动的服务，如 http://127.0.0.1:8000")
+    parser.add_argument("--user", default=os.getenv("LOADTEST_USER", "admin"))
+    parser.add_argument(
+        "--password", default=os.getenv("LOADTEST_PASSWORD", "hohu123456")
+    )
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--threshold", type=float, default=0.15)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="将本次结果写入基线文件"
+    )
+    parser.add_argument("--output", type=Path, help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print_report(result)
+    if args.output:
+        args.output.write_text(json.dumps(result, ensure_ascii=False, indent=2))
+
+    path = args.baseline or DEFAULT_BASELINE
+    baselines = json.loads(path.read_text()) if path.exists() else {}
+    if args.save_baseline:
+        baselines[args.scenario] = result
+        path.write_text(json.dumps(baselines, ensure_ascii=False, indent=2) + "\n")
+        print(f"\n基线已写入 {path}")
+        return
+    if args.baseline is None:
+        return
+
+    baseline = baselines.get(args.scenario)
+    if baseline is None:
+        print(f"\n基线中没有场景 {args.scenario}")
+        sys.exit(2)
+    params = ("target", "concurrency", "duration")
+    if any(baseline[p] != result[p] for p in params):
+        expected = ", ".join(f"{p}={baseline[p]}" for p in params)
+        print(f"\n参数与基线不一致 ({expected})，无法比较")
+        sys.exit(2)
+    regressions = compare(result, baseline, args.threshold)
+    if regressions:
+        print(f"\n性能退化 (阈值 {args.threshold:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\n未超出基线阈值 ({args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
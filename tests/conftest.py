@@ -1,6 +1,10 @@
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
+from app.core.config import settings
+from app.core.redis import breaker, pool, redis_client
 from app.main import app
 
 
@@ -11,3 +15,46 @@ async def client():
         transport=ASGITransport(app=app), base_url="http://test"
     ) as ac:
         yield ac
+
+
+@pytest.fixture(autouse=True)
+async def release_redis_connections():
+    """Redis 连接绑定在创建它的事件循环上，每个测试结束后断开，避免跨循环复用"""
+    yield
+    await pool.disconnect()
+
+
+@pytest.fixture
+async def redis_available():
+    """需要真实 Redis 的测试使用，不可用时跳过"""
+    try:
+        await redis_client.ping()
+    except Exception as exc:
+        pytest.skip(f"Redis 不可用: {exc}")
+    breaker.record_success()
+
+
+@pytest.fixture
+async def pg_session():
+    """
+    需要真实 PostgreSQL 的测试使用，不可用时跳过
+    会话绑定独立引擎 (pg_session.bind)，执行的语句记录在 info["statements"]，结束时回滚
+    """
+    engine = create_async_engine(settings.DATABASE_URL)
+    statements: list[str] = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda _conn, _cursor, statement, *_args: statements.append(statement),
+    )
+    async with AsyncSession(engine) as session:
+        try:
+            await session.execute(text("SELECT 1"))
+        except Exception as exc:
+            await engine.dispose()
+            pytest.skip(f"PostgreSQL 不可用: {exc}")
+        statements.clear()
+        session.info["statements"] = statements
+        yield session
+        await session.rollback()
+    await engine.dispose()
@@ -0,0 +1,63 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.db.base import user_roles
+from app.modules.system.crud.crud_role import role_crud
+from app.modules.system.crud.crud_user import batch_create_users
+from app.modules.system.schemas.user import UserCreate
+
+
+@pytest.fixture
+async def db(pg_session):
+    """批量创建在事务内执行，测试结束后回滚"""
+    codes = [r.role_code for r in await role_crud.project(pg_session, ("role_code",))]
+    if not codes:
+        pytest.skip("sys_role 数据不足")
+    pg_session.info["role_codes"] = codes
+    pg_session.info["statements"].clear()
+    return pg_session
+
+
+def make_user(name: str, roles: list[str], password: str | None = "pw123456"):
+    return UserCreate(
+        user_name=name,
+        user_email=f"{name}@example.com",
+        user_phone="13800000000",
+        user_gender="1",
+        status="1",
+        roles=roles,
+        password=password,
+    )
+
+
+async def test_batch_create_uses_set_based_statements(db):
+    code = db.info["role_codes"][0]
+    prefix = f"b{uuid.uuid4().hex[:8]}"
+    users = [make_user(f"{prefix}_{i}", [code, code]) for i in range(20)]
+    users += [
+        make_user(f"{prefix}_0", [code]),  # 批次内重复
+        make_user(f"{prefix}_x", ["NO_SUCH_ROLE"]),
+        make_user(f"{prefix}_y", [], password=None),
+    ]
+
+    results = await batch_create_users(db, users)
+    assert [r.success for r in results] == [True] * 20 + [False] * 3
+    assert [r.msg for r in results[20:]] == [
+        "批次内用户名重复",
+        "角色不存在: NO_SUCH_ROLE",
+        "密码不能为空",
+    ]
+    # 用户名校验、角色解析、用户写入、角色关联写入各一条语句
+    assert len(db.info["statements"]) == 4
+
+    user_ids = [int(r.user_id) for r in results[:20]]
+    links = await db.execute(
+        select(user_roles.c.user_id).where(user_roles.c.user_id.in_(user_ids))
+    )
+    assert sorted(links.scalars().all()) == sorted(user_ids)
+
+    # 再次提交同名用户时逐条报告已存在
+    again = await batch_create_users(db, users[:2])
+    assert [r.msg for r in again] == ["用户名已存在", "用户名已存在"]
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from sqlalchemy import BigInteger, Column, MetaData, String, Table, text
+
+from app.core.batch_writer import BatchWriter
+
+metadata = MetaData()
+events = Table(
+    "batch_writer_events",
+    metadata,
+    Column("id", BigInteger, primary_key=True, autoincrement=False),
+    Column("name", String(20)),
+)
+
+
+@pytest.fixture
+async def engine(pg_session):
+    engine = pg_session.bind
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+        await conn.run_sync(metadata.create_all)
+    yield engine
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+
+
+async def count_rows(engine) -> int:
+    async with engine.connect() as conn:
+        return (
+            await conn.execute(text("SELECT count(*) FROM batch_writer_events"))
+        ).scalar()
+
+
+async def test_flushes_by_size_and_on_stop(engine):
+    writer = BatchWriter(events, engine, batch_size=50, flush_interval=60)
+    await writer.start()
+    for i in range(120):
+        assert await writer.submit({"id": i, "name": f"e{i}"})
+
+    # 满 50 条立即写入，不等待 flush_interval
+    for _ in range(200):
+        if writer.written >= 100:
+            break
+        await asyncio.sleep(0.01)
+    assert writer.written == 100
+
+    # 关闭时写完剩余记录
+    await writer.stop()
+    assert writer.written == 120
+    assert await count_rows(engine) == 120
+
+
+async def test_flushes_by_interval(engine):
+    writer = BatchWriter(events, engine, batch_size=1000, flush_interval=0.05)
+    await writer.start()
+    await writer.submit({"id": 1, "name": "e1"})
+    await asyncio.sleep(0.3)
+    assert await count_rows(engine) == 1
+    await writer.stop()
+
+
+async def test_overflow_policies():
+    # 未启动后台任务，队列不会被消费
+    writer = BatchWriter(events, engine=None, maxsize=2, overflow="drop")
+    assert await writer.submit({"id": 1})
+    assert await writer.submit({"id": 2})
+    assert not await writer.submit({"id": 3})
+    assert writer.dropped == 1
+
+    writer = BatchWriter(
+        events, engine=None, maxsize=1, overflow="block", block_timeout=0.05
+    )
+    assert await writer.submit({"id": 1})
+    assert not await writer.submit({"id": 2})
+    assert writer.dropped == 1
@@ -0,0 +1,15 @@
+from app.utils.bloom import BloomFilter
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=10000, error_rate=0.01)
+    items = [f"item-{i}" for i in range(10000)]
+    bloom.update(items)
+    assert all(item in bloom for item in items)
+    assert not bloom.saturated
+
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 200
+
+    bloom.clear()
+    assert "item-1" not in bloom
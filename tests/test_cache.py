@@ -0,0 +1,48 @@
+from fastapi import FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+
+from app.core.base_response import ResponseModel
+from app.core.cache import PayloadCache, choose_encoding
+from app.core.invalidation import bump_version
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate, br", {"gzip", "br"}) == "br"
+    assert choose_encoding("gzip, br;q=0", {"gzip", "br"}) == "gzip"
+    assert choose_encoding("identity", {"gzip", "br"}) is None
+    assert choose_encoding("*", {"gzip"}) == "gzip"
+    assert choose_encoding(None, {"gzip"}) is None
+
+
+async def test_payload_cache_builds_once_per_version():
+    cache = PayloadCache(min_size=100)
+    calls = []
+    app = FastAPI()
+
+    @app.get("/tree", response_model=ResponseModel[list[str]])
+    async def tree(request: Request):
+        async def build():
+            calls.append(1)
+            return ResponseModel.success(data=["node"] * 100)
+
+        return await cache.respond(request, ("tree",), ("test-tree",), build)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        first = await client.get("/tree", headers={"Accept-Encoding": "identity"})
+        second = await client.get("/tree", headers={"Accept-Encoding": "gzip"})
+        assert len(calls) == 1
+        assert second.headers["content-encoding"] == "gzip"
+        # httpx 会自动解压，解压后应与未压缩的响应一致
+        assert second.content == first.content
+        assert first.json()["data"] == ["node"] * 100
+
+        not_modified = await client.get(
+            "/tree", headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert not_modified.status_code == 304
+
+        await bump_version("test-tree")
+        await client.get("/tree")
+        assert len(calls) == 2
@@ -0,0 +1,67 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.db.crud_base import CRUDBase, UniqueViolationError
+from app.modules.system.crud.crud_role import role_crud
+from app.modules.system.models import Role
+
+
+@pytest.fixture
+async def db(pg_session):
+    role_ids = [r.role_id for r in await role_crud.project(pg_session, ("role_id",))]
+    if len(role_ids) < 2:
+        pytest.skip("sys_role 数据不足")
+    pg_session.info["role_ids"] = role_ids
+    pg_session.info["statements"].clear()
+    return pg_session
+
+
+async def test_get_many_keeps_order(db):
+    crud = CRUDBase(Role, profiles=role_crud.profiles)
+    first, second = db.info["role_ids"][:2]
+
+    roles = await crud.get_many(db, [second, -1, first, second], profile="brief")
+    assert [r.role_id for r in roles] == [second, first]
+    # brief 方案不加载菜单，只有一条 IN 查询
+    assert len(db.info["statements"]) == 1
+
+    # 同一方案的语句只构建一次
+    assert crud._statement("in", None, "brief") is crud._statement("in", None, "brief")
+
+
+async def test_loader_batches_lookups(db):
+    first, second = db.info["role_ids"][:2]
+    loader = role_crud.loader(db, profile="brief")
+    assert role_crud.loader(db, profile="brief") is loader
+
+    a, b, missing, again = await asyncio.gather(
+        loader.load(first), loader.load(second), loader.load(-1), loader.load(first)
+    )
+    assert (a.role_id, b.role_id, missing) == (first, second, None)
+    assert again is a
+    assert len(db.info["statements"]) == 1
+
+    # 已加载的 key 不再查询
+    assert (await loader.load(second)) is b
+    assert len(db.info["statements"]) == 1
+
+
+async def test_create_unique_single_statement(db):
+    code = f"T_{uuid.uuid4().hex[:8]}"
+    values = {"role_name": code, "role_code": code, "status": "1"}
+    role = await role_crud.create_unique(db, values, ("role_code", "role_name"))
+    assert role.role_id and role.create_time
+    # 创建与唯一性校验只有一条 INSERT
+    assert len(db.info["statements"]) == 1
+
+    with pytest.raises(UniqueViolationError) as exc:
+        await role_crud.create_unique(db, values, ("role_code", "role_name"))
+    assert exc.value.field == "role_code"
+    with pytest.raises(UniqueViolationError) as exc:
+        await role_crud.create_unique(
+            db, {**values, "role_code": f"{code}_2"}, ("role_code", "role_name")
+        )
+    assert exc.value.field == "role_name"
+    await db.rollback()
@@ -0,0 +1,32 @@
+from app.modules.system.crud import crud_dict
+from app.modules.system.crud.crud_dict import DictCache
+
+
+async def test_options_requires_token(client):
+    response = await client.get("/system/dict/options", params={"types": "sys_status"})
+    assert response.status_code == 401
+
+
+async def test_dict_cache_reloads_on_version_change(pg_session, monkeypatch):
+    version = 0
+    loads = 0
+    load = crud_dict.load_dict_options
+
+    async def counting_load(db):
+        nonlocal loads
+        loads += 1
+        return await load(db)
+
+    monkeypatch.setattr(crud_dict, "get_version", lambda _ns: version)
+    monkeypatch.setattr(crud_dict, "load_dict_options", counting_load)
+    cache = DictCache()
+    options = await cache.get_many(pg_session, ("sys_status", "missing"))
+    assert [o.value for o in options["sys_status"]] == ["1", "2"]
+    assert options["missing"] == []
+
+    # 版本不变时只读内存，版本变化后重新加载
+    await cache.get_many(pg_session, ("sys_user_gender",))
+    assert loads == 1
+    version = 1
+    await cache.get_many(pg_session, ("sys_status",))
+    assert loads == 2
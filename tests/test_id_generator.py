@@ -0,0 +1,46 @@
+import threading
+
+import pytest
+
+from app.core.id_generator import ClockMovedBackwardsError, IdGenerator
+
+
+def test_next_ids_block_is_unique_and_increasing():
+    gen = IdGenerator(instance=7)
+    ids = [gen.next_id()] + gen.next_ids(10000) + [gen.next_id()]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert all(i >> 12 & 0x3FF == 7 for i in ids)
+
+
+def test_next_id_is_thread_safe():
+    gen = IdGenerator(instance=1)
+    results: list[list[int]] = [[] for _ in range(4)]
+
+    def worker(index: int):
+        results[index].extend(gen.next_id() for _ in range(5000))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    all_ids = [i for chunk in results for i in chunk]
+    assert len(set(all_ids)) == len(all_ids)
+
+
+def test_clock_moving_backwards(monkeypatch):
+    gen = IdGenerator(instance=1)
+    now = [1_000_000]
+    monkeypatch.setattr(gen, "_now", lambda: now[0])
+
+    first = gen.next_id()
+    # 小幅回拨：沿用上次时间戳继续递增
+    now[0] -= 10
+    assert gen.next_id() > first
+
+    # 超出容忍范围：拒绝生成
+    now[0] -= 60_000
+    with pytest.raises(ClockMovedBackwardsError):
+        gen.next_id()
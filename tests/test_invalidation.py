@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from app.core import invalidation
+from app.core.invalidation import (
+    CHANNEL,
+    VERSIONS_KEY,
+    InvalidationBus,
+    bump_version,
+    get_version,
+    on_invalidate,
+    parse_message,
+)
+from app.core.redis import breaker, redis_client
+
+pytestmark = pytest.mark.usefixtures("redis_available", "cleanup")
+
+
+@pytest.fixture
+async def cleanup():
+    yield
+    await redis_client.hdel(VERSIONS_KEY, "test-ns")
+
+
+async def wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+async def wait_for_subscriber(timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not (await redis_client.pubsub_numsub(CHANNEL))[0][1]:
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+async def test_bus_applies_messages():
+    seen = []
+    on_invalidate("test-ns", lambda ns, version: seen.append(version))
+    bus = InvalidationBus(sync_interval=30)
+    await bus.start()
+    try:
+        await bump_version("test-ns")
+        version = get_version("test-ns")
+        assert version > 0 and seen == [version]
+
+        # 模拟其他 worker 的写操作：递增计数并广播
+        other = await redis_client.hincrby(VERSIONS_KEY, "test-ns", 5)
+        await redis_client.publish(CHANNEL, f"test-ns:{other}")
+        await wait_for(lambda: get_version("test-ns") == other)
+        assert seen[-1] == other
+    finally:
+        await bus.stop()
+
+
+async def test_bus_delivers_added_members():
+    seen = []
+    on_invalidate("test-ns", lambda *args: seen.append(args), members=True)
+    bus = InvalidationBus(sync_interval=30)
+    await bus.start()
+    try:
+        await bump_version("test-ns", members=["alice", "张三"])
+        assert seen[-1] == ("test-ns", get_version("test-ns"), ("alice", "张三"))
+
+        # 其他 worker 广播的消息 (不修改计数，避免订阅前的追平抢先读到新版本号)
+        await wait_for_subscriber()
+        other = get_version("test-ns") + 1
+        await redis_client.publish(CHANNEL, f'test-ns:{other}\n["bob"]')
+        await wait_for(lambda: get_version("test-ns") == other)
+        assert seen[-1] == ("test-ns", other, ("bob",))
+    finally:
+        await bus.stop()
+
+
+def test_parse_message():
+    assert parse_message("a:b:3") == ("a:b", 3, ())
+    assert parse_message('user:4\n["x:y"]') == ("user", 4, ("x:y",))
+
+
+async def test_bus_catches_up_missed_messages():
+    bus = InvalidationBus(sync_interval=0.1)
+    await bus.start()
+    try:
+        # 漏收消息：只修改计数不广播，依靠定期追平
+        missed = await redis_client.hincrby(VERSIONS_KEY, "test-ns", 3)
+        await wait_for(lambda: get_version("test-ns") == missed)
+    finally:
+        await bus.stop()
+
+
+async def test_bump_is_local_and_replayed_when_redis_fails(monkeypatch):
+    async def unavailable(**_kwargs):
+        raise ConnectionError("down")
+
+    real_bump = invalidation._bump
+    monkeypatch.setattr(invalidation, "_bump", unavailable)
+    await bump_version("test-ns")
+    assert get_version("test-ns") < 0
+    assert "test-ns" in invalidation._pending
+
+    monkeypatch.setattr(invalidation, "_bump", real_bump)
+    breaker.record_success()
+    await invalidation.sync_versions()
+    assert not invalidation._pending
+    assert get_version("test-ns") == int(
+        await redis_client.hget(VERSIONS_KEY, "test-ns")
+    )
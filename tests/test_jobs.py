@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+from app.core import jobs
+from app.core.config import settings
+from app.core.jobs import (
+    DELAYED_KEY,
+    FAILED,
+    QUEUE_KEY,
+    RETRYING,
+    RUNNING_KEY,
+    SUCCEEDED,
+    JobContext,
+    Worker,
+    get_job,
+    get_job_file,
+    job,
+)
+from app.core.redis import redis_client
+
+attempts: list[int] = []
+
+
+@job("test.echo")
+async def echo(ctx: JobContext, value: str) -> dict:
+    await ctx.progress(50, "half")
+    await ctx.save_file("echo.txt", value, "text/plain")
+    return {"value": value}
+
+
+@job("test.flaky", max_retries=2)
+async def flaky(ctx: JobContext, fail_times: int) -> int:
+    attempts.append(ctx.attempt)
+    if ctx.attempt <= fail_times:
+        raise RuntimeError(f"attempt {ctx.attempt}")
+    return ctx.attempt
+
+
+@job("test.slow")
+async def slow(_ctx: JobContext) -> None:
+    await asyncio.sleep(10)
+
+
+def start_worker(concurrency: int = 2) -> tuple[Worker, asyncio.Task]:
+    worker = Worker(concurrency)
+    worker.lease_seconds = 0.3
+    return worker, asyncio.create_task(worker.run())
+
+
+@pytest.fixture
+async def worker(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BACKOFF", 0.01)
+    monkeypatch.setattr(settings, "JOB_SHUTDOWN_TIMEOUT", 0.1)
+    await redis_client.delete(QUEUE_KEY, RUNNING_KEY, DELAYED_KEY)
+    worker, task = start_worker()
+    yield worker
+    worker.stop()
+    await task
+    await redis_client.delete(QUEUE_KEY, RUNNING_KEY, DELAYED_KEY)
+
+
+async def wait_for_status(job_id: str, *statuses: str, timeout: float = 5) -> dict:
+    async with asyncio.timeout(timeout):
+        while True:
+            detail = await get_job(job_id)
+            if detail and detail["status"] in statuses:
+                return detail
+            await asyncio.sleep(0.02)
+
+
+@pytest.mark.usefixtures("redis_available", "worker")
+async def test_job_runs_and_stores_result():
+    job_id = await echo.enqueue(owner=1, value="hello")
+    detail = await wait_for_status(job_id, SUCCEEDED)
+    assert detail["result"] == {"value": "hello"}
+    assert detail["params"] == {"value": "hello"}
+    assert float(detail["progress"]) == 100
+    assert detail["owner"] == "1"
+    assert 0 < await redis_client.ttl(jobs.job_key(job_id)) <= settings.JOB_RESULT_TTL
+    file = await get_job_file(job_id)
+    assert file["content"] == "hello"
+    assert await redis_client.llen(RUNNING_KEY) == 0
+
+
+@pytest.mark.usefixtures("redis_available", "worker")
+async def test_job_retries_then_fails():
+    attempts.clear()
+    job_id = await flaky.enqueue(fail_times=1)
+    detail = await wait_for_status(job_id, SUCCEEDED)
+    assert detail["result"] == 2
+    assert attempts == [1, 2]
+
+    attempts.clear()
+    job_id = await flaky.enqueue(fail_times=5)
+    detail = await wait_for_status(job_id, FAILED)
+    assert attempts == [1, 2, 3]
+    assert detail["error"] == "RuntimeError: attempt 3"
+
+
+@pytest.mark.usefixtures("redis_available", "worker")
+async def test_retry_clears_lease(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BACKOFF", 60)
+    job_id = await flaky.enqueue(fail_times=1)
+    detail = await wait_for_status(job_id, RETRYING)
+    # 等待重试期间不保留上次的租约，重新领取后不会被回收脚本误判为过期
+    assert "lease" not in detail
+    await redis_client.delete(jobs.job_key(job_id))
+
+
+@pytest.mark.usefixtures("redis_available")
+async def test_shutdown_requeues_running_job(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_SHUTDOWN_TIMEOUT", 0.1)
+    await redis_client.delete(QUEUE_KEY, RUNNING_KEY)
+    # 单个执行槽位被占满时 stop() 也能及时退出
+    worker, task = start_worker(concurrency=1)
+    job_id = await slow.enqueue()
+    await wait_for_status(job_id, "running")
+    worker.stop()
+    async with asyncio.timeout(2):
+        await task
+    assert await redis_client.lrange(QUEUE_KEY, 0, -1) == [job_id]
+    assert await redis_client.llen(RUNNING_KEY) == 0
+    detail = await get_job(job_id)
+    assert detail["status"] == "queued"
+    assert detail["attempts"] == "0"
+    assert "lease" not in detail
+    await redis_client.delete(QUEUE_KEY, jobs.job_key(job_id))
+
+
+@pytest.mark.usefixtures("redis_available")
+async def test_expired_lease_is_requeued():
+    await redis_client.delete(QUEUE_KEY, RUNNING_KEY)
+    job_id = await echo.enqueue(value="x")
+    # 模拟 worker 取出任务后崩溃：任务留在 running 中且租约已过期
+    await redis_client.blmove(QUEUE_KEY, RUNNING_KEY, 1, "RIGHT", "LEFT")
+    await redis_client.hset(jobs.job_key(job_id), "lease", 1)
+    assert await jobs._requeue(keys=[RUNNING_KEY, QUEUE_KEY], args=[100]) == 1
+    assert await redis_client.lrange(QUEUE_KEY, 0, -1) == [job_id]
+    assert await redis_client.hget(jobs.job_key(job_id), "lease") is None
+    await redis_client.delete(QUEUE_KEY, RUNNING_KEY, jobs.job_key(job_id))
@@ -0,0 +1,44 @@
+import asyncio
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.lifecycle import InFlightMiddleware, RequestTracker
+
+
+async def test_drain_waits_for_in_flight_requests():
+    tracker = RequestTracker()
+    release = asyncio.Event()
+    app = FastAPI()
+    app.add_middleware(InFlightMiddleware, tracker=tracker)
+
+    @app.get("/slow")
+    async def slow():
+        await release.wait()
+        return {"ok": True}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        pending = asyncio.create_task(client.get("/slow"))
+        while tracker.active == 0:
+            await asyncio.sleep(0)
+
+        drain = asyncio.create_task(tracker.drain(timeout=5))
+        await asyncio.sleep(0.01)
+        assert not drain.done()
+
+        # 排空期间的新请求直接返回 503
+        rejected = await client.get("/slow")
+        assert rejected.status_code == 503
+
+        release.set()
+        assert (await pending).status_code == 200
+        assert await drain is True
+        assert tracker.active == 0
+
+
+async def test_drain_timeout():
+    tracker = RequestTracker()
+    tracker.enter()
+    assert await tracker.drain(timeout=0.01) is False
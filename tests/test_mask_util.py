@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from app.modules.system.schemas.user import UserItemOut
+from app.utils.mask_util import MaskUtil, mask_column, mask_rows
+
+
+def test_mask_values():
+    assert MaskUtil.phone("13812345678") == "138****5678"
+    assert MaskUtil.phone("138-1234-5678") == "138****5678"
+    # 非常见分隔符回退到正则，长度不符时只清洗不遮盖
+    assert MaskUtil.phone("138.1234.5678") == "138****5678"
+    assert MaskUtil.phone("+86 (138) 1234 5678") == "8613812345678"
+    assert MaskUtil.phone(None) == ""
+    assert MaskUtil.email("abc@example.com") == "a**c@example.com"
+    assert MaskUtil.email("ab@x.com") == "a*@x.com"
+    assert MaskUtil.email("invalid") == ""
+    assert MaskUtil.id_card("110101 19900307 1234") == "110101********1234"
+    assert MaskUtil.bank_card("6222081234567890123") == "**** **** **** **** 123"
+    assert MaskUtil.bank_card("6222081234567890") == "**** **** **** 7890"
+
+
+def test_mask_column_and_rows():
+    phones = ["13812345678", None, "12345"]
+    assert mask_column(phones, "phone") == [MaskUtil.phone(p) for p in phones]
+
+    rows = [{"phone": "13812345678", "email": "abc@example.com", "name": "x"}]
+    assert mask_rows(rows, {"phone": "phone", "email": "email"}) == [
+        {"phone": "138****5678", "email": "a**c@example.com", "name": "x"}
+    ]
+
+
+def test_schema_masks_on_serialization():
+    item = UserItemOut(
+        user_id=1,
+        user_name="user1",
+        user_phone="13812345678",
+        user_email="abc@example.com",
+        create_time=datetime(2026, 1, 1),
+    )
+    # 属性保持原值，仅输出时脱敏
+    assert item.user_phone == "13812345678"
+    data = item.model_dump(by_alias=True)
+    assert data["userPhone"] == "138****5678"
+    assert data["userEmail"] == "a**c@example.com"
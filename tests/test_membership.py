@@ -0,0 +1,101 @@
+import pytest
+
+from app.core import invalidation
+from app.core.invalidation import get_version
+from app.db.session import engine
+from app.modules.auth.membership import MembershipIndex
+from app.modules.system.crud.crud_menu import menu_crud
+from app.modules.system.crud.crud_user import user_crud
+
+
+@pytest.fixture
+async def db(pg_session, monkeypatch):
+    """统计回退到数据库的存在性查询次数"""
+    lookups = []
+
+    def count(crud):
+        exists_by = crud.exists_by
+
+        async def wrapper(*args, **kwargs):
+            lookups.append(args[-1])
+            return await exists_by(*args, **kwargs)
+
+        monkeypatch.setattr(crud, "exists_by", wrapper)
+
+    count(user_crud)
+    count(menu_crud)
+    rows = await user_crud.project(pg_session, ["user_name"])
+    routes = await menu_crud.project(pg_session, ["route_name"])
+    if not rows or not routes:
+        pytest.skip("sys_user / sys_menu 数据不足")
+    pg_session.info["user_name"] = rows[0].user_name
+    pg_session.info["route_name"] = next(r.route_name for r in routes if r.route_name)
+    pg_session.info["lookups"] = lookups
+    yield pg_session
+    # 索引重建使用全局引擎，连接绑定在当前事件循环上
+    await engine.dispose()
+
+
+async def test_bloom_index_answers_negatives_from_memory(db):
+    index = MembershipIndex(user_crud, "user_name", "test-user", bloom_capacity=1000)
+    lookups = db.info["lookups"]
+
+    assert not await index.contains(db, "no-such-user-for-membership-test")
+    assert lookups == []
+    # 可能存在时查询数据库确认
+    assert await index.contains(db, db.info["user_name"])
+    assert lookups == [db.info["user_name"]]
+
+
+async def test_exact_index_and_fallback(db, monkeypatch):
+    index = MembershipIndex(menu_crud, "route_name", "test-menu")
+    lookups = db.info["lookups"]
+
+    assert await index.contains(db, db.info["route_name"])
+    assert not await index.contains(db, "no_such_route")
+    assert lookups == []
+
+    # 收到失效通知后重建失败，回退为查询数据库
+    async def fail():
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(index, "refresh", fail)
+    invalidation._apply("test-menu", get_version("test-menu") + 1)
+    assert not await index.contains(db, "no_such_route")
+    assert lookups == ["no_such_route"]
+
+
+async def test_bloom_index_adds_published_members(db, monkeypatch):
+    namespace = "test-user-add"
+    index = MembershipIndex(user_crud, "user_name", namespace, bloom_capacity=1000)
+    new_name = "new-user-for-membership-test"
+    assert not await index.contains(db, new_name)
+
+    refreshes = []
+    refresh = index.refresh
+
+    async def counting_refresh():
+        refreshes.append(1)
+        await refresh()
+
+    monkeypatch.setattr(index, "refresh", counting_refresh)
+    version = get_version(namespace)
+    # 新增通知原地追加，不重建
+    invalidation._apply(namespace, version + 1, (new_name,))
+    assert new_name in index._members
+    # 删除、修改等通知不影响布隆过滤器
+    invalidation._apply(namespace, version + 2, ())
+    await index.contains(db, new_name)
+    assert refreshes == []
+
+    # 漏收通知或来自定期追平时重建
+    invalidation._apply(namespace, version + 4, ())
+    await index.contains(db, new_name)
+    invalidation._apply(namespace, version + 5, None)
+    await index.contains(db, new_name)
+    assert len(refreshes) == 2
+
+    # 到达重建间隔后全量重建
+    index.rebuild_interval = 0
+    await index.contains(db, new_name)
+    assert len(refreshes) == 3
@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+from starlette.requests import Request
+
+from app.modules.system.crud import crud_oper_log
+from app.modules.system.crud.crud_oper_log import OperLogRecorder
+
+
+def make_request() -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "DELETE",
+            "path": "/system/role/1",
+            "headers": [],
+            "query_string": b"",
+            "client": ("10.0.0.1", 1234),
+        }
+    )
+
+
+async def test_operator_name_comes_from_current_user(monkeypatch):
+    rows = []
+
+    async def submit(row):
+        rows.append(row)
+        return True
+
+    monkeypatch.setattr(crud_oper_log.oper_log_writer, "submit", submit)
+    request = make_request()
+    # get_current_user 在鉴权时写入当前用户
+    request.state.current_user = SimpleNamespace(user_id=7, user_name="alice")
+
+    await OperLogRecorder(request, "角色管理", 7).record("delete", target=[1, 2])
+    await OperLogRecorder(request, "角色管理", 7).record("delete", oper_name="bob")
+    # token 与已加载的用户不一致时不填写
+    await OperLogRecorder(request, "角色管理", 8).record("delete")
+    assert [r["oper_name"] for r in rows] == ["alice", "bob", None]
+    assert rows[0]["target_id"] == "1,2"
@@ -0,0 +1,71 @@
+import cProfile
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.profiling import (
+    HEADER,
+    ProfileStore,
+    ProfilingMiddleware,
+    create_profile_token,
+    verify_profile_token,
+)
+
+
+def make_client(store: ProfileStore, sample_rate: float = 0.0) -> AsyncClient:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": sum(range(1000))}
+
+    app.add_middleware(ProfilingMiddleware, store=store, sample_rate=sample_rate)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+def test_token_signature_and_expiry():
+    assert verify_profile_token(create_profile_token(60))
+    assert not verify_profile_token(create_profile_token(-1))
+    expires, _, signature = create_profile_token(60).partition(".")
+    assert not verify_profile_token(f"{int(expires) + 1}.{signature}")
+    assert not verify_profile_token("garbage")
+
+
+async def test_only_triggered_requests_are_profiled(tmp_path):
+    store = ProfileStore(tmp_path, max_files=10)
+    async with make_client(store) as client:
+        response = await client.get("/ping")
+        assert "x-profile-id" not in response.headers
+        response = await client.get("/ping", headers={HEADER: "1.bad"})
+        assert "x-profile-id" not in response.headers
+        assert store.list() == []
+
+        response = await client.get(
+            "/ping?a=1", headers={HEADER: create_profile_token(60)}
+        )
+    profile_id = response.headers["x-profile-id"]
+    [meta] = store.list()
+    assert meta["id"] == profile_id
+    assert (meta["path"], meta["query"], meta["status"]) == ("/ping", "a=1", 200)
+    assert meta["trigger"] == "header"
+    assert "ping" in store.text(profile_id)
+
+
+async def test_sampling(tmp_path):
+    store = ProfileStore(tmp_path, max_files=10)
+    async with make_client(store, sample_rate=1.0) as client:
+        response = await client.get("/ping")
+    assert store.list()[0]["id"] == response.headers["x-profile-id"]
+    assert store.list()[0]["trigger"] == "sample"
+
+
+def test_ring_buffer_keeps_newest(tmp_path):
+    store = ProfileStore(tmp_path, max_files=2)
+    ids = [f"170000000000{i}-0000000{i}" for i in range(4)]
+    for profile_id in ids:
+        store.save(profile_id, cProfile.Profile(), {})
+    assert [m["id"] for m in store.list()] == ids[:1:-1]
+    assert len(list(tmp_path.iterdir())) == 4
+    assert store.path(ids[0]) is None
+    # 非法 ID 不会访问目录之外的文件
+    assert store.path("../etc/passwd") is None
@@ -0,0 +1,194 @@
+"""
+热点查询执行计划回归测试
+
+在独立 schema 中执行 alembic 迁移建表并灌入模拟数据，对各接口的热点查询执行 EXPLAIN，
+出现顺序扫描(Seq Scan)即视为缺少索引。需要可连接的 PostgreSQL，否则跳过。
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from alembic.config import Config
+from sqlalchemy import and_, exists, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from alembic import command
+from app.core.config import settings
+from app.db.base import Base, role_menus, user_roles
+from app.modules.system.crud.crud_menu import leaf_condition
+from app.modules.system.models import Menu, Role, User
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+SCHEMA = "plan_regression"
+
+ALEMBIC_DIR = Path(__file__).resolve().parent.parent / "alembic"
+
+SEED_SQL = [
+    # 5 万菜单：50 个根节点，其余每 20 个挂在同一父节点下；约 70% 为按钮
+    """
+    INSERT INTO sys_menu (menu_id, parent_id, menu_name, menu_type, route_name,
+                          "order", status, tree_path, tree_depth)
+    SELECT g,
+           CASE WHEN g <= 50 THEN 0 ELSE g / 20 END,
+           'menu_' || g,
+           CASE WHEN g % 20 = 0 THEN 'M' WHEN g % 10 < 3 THEN 'C' ELSE 'F' END,
+           CASE WHEN g % 10 < 3 OR g % 20 = 0 THEN 'route_' || g END,
+           g % 100,
+           CASE WHEN g % 10 = 9 THEN '2' ELSE '1' END,
+           '', 0
+    FROM generate_series(1, 50000) g
+    """,
+    """
+    WITH RECURSIVE tree AS (
+        SELECT menu_id, '/' || menu_id || '/' AS tree_path, 0 AS tree_depth
+        FROM sys_menu WHERE parent_id = 0
+        UNION ALL
+        SELECT c.menu_id, t.tree_path || c.menu_id || '/', t.tree_depth + 1
+        FROM sys_menu c JOIN tree t ON c.parent_id = t.menu_id
+    )
+    UPDATE sys_menu SET tree_path = tree.tree_path, tree_depth = tree.tree_depth
+    FROM tree WHERE sys_menu.menu_id = tree.menu_id
+    """,
+    """
+    INSERT INTO sys_role (role_id, role_name, role_code, status, create_time)
+    SELECT g, 'role_' || g, 'R_' || g, '1', now() - g * interval '1 minute'
+    FROM generate_series(1, 500) g
+    """,
+    """
+    INSERT INTO sys_role_menu (role_id, menu_id)
+    SELECT r, m
+    FROM generate_series(1, 500) r, generate_series(1, 100) i,
+         LATERAL (SELECT (r * 97 + i * 491) % 50000 + 1 AS m) x
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO sys_user (user_id, user_name, hashed_password, status, create_time)
+    SELECT g, 'user_' || g, 'x', '1', now() - g * interval '1 second'
+    FROM generate_series(1, 20000) g
+    """,
+    """
+    INSERT INTO sys_user_role (user_id, role_id)
+    SELECT g, g % 500 + 1 FROM generate_series(1, 20000) g
+    """,
+]
+
+
+def hot_queries():
+    """各接口热点查询 (与 app/modules 中的写法保持一致)"""
+    role_id = 7
+    role_menu_ids = select(role_menus.c.menu_id).where(role_menus.c.role_id == role_id)
+    return {
+        # /auth/isRouteExist
+        "route_name_lookup": select(Menu).where(Menu.route_name == "route_1002"),
+        # DELETE /system/menu/{id} 子节点检查
+        "menu_has_children": select(exists().where(Menu.parent_id == 1234)),
+        # /system/menu/batch-delete 子节点检查
+        "menu_batch_child_check": select(Menu).where(
+            and_(Menu.parent_id.in_([61, 62, 63]), ~Menu.menu_id.in_([61, 62, 63]))
+        ),
+        # 子树查询
+        "menu_subtree": select(Menu.menu_id).where(Menu.tree_path.like("/7/140/%")),
+        # /system/menu/getAllPages
+        "enabled_pages": select(Menu.route_name)
+        .where(Menu.status == "1", Menu.menu_type == "C")
+        .order_by(Menu.order.asc()),
+        # /system/role/menus/{role_id}
+        "role_leaf_menus": select(Menu.menu_id)
+        .join(role_menus, Menu.menu_id == role_menus.c.menu_id)
+        .where(role_menus.c.role_id == role_id, leaf_condition(role_menu_ids))
+        .order_by(Menu.parent_id, Menu.order),
+        # 按菜单反查角色
+        "roles_by_menu": select(role_menus.c.role_id).where(
+            role_menus.c.menu_id == 4321
+        ),
+        # 按角色反查用户
+        "users_by_role": select(user_roles.c.user_id).where(
+            user_roles.c.role_id == role_id
+        ),
+        # /system/user/list
+        "user_page": select(User).order_by(User.create_time.desc()).limit(10),
+        # /system/role/list
+        "role_page": select(Role).order_by(Role.create_time.desc()).limit(10),
+    }
+
+
+def upgrade_head(connection) -> None:
+    """在给定连接 (search_path 已指向 SCHEMA) 上执行全部迁移"""
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    """递归查找执行计划中的顺序扫描节点"""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+    return found
+
+
+@pytest_asyncio.fixture(loop_scope="module", scope="module")
+async def plan_engine():
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        connect_args={"server_settings": {"search_path": SCHEMA}},
+    )
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    except Exception as exc:
+        await engine.dispose()
+        pytest.skip(f"PostgreSQL 不可用: {exc}")
+
+    # 按迁移建表，保证测试的是线上实际存在的索引；
+    # 部分索引以 CONCURRENTLY 创建，事务由 alembic 自行管理
+    async with engine.connect() as conn:
+        await conn.run_sync(upgrade_head)
+    async with engine.begin() as conn:
+        for sql in SEED_SQL:
+            await conn.execute(text(sql))
+        for table in Base.metadata.tables:
+            await conn.execute(text(f"ANALYZE {table}"))
+
+    yield engine
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await engine.dispose()
+
+
+async def test_migrations_match_model_indexes(plan_engine):
+    async with plan_engine.connect() as conn:
+        result = await conn.execute(
+            text("SELECT indexname FROM pg_indexes WHERE schemaname = :schema"),
+            {"schema": SCHEMA},
+        )
+        migrated = {name for name in result.scalars() if name.startswith("ix_")}
+    declared = {
+        index.name for table in Base.metadata.tables.values() for index in table.indexes
+    }
+    assert migrated == declared
+
+
+@pytest.mark.parametrize("name", list(hot_queries()))
+async def test_hot_query_uses_index(plan_engine, name):
+    stmt = hot_queries()[name]
+    sql = stmt.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    async with plan_engine.connect() as conn:
+        result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+        plan = result.scalar()
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    seq_scans = find_seq_scans(plan[0]["Plan"])
+    assert not seq_scans, f"{name} 出现顺序扫描: {seq_scans}\n{sql}"
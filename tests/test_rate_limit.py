@@ -0,0 +1,103 @@
+import time
+
+import pytest
+
+from app.core.rate_limit import RateRule, SlidingWindowLimiter
+from app.core.redis import breaker, redis_client
+from app.db.session import get_db
+from app.main import app
+from app.modules.auth import api as auth_api
+
+pytestmark = pytest.mark.usefixtures("redis_available")
+
+PREFIX = "test:rate:"
+
+
+@pytest.fixture
+async def limiter():
+    yield SlidingWindowLimiter(prefix=PREFIX)
+    keys = [key async for key in redis_client.scan_iter(f"{PREFIX}*")]
+    if keys:
+        await redis_client.delete(*keys)
+
+
+async def test_sliding_window_admits_then_rejects(limiter):
+    rule = RateRule("window", limit=3, window=10)
+    assert [await limiter.hit(rule) for _ in range(3)] == [0, 0, 0]
+    # 未配置锁定时等待最早一次访问滑出窗口
+    retry_after = await limiter.hit(rule)
+    assert 9 < retry_after <= 10
+    assert await redis_client.zcard(f"{PREFIX}window") == 3
+
+
+async def test_lockout_doubles_up_to_max(limiter):
+    rule = RateRule("lock", limit=1, window=60, lockout=1, max_lockout=3)
+    assert await limiter.hit(rule) == 0
+
+    waits = []
+    for _ in range(4):
+        waits.append(await limiter.hit(rule))
+        # 锁定期间返回剩余锁定时间，不增加锁定次数
+        assert 0 < await limiter.hit(rule) <= waits[-1]
+        # 模拟锁定到期
+        await redis_client.delete(f"{PREFIX}lock:lock")
+    assert waits == [1, 2, 3, 3]
+
+
+async def test_rules_are_counted_all_or_nothing(limiter):
+    loose = RateRule("loose", limit=5, window=60)
+    strict = RateRule("strict", limit=1, window=60)
+    assert await limiter.hit(strict) == 0
+
+    assert await limiter.hit(loose, strict) > 0
+    # 任一规则超限时其他规则也不计数
+    assert await redis_client.zcard(f"{PREFIX}loose") == 0
+    assert await limiter.hit(loose) == 0
+
+
+async def test_reset_clears_window_and_lockout(limiter):
+    rule = RateRule("reset", limit=1, window=60, lockout=60, max_lockout=60)
+    await limiter.hit(rule)
+    assert await limiter.hit(rule) == 60
+    await limiter.reset("reset")
+    assert await limiter.hit(rule) == 0
+    assert await redis_client.get(f"{PREFIX}reset:strikes") is None
+
+
+async def test_fails_open_when_breaker_is_open(limiter, monkeypatch):
+    rule = RateRule("open", limit=1, window=60)
+    await limiter.hit(rule)
+
+    async def fail(*_args, **_kwargs):
+        raise AssertionError("unexpected Redis call")
+
+    monkeypatch.setattr(limiter, "_script", fail)
+    monkeypatch.setattr(breaker, "opened_at", time.monotonic())
+    assert await limiter.hit(rule) == 0
+
+
+async def test_login_rejected_before_db_and_password_check(client, monkeypatch):
+    lock_key = "rate:login:user:rate-limit-test:lock"
+    await redis_client.set(lock_key, 1, px=5000)
+
+    class NoQuerySession:
+        def __getattr__(self, name):
+            raise AssertionError(f"database session used: {name}")
+
+    async def no_db():
+        yield NoQuerySession()
+
+    async def no_auth(*_args, **_kwargs):
+        raise AssertionError("credentials checked")
+
+    app.dependency_overrides[get_db] = no_db
+    monkeypatch.setattr(auth_api.auth_service, "authenticate", no_auth)
+    try:
+        response = await client.post(
+            "/auth/login", json={"userName": "rate-limit-test", "password": "x"}
+        )
+    finally:
+        app.dependency_overrides.pop(get_db)
+        await redis_client.delete(lock_key)
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["Retry-After"]) <= 5
@@ -0,0 +1,37 @@
+import pytest
+import redis.asyncio as redis
+
+from app.core.redis import CircuitBreaker, mget_many, mset_many, pool, redis_client
+
+
+def test_circuit_breaker_half_open():
+    circuit = CircuitBreaker(threshold=1, reset_timeout=0)
+    circuit.record_failure()
+    assert circuit.opened_at is not None
+    assert circuit.available
+    circuit.record_success()
+    assert circuit.opened_at is None and circuit.failures == 0
+
+
+@pytest.mark.usefixtures("redis_available")
+async def test_batch_helpers_chunk_and_use_given_client():
+    # 与全局客户端使用不同的库，确认批量操作走传入的客户端
+    db = (pool.connection_kwargs.get("db", 0) + 1) % 16
+    client = redis.Redis(**{**pool.connection_kwargs, "db": db})
+    keys = [f"test:batch:{i}" for i in range(5)]
+    try:
+        await mset_many(
+            {k: str(i) for i, k in enumerate(keys[:3])}, chunk_size=2, client=client
+        )
+        await mset_many(
+            dict.fromkeys(keys[3:], "x"), ex=10, chunk_size=1, client=client
+        )
+        values = await mget_many(
+            [*keys, "test:batch:none"], chunk_size=2, client=client
+        )
+        assert values == ["0", "1", "2", "x", "x", None]
+        assert await client.ttl(keys[3]) > 0
+        assert await redis_client.mget(keys) == [None] * 5
+    finally:
+        await client.delete(*keys)
+        await client.aclose()
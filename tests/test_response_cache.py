@@ -0,0 +1,96 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi import FastAPI, Query
+from httpx import ASGITransport, AsyncClient
+
+from app.core.base_response import ResponseModel
+from app.core.redis import redis_client
+from app.core.response_cache import (
+    PREFIX,
+    cache_response,
+    invalidate_tags,
+    should_refresh,
+)
+
+
+def test_should_refresh():
+    now = time.time()
+    assert should_refresh(0.5, now - 1, beta=1.0)
+    # 距过期很远且重建很快时不会提前刷新
+    assert not any(should_refresh(0.001, now + 3600, beta=1.0) for _ in range(100))
+
+
+def make_app(tag: str, calls: list, delay: float = 0.0) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items", response_model=ResponseModel[list[str]])
+    @cache_response(ttl=60, tags=(tag,))
+    async def items(kind: str | None = Query(None), page: int = 1):
+        calls.append((kind, page))
+        await asyncio.sleep(delay)
+        return ResponseModel.success(data=[f"{kind}-{page}"])
+
+    return app
+
+
+async def _cleanup():
+    keys = [k async for k in redis_client.scan_iter(f"{PREFIX}:GET:/items:*")]
+    if keys:
+        await redis_client.delete(*keys)
+
+
+@pytest.mark.usefixtures("redis_available")
+async def test_cache_response_hits_and_invalidates():
+    tag = f"test-rcache-{uuid.uuid4().hex[:8]}"
+    calls = []
+    app = make_app(tag, calls)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        try:
+            first = await client.get("/items?page=2&kind=a")
+            assert first.headers["x-cache"] == "MISS"
+            assert first.json()["data"] == ["a-2"]
+
+            # 参数顺序不同、空值参数不影响命中
+            second = await client.get("/items?kind=a&page=2&extra=")
+            assert second.headers["x-cache"] == "HIT"
+            assert second.content == first.content
+            assert len(calls) == 1
+
+            not_modified = await client.get(
+                "/items?kind=a&page=2", headers={"If-None-Match": first.headers["etag"]}
+            )
+            assert not_modified.status_code == 304
+
+            await client.get("/items?kind=b&page=2")
+            assert len(calls) == 2
+
+            await invalidate_tags(tag)
+            third = await client.get("/items?kind=a&page=2")
+            assert third.headers["x-cache"] == "MISS"
+            assert len(calls) == 3
+        finally:
+            await _cleanup()
+
+
+@pytest.mark.usefixtures("redis_available")
+async def test_cache_response_single_flight():
+    tag = f"test-rcache-{uuid.uuid4().hex[:8]}"
+    calls = []
+    app = make_app(tag, calls, delay=0.2)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        try:
+            responses = await asyncio.gather(
+                *(client.get("/items?kind=x") for _ in range(10))
+            )
+            assert len(calls) == 1
+            assert {r.json()["data"][0] for r in responses} == {"x-1"}
+            assert [r.headers["x-cache"] for r in responses].count("MISS") == 1
+        finally:
+            await _cleanup()
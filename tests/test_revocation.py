@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from app.core.redis import redis_client
+from app.core.security import create_access_token, decode_access_token
+from app.modules.auth.revocation import TokenRevocations
+
+pytestmark = pytest.mark.usefixtures("redis_available")
+
+
+@pytest.fixture
+async def revocations():
+    store = TokenRevocations(capacity=1000, prefix="test:revoked")
+    yield store
+    keys = [key async for key in redis_client.scan_iter("test:revoked*")]
+    if keys:
+        await redis_client.delete(*keys)
+
+
+async def test_revoke_token(revocations, monkeypatch):
+    revoked = decode_access_token(create_access_token(1))
+    other = decode_access_token(create_access_token(1))
+    await revocations.refresh()
+
+    # 未吊销时只查布隆过滤器，不访问 Redis
+    async def fail(*_args, **_kwargs):
+        raise AssertionError("unexpected Redis lookup")
+
+    monkeypatch.setattr(redis_client, "mget", fail)
+    assert not await revocations.is_revoked(revoked)
+    monkeypatch.undo()
+
+    await revocations.revoke_token(revoked)
+    assert await revocations.is_revoked(revoked)
+    assert not await revocations.is_revoked(other)
+
+
+async def test_revoke_user_and_incremental_refresh(revocations):
+    token = decode_access_token(create_access_token(42))
+    await revocations.refresh()
+
+    # 模拟其他 worker 踢人，本 worker 收到失效通知后增量拉取
+    other_worker = TokenRevocations(capacity=1000, prefix="test:revoked")
+    await other_worker.revoke_user(42)
+    assert await revocations.is_revoked(token)
+
+    # 踢人之后重新签发的 token 有效
+    await asyncio.sleep(1)
+    assert not await revocations.is_revoked(
+        decode_access_token(create_access_token(42))
+    )
@@ -0,0 +1,105 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+from app.core.redis import redis_client
+from app.core.security import create_access_token, decode_access_token
+from app.modules.auth.sessions import LastLoginWriter, SessionTracker
+from app.modules.system.models.user import User
+
+
+@pytest.fixture
+async def tracker():
+    tracker = SessionTracker(prefix="test:online")
+    yield tracker
+    keys = [key async for key in redis_client.scan_iter("test:online*")]
+    if keys:
+        await redis_client.delete(*keys)
+
+
+def login(user_id: int) -> tuple[dict, SimpleNamespace]:
+    payload = decode_access_token(create_access_token(str(user_id)))
+    user = SimpleNamespace(user_id=user_id, user_name=f"user{user_id}", nickname=None)
+    return payload, user
+
+
+@pytest.mark.usefixtures("redis_available")
+async def test_online_sessions(tracker):
+    sessions = [login(1), login(1), login(2)]
+    for payload, user in sessions:
+        await tracker.start(payload, user, "10.0.0.1", "pytest")
+
+    total, page = await tracker.list_online(1, 2)
+    assert total == 3
+    # 最近登录的排在前面
+    assert [s["token_id"] for s in page] == [
+        sessions[2][0]["jti"],
+        sessions[1][0]["jti"],
+    ]
+    assert page[0]["user_name"] == "user2"
+
+    await tracker.end(sessions[2][0])
+    await tracker.end_user(1)
+    total, page = await tracker.list_online(1, 10)
+    assert (total, page) == (0, [])
+
+    # 已结束的会话不会因后续请求被重新加入
+    tracker._touched.clear()
+    await tracker.touch(sessions[0][0])
+    assert (await tracker.list_online())[0] == 0
+
+
+@pytest.mark.usefixtures("redis_available")
+async def test_idle_sessions_expire(tracker):
+    payload, user = login(3)
+    await tracker.start(payload, user, "10.0.0.1")
+    await redis_client.zadd(
+        tracker._index, {payload["jti"]: time.time() - tracker.timeout - 1}
+    )
+    assert (await tracker.list_online())[0] == 0
+
+
+@pytest.mark.usefixtures("redis_available")
+async def test_daily_active_users(tracker):
+    for user_id in (1, 1, 2):
+        payload, user = login(user_id)
+        await tracker.start(payload, user, "10.0.0.1")
+    await tracker.touch({"jti": "other", "sub": "3"})
+
+    stats = await tracker.active_stats(days=2)
+    assert stats["online"] == 3
+    assert [d["count"] for d in stats["daily"]] == [3, 0]
+
+
+async def test_last_login_writer(pg_session):
+    table = User.__table__
+    # 使用临时用户，避免改写库中已有账号的登录信息
+    user = (
+        await pg_session.execute(
+            insert(table)
+            .values(user_name=f"login-writer-{time.time_ns()}", hashed_password="x")
+            .returning(table.c.user_id, table.c.update_time)
+        )
+    ).one()
+    await pg_session.commit()
+    try:
+        writer = LastLoginWriter(pg_session.bind, flush_interval=60)
+        writer.record(user.user_id, "10.0.0.1")
+        writer.record(user.user_id, "10.0.0.2")
+        await writer.flush()
+        row = (
+            await pg_session.execute(
+                select(
+                    table.c.last_login_ip, table.c.last_login_time, table.c.update_time
+                ).where(table.c.user_id == user.user_id)
+            )
+        ).one()
+    finally:
+        await pg_session.execute(delete(table).where(table.c.user_id == user.user_id))
+        await pg_session.commit()
+    # 合并为最后一次登录，且不修改 update_time
+    assert row.last_login_ip == "10.0.0.2"
+    assert row.last_login_time is not None
+    assert row.update_time == user.update_time
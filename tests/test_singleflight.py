@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test-share")
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"value": 1}
+
+    results = await asyncio.gather(*(flight.do("k", work) for _ in range(20)))
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    stats = flight.stats()
+    assert stats["calls"] == 20
+    assert stats["coalesced"] == 19
+    assert stats["coalesceRate"] == 0.95
+    assert stats["inflight"] == 0
+
+    # 完成后不缓存结果，下一次调用重新执行
+    await flight.do("k", work)
+    assert len(calls) == 2
+
+
+async def test_error_propagates_and_key_is_released():
+    flight = SingleFlight("test-error")
+    attempts = []
+
+    async def fail():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        *(flight.do("k", fail) for _ in range(5)), return_exceptions=True
+    )
+    assert len(attempts) == 1
+    assert all(isinstance(r, ValueError) for r in results)
+
+    async def ok():
+        return "ok"
+
+    assert await flight.do("k", ok) == "ok"
+
+
+async def test_cancelled_waiter_does_not_cancel_others():
+    flight = SingleFlight("test-cancel")
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.ensure_future(flight.do("k", work))
+    second = asyncio.ensure_future(flight.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_all_waiters_cancelled_cancels_execution():
+    flight = SingleFlight("test-cancel-all")
+    finished = []
+
+    async def work():
+        await asyncio.sleep(0.05)
+        finished.append(1)
+
+    waiter = asyncio.ensure_future(flight.do("k", work))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    await asyncio.sleep(0.1)
+    assert not finished
+    assert flight.stats()["inflight"] == 0
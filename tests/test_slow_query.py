@@ -0,0 +1,49 @@
+import logging
+
+import pytest
+from sqlalchemy import text
+
+from app.db import slow_query
+from app.db.slow_query import parameter_shape
+
+
+@pytest.fixture
+def db(pg_session, caplog):
+    slow_query.install(pg_session.bind.sync_engine, threshold_ms=20)
+    slow_query._explained.clear()
+    caplog.set_level(logging.WARNING, logger=slow_query.logger.name)
+    return pg_session
+
+
+def slow_logs(caplog) -> list[str]:
+    return [r.getMessage() for r in caplog.records if r.name == slow_query.logger.name]
+
+
+def test_parameter_shape_hides_values():
+    assert parameter_shape((1, "secret", None)) == "(int, str, NoneType)"
+    assert parameter_shape({"name": "secret"}) == "{name: str}"
+    assert parameter_shape([(1, "a"), (2, "b")], executemany=True) == "2 x (int, str)"
+
+
+async def test_slow_select_is_logged_with_plan(db, caplog):
+    await db.execute(text("SELECT 1"))
+    assert slow_logs(caplog) == []
+
+    stmt = text("SELECT pg_sleep(:seconds)")
+    await db.execute(stmt, {"seconds": 0.05})
+    [message] = slow_logs(caplog)
+    assert "[-] params=(float)" in message
+    assert "Execution Time" in message
+
+    # 同一语句在间隔内不重复抓取执行计划
+    await db.execute(stmt, {"seconds": 0.05})
+    assert "Execution Time" not in slow_logs(caplog)[1]
+
+
+async def test_slow_write_is_not_explained(db, caplog):
+    await db.execute(text("CREATE TEMP TABLE slow_query_t (x int)"))
+    await db.execute(text("INSERT INTO slow_query_t SELECT 1 FROM pg_sleep(0.05)"))
+    [message] = slow_logs(caplog)
+    assert "Execution Time" not in message
+    # EXPLAIN ANALYZE 会再次执行语句，写操作不能被重复执行
+    assert (await db.execute(text("SELECT count(*) FROM slow_query_t"))).scalar() == 1
@@ -0,0 +1,49 @@
+"""
+冷启动回归测试：在全新进程中导入 app.main，超过预算或提前导入了重型模块即失败
+预算可通过环境变量 STARTUP_BUDGET_SECONDS 调整 (CI 机器较慢时)
+详细分析使用 scripts/bench_startup.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.core.security import LAZY_MODULES
+
+ROOT = Path(__file__).resolve().parent.parent
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "3.0"))
+
+SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def import_app() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", SNIPPET],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_heavy_modules_are_lazy():
+    modules = set(import_app()["modules"])
+    assert not [m for m in LAZY_MODULES if m in modules]
+
+
+def test_import_within_budget():
+    # 取多次中的最小值，排除磁盘缓存等偶发抖动
+    elapsed = min(import_app()["elapsed"] for _ in range(3))
+    assert elapsed < STARTUP_BUDGET_SECONDS, (
+        f"导入 app.main 耗时 {elapsed:.2f}s，超过预算 {STARTUP_BUDGET_SECONDS}s"
+    )